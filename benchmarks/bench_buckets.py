@@ -0,0 +1,53 @@
+# datespan - Copyright (c)2024, Thomas Zeutschler, MIT license
+
+"""
+Measures splitting spans into days and months: a loop of `full_day`/`full_month` and `shift()` creating
+DateSpans through the constructor, compared to the lazy `iter_days()`/`iter_months()` generators and the
+vectorized `buckets()` of a DateSpanArray, for 1M day buckets.
+
+Usage (from the repository root): python -m benchmarks.bench_buckets
+"""
+
+import time
+from datetime import datetime
+
+from datespan import DateSpan, DateSpanArray
+
+YEARS = 50
+
+
+def measure(function) -> tuple[float, list]:
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+
+def shift_loop(span: DateSpan, full: str, **delta) -> list[DateSpan]:
+    buckets = []
+    bucket = getattr(DateSpan(span.start), full)
+    while bucket.start <= span.end:
+        buckets.append(bucket.intersect(span))
+        bucket = getattr(bucket.shift(**delta), full)
+    return buckets
+
+
+def main():
+    span = DateSpan(datetime(2000, 1, 1, 12), datetime(2000 + YEARS, 1, 1, 6))
+    spans = DateSpanArray.from_spans([span.shift(days=i) for i in range(55)])  # about 1M days
+
+    print(f"{'buckets of a ' + str(YEARS) + ' year span':<32}{'count':>8}{'seconds':>10}")
+    for name, full, delta in (("days", "full_day", dict(days=1)), ("months", "full_month", dict(months=1))):
+        before, expected = measure(lambda: shift_loop(span, full, **delta))
+        after, result = measure(lambda: list(getattr(span, f"iter_{name}")()))
+        assert result == expected
+        print(f"{'full_' + name[:-1] + ' + shift() loop':<32}{len(expected):>8}{before:>10.3f}")
+        print(f"{'iter_' + name + '()':<32}{len(result):>8}{after:>10.3f}   {before / after:.1f}x")
+
+    elapsed, buckets = measure(lambda: spans.buckets("day"))
+    print(f"\n{'DateSpanArray.buckets(day)':<32}{len(buckets):>8}{elapsed:>10.3f}")
+    elapsed, _ = measure(lambda: [day for i in range(len(spans)) for day in spans[i].iter_days()])
+    print(f"{'iter_days() of the same spans':<32}{len(buckets):>8}{elapsed:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
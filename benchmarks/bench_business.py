@@ -0,0 +1,77 @@
+# datespan - Copyright (c)2024, Thomas Zeutschler, MIT license
+
+"""
+Measures business day counting and shifting on a `BusinessCalendar` bitmap with 250 holidays, compared to
+day-by-day loops over the weekdays and a holiday set, plus 'every workday of last quarter' resolved from the
+bitmap compared to building it from 'every mon, tue, wed, thu, fri' minus the holidays via `subtract()`.
+
+Usage (from the repository root): python -m benchmarks.bench_business
+"""
+
+import timeit
+from datetime import date, datetime, timedelta
+
+from datespan import BusinessCalendar, DateSpanSet
+
+COUNT = 10_000
+
+
+def seconds(function, number: int = 3) -> float:
+    return min(timeit.repeat(function, number=number, repeat=5)) / number
+
+
+def report(label: str, before: float, after: float):
+    print(f"{label:<36}{before * 1000:>12.2f}{after * 1000:>13.2f}{before / after:>9.1f}x")
+
+
+def main():
+    holidays = [date(2005, 1, 3) + timedelta(days=day * 29) for day in range(250)]
+    excluded = set(holidays)
+    calendar = BusinessCalendar(holidays)
+    calendar.count(date(2000, 1, 1), date(2000, 1, 1))  # builds the bitmap
+    ranges = [(date(2000, 1, 1) + timedelta(days=i % 7000), date(2000, 1, 1) + timedelta(days=i % 7000 + i % 400))
+              for i in range(COUNT)]
+
+    def count_loop(first, last):
+        days = (last - first).days + 1
+        return sum((first + timedelta(days=i)).weekday() < 5 and first + timedelta(days=i) not in excluded
+                   for i in range(days))
+
+    def shift_loop(day, steps):
+        while steps:
+            day += timedelta(days=1)
+            if day.weekday() < 5 and day not in excluded:
+                steps -= 1
+        return day
+
+    print(f"{'operation':<36}{'loops (ms)':>12}{'bitmap (ms)':>13}{'speedup':>10}")
+    assert [calendar.count(*r) for r in ranges] == [count_loop(*r) for r in ranges]
+    before = seconds(lambda: [count_loop(*r) for r in ranges], 1)
+    after = seconds(lambda: [calendar.count(*r) for r in ranges])
+    report('count 10,000 ranges of 0-400 days', before, after)
+
+    shifts = [(first, i % 60 + 1) for i, (first, _) in enumerate(ranges)]
+    assert [calendar.shift(*s) for s in shifts] == [shift_loop(*s) for s in shifts]
+    before = seconds(lambda: [shift_loop(*s) for s in shifts], 1)
+    after = seconds(lambda: [calendar.shift(*s) for s in shifts])
+    report('shift 10,000 days by 1-60 days', before, after)
+
+    as_of = datetime(2024, 11, 15)
+    quarter = [DateSpanSet(day) for day in holidays if date(2024, 7, 1) <= day <= date(2024, 9, 30)]
+
+    def subtract_loop():
+        dss = DateSpanSet('every mon, tue, wed, thu, fri of last quarter', as_of=as_of)
+        for holiday in quarter:
+            dss = dss.subtract(holiday)
+        return dss
+
+    def bitmap():
+        return DateSpanSet('every workday of last quarter', as_of=as_of, business_calendar=calendar)
+
+    assert subtract_loop().to_tuples() == bitmap().to_tuples()
+    before, after = seconds(subtract_loop, 20), seconds(bitmap, 20)
+    report('every workday of last quarter', before, after)
+
+
+if __name__ == "__main__":
+    main()
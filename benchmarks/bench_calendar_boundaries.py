@@ -0,0 +1,84 @@
+# datespan - Copyright (c)2024, Thomas Zeutschler, MIT license
+
+"""
+Measures `DateSpan.full_week`, `full_month`, `full_quarter`, `full_year` and the `is_full_*` checks resolved
+from the precomputed month boundary table and integer week arithmetic, compared to the `replace()` and
+`relativedelta` arithmetic they were implemented with before.
+
+Usage (from the repository root): python -m benchmarks.bench_calendar_boundaries
+"""
+
+import time
+from datetime import datetime, timedelta
+
+from dateutil.relativedelta import relativedelta
+
+from datespan.date_span import DateSpan
+
+COUNT = 100_000
+
+
+def full_week(span):
+    start = span.start - relativedelta(days=span.start.weekday())
+    end = span.end + relativedelta(days=6 - span.end.weekday())
+    return DateSpan(start.replace(hour=0, minute=0, second=0, microsecond=0),
+                    end.replace(hour=23, minute=59, second=59, microsecond=999999))
+
+
+def full_month(span):
+    start = span.start.replace(day=1)
+    end = span.end.replace(day=1) + relativedelta(day=31)
+    return DateSpan(start.replace(hour=0, minute=0, second=0, microsecond=0),
+                    end.replace(hour=23, minute=59, second=59, microsecond=999999))
+
+
+def full_quarter(span):
+    m_start = (span.start.month - 1) // 3 * 3 + 1
+    m_end = ((span.end.month - 1) // 3 + 1) * 3
+    start = span.start.replace(month=m_start, day=1)
+    end = span.end.replace(month=m_end, day=1) + relativedelta(months=1, days=-1)
+    return DateSpan(start.replace(hour=0, minute=0, second=0, microsecond=0),
+                    end.replace(hour=23, minute=59, second=59, microsecond=999999))
+
+
+def full_year(span):
+    start = span.start.replace(month=1, day=1)
+    end = span.end.replace(month=1, day=1) + relativedelta(years=1, days=-1)
+    return DateSpan(start.replace(hour=0, minute=0, second=0, microsecond=0),
+                    end.replace(hour=23, minute=59, second=59, microsecond=999999))
+
+
+def is_full_month(span):
+    return (span.start == span.start.replace(day=1, hour=0, minute=0, second=0, microsecond=0) and
+            span.end == span.end.replace(day=1, hour=23, minute=59, second=59, microsecond=999999)
+            + relativedelta(months=1, days=-1))
+
+
+def measure(function, spans) -> float:
+    start = time.perf_counter()
+    for span in spans:
+        function(span)
+    return time.perf_counter() - start
+
+
+def main():
+    base = datetime(2024, 1, 1)
+    spans = [DateSpan(base + timedelta(hours=i * 7), base + timedelta(hours=i * 7 + 30)) for i in range(COUNT)]
+    months = [span.full_month for span in spans]
+    cases = [
+        ("full_week", full_week, lambda s: s.full_week, spans),
+        ("full_month", full_month, lambda s: s.full_month, spans),
+        ("full_quarter", full_quarter, lambda s: s.full_quarter, spans),
+        ("full_year", full_year, lambda s: s.full_year, spans),
+        ("is_full_month", is_full_month, lambda s: s.is_full_month, months),
+    ]
+    print(f"{'property':<16}{'before (s)':>12}{'after (s)':>12}{'speedup':>10}   per {COUNT:,} spans")
+    for name, before_function, after_function, values in cases:
+        assert all(before_function(s) == after_function(s) for s in values[:1000])
+        before = measure(before_function, values)
+        after = measure(after_function, values)
+        print(f"{name:<16}{before:>12.3f}{after:>12.3f}{before / after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# datespan - Copyright (c)2024, Thomas Zeutschler, MIT license
+
+"""
+Measures common operations on 1M spans, calling the DateSpan method per object compared to the vectorized
+DateSpanArray operation on two datetime64[us] arrays. Also compares the memory of 1M DateSpan objects
+(with their datetimes) to a DateSpanArray.
+
+Usage (from the repository root): python -m benchmarks.bench_datespan_array
+"""
+
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from datespan import DateSpan, DateSpanArray
+
+COUNT = 1_000_000
+
+
+def measure(function) -> tuple[float, object]:
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+
+def main():
+    base = datetime(2000, 1, 1)
+    tracemalloc.start()
+    spans = [DateSpan(base + timedelta(minutes=37 * i), base + timedelta(minutes=37 * i + 1000 + i % 50_000))
+             for i in range(COUNT)]
+    objects_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    array = DateSpanArray.from_spans(spans)
+    other = DateSpan(datetime(2010, 1, 1), datetime(2020, 1, 1))
+    point = datetime(2015, 6, 1)
+
+    operations = [
+        ("shift(days=1)", lambda: [s.shift(days=1) for s in spans], lambda: array.shift(days=1)),
+        ("shift(months=1)", lambda: [s.shift(months=1) for s in spans], lambda: array.shift(months=1)),
+        ("full_day", lambda: [s.full_day for s in spans], lambda: array.full_day),
+        ("full_week", lambda: [s.full_week for s in spans], lambda: array.full_week),
+        ("full_month", lambda: [s.full_month for s in spans], lambda: array.full_month),
+        ("full_year", lambda: [s.full_year for s in spans], lambda: array.full_year),
+        ("contains(datetime)", lambda: [point in s for s in spans], lambda: array.contains(point)),
+        ("overlaps(DateSpan)", lambda: [s.overlaps_with(other) for s in spans], lambda: array.overlaps(other)),
+        ("intersect(DateSpan)", lambda: [s.intersect(other) for s in spans], lambda: array.intersect(other)),
+        ("duration", lambda: [s.duration for s in spans], lambda: array.duration),
+    ]
+    print(f"{'operation on 1M spans':<24}{'DateSpan (s)':>14}{'array (s)':>12}{'speedup':>10}")
+    for name, per_object, vectorized in operations:
+        before, expected = measure(per_object)
+        after, result = measure(vectorized)
+        if isinstance(result, DateSpanArray):
+            assert result[::997].to_spans() == expected[::997]
+        else:
+            assert np.allclose(np.asarray(result[::997], dtype=float), np.asarray(expected[::997], dtype=float))
+        print(f"{name:<24}{before:>14.3f}{after:>12.4f}{before / after:>9.0f}x")
+
+    print(f"\n{'memory of 1M spans':<24}{'MiB':>14}")
+    print(f"{'DateSpan objects':<24}{objects_bytes / 2 ** 20:>14.1f}")
+    print(f"{'DateSpanArray':<24}{array.nbytes / 2 ** 20:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
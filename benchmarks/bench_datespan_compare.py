@@ -0,0 +1,51 @@
+# datespan - Copyright (c)2024, Thomas Zeutschler, MIT license
+
+"""
+Measures sorting 1M DateSpans with `DateSpan.sort_key` compared to sorting by (start, end) datetimes,
+and 1M comparisons of DateSpans with DateSpans, datetimes, tuples and pandas Timestamps.
+
+Usage (from the repository root): python -m benchmarks.bench_datespan_compare
+"""
+
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+
+from datespan.date_span import DateSpan
+
+COUNT = 1_000_000
+
+
+def measure(function) -> float:
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def main():
+    base = datetime(2024, 1, 1)
+    random.seed(42)
+    spans = [DateSpan(base + timedelta(minutes=m), base + timedelta(minutes=m + 30))
+             for m in random.sample(range(COUNT * 10), COUNT)]
+    for span in spans:  # as for spans compared or merged before
+        span.start_us, span.end_us
+    print(f"{'operation':<36}{'seconds per 1M':>16}")
+    print(f"{'sort by (start, end) datetimes':<36}{measure(lambda: sorted(spans, key=DateSpan.to_tuple)):>16.2f}")
+    print(f"{'sort by DateSpan.sort_key':<36}{measure(lambda: sorted(spans, key=DateSpan.sort_key)):>16.2f}")
+
+    other = spans[0]
+    aware = DateSpan(other.start.replace(tzinfo=timezone.utc), other.end.replace(tzinfo=timezone.utc))
+    operands = [("DateSpan", other), ("datetime", base), ("tuple", (base, base)),
+                ("pandas.Timestamp", pd.Timestamp(base))]
+    for name, operand in operands:
+        duration = measure(lambda: [span < operand for span in spans])
+        print(f"{'< ' + name:<36}{duration:>16.2f}")
+    for name, operand in [("DateSpan", other), ("DateSpan, naive and aware", aware)]:
+        duration = measure(lambda: [span == operand for span in spans])
+        print(f"{'== ' + name:<36}{duration:>16.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+# datespan - Copyright (c)2024, Thomas Zeutschler, MIT license
+
+"""
+Measures building 1M single-instant DateSpans from datetime, pandas Timestamp and numpy datetime64 values
+through the direct type conversion, compared to the text parser the values were stringified for before.
+
+Usage (from the repository root): python -m benchmarks.bench_datespan_construction
+"""
+
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from datespan.date_span import DateSpan
+
+COUNT = 1_000_000
+TEXT_COUNT = 2_000  # the text parser is too slow for 1M values, results are extrapolated
+
+
+def measure(values, factory) -> float:
+    start = time.perf_counter()
+    for value in values:
+        factory(value)
+    return time.perf_counter() - start
+
+
+def main():
+    base = datetime(2024, 1, 1, 0, 0, 0, 1)
+    datetimes = [base + timedelta(seconds=i, microseconds=i % 997) for i in range(COUNT)]
+    timestamps = [pd.Timestamp(dt) for dt in datetimes[:COUNT // 10]]
+    datetime64s = list(np.array(datetimes[:COUNT // 10], dtype='datetime64[us]'))
+
+    text = measure(datetimes[:TEXT_COUNT], lambda dt: DateSpan(str(dt))) / TEXT_COUNT * COUNT
+    print(f"{'source':<24}{'seconds per 1M':>16}")
+    print(f"{'text parser (extrap.)':<24}{text:>16.2f}")
+    print(f"{'datetime':<24}{measure(datetimes, DateSpan):>16.2f}")
+    print(f"{'pandas.Timestamp':<24}{measure(timestamps, DateSpan) * 10:>16.2f}")
+    print(f"{'numpy.datetime64':<24}{measure(datetime64s, DateSpan) * 10:>16.2f}")
+
+
+if __name__ == "__main__":
+    main()
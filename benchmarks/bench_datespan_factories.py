@@ -0,0 +1,48 @@
+# datespan - Copyright (c)2024, Thomas Zeutschler, MIT license
+
+"""
+Measures creating 1M DateSpans from trusted data through the factory classmethods `from_bounds()`,
+`from_epoch_us()` and `from_ordinal_days()`, compared to the regular constructor, and cloning 1M DateSpans.
+
+Usage (from the repository root): python -m benchmarks.bench_datespan_factories
+"""
+
+import time
+from datetime import date, datetime, timedelta
+
+from datespan import calendar_math as cm
+from datespan.date_span import DateSpan
+
+COUNT = 1_000_000
+
+
+def measure(function, rows) -> float:
+    start = time.perf_counter()
+    for a, b in rows:
+        function(a, b)
+    return time.perf_counter() - start
+
+
+def main():
+    base = datetime(2024, 1, 1)
+    bounds = [(base + timedelta(minutes=i), base + timedelta(minutes=i, seconds=59)) for i in range(COUNT)]
+    micros = [(cm.to_epoch_us(a), cm.to_epoch_us(b)) for a, b in bounds]
+    ordinal = date(2024, 1, 1).toordinal()
+    ordinals = [(ordinal + i % 1000, ordinal + i % 1000 + 6) for i in range(COUNT)]
+    spans = [DateSpan(a, b) for a, b in bounds]
+
+    print(f"{'factory':<32}{'seconds per 1M':>16}")
+    print(f"{'DateSpan(start, end)':<32}{measure(DateSpan, bounds):>16.2f}")
+    print(f"{'DateSpan.from_bounds':<32}{measure(DateSpan.from_bounds, bounds):>16.2f}")
+    print(f"{'DateSpan.from_epoch_us':<32}{measure(DateSpan.from_epoch_us, micros):>16.2f}")
+    constructed = measure(lambda a, b: DateSpan(*cm.ordinal_span(a, b)), ordinals)
+    print(f"{'DateSpan(*cm.ordinal_span(a, b))':<32}{constructed:>16.2f}")
+    print(f"{'DateSpan.from_ordinal_days':<32}{measure(DateSpan.from_ordinal_days, ordinals):>16.2f}")
+    start = time.perf_counter()
+    for span in spans:
+        span.clone()
+    print(f"{'DateSpan.clone':<32}{time.perf_counter() - start:>16.2f}")
+
+
+if __name__ == "__main__":
+    main()
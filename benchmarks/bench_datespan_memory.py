@@ -0,0 +1,50 @@
+# datespan - Copyright (c)2024, Thomas Zeutschler, MIT license
+
+"""
+Measures the memory per DateSpan object with tracemalloc. The slotted DateSpan is compared to an
+equivalent object with a per-instance `__dict__` holding `_start`, `_end`, `_arg_start`, `_arg_end`
+and `_message`, as DateSpan was implemented before.
+
+Usage (from the repository root): python -m benchmarks.bench_datespan_memory
+"""
+
+import tracemalloc
+from datetime import datetime, timedelta
+
+from datespan.date_span import DateSpan
+
+COUNT = 100_000
+
+
+class DictDateSpan:
+    """The previous, unslotted layout of a DateSpan."""
+
+    def __init__(self, start, end):
+        self._arg_start = start
+        self._arg_end = end
+        self._message = None
+        self._start = start
+        self._end = end
+
+
+def bytes_per_span(factory, bounds) -> float:
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    spans = [factory(start, end) for start, end in bounds]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # the list itself holds one pointer per span
+    return (after - before) / len(spans) - 8
+
+
+def main():
+    base = datetime(2024, 1, 1)
+    bounds = [(base + timedelta(hours=i), base + timedelta(hours=i, minutes=59)) for i in range(COUNT)]
+    print(f"{'layout':<20}{'bytes per span':>16}")
+    print(f"{'__dict__ (before)':<20}{bytes_per_span(DictDateSpan, bounds):>16.1f}")
+    print(f"{'__slots__':<20}{bytes_per_span(DateSpan, bounds):>16.1f}")
+    print("(datetime objects are shared and not included)")
+
+
+if __name__ == "__main__":
+    main()
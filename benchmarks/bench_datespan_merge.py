@@ -0,0 +1,75 @@
+# datespan - Copyright (c)2024, Thomas Zeutschler, MIT license
+
+"""
+Measures `DateSpanSet._merge_all()` sorting and merging 1M overlapping or consecutive DateSpans, compared to
+the previous merge loop on datetimes and timedeltas. Every run merges freshly created DateSpans, so the
+conversion of their datetimes is part of the measured time.
+
+Usage (from the repository root): python -m benchmarks.bench_datespan_merge
+"""
+
+import time
+from datetime import datetime, timedelta
+
+from datespan import DateSpan, DateSpanSet
+
+COUNT = 1_000_000
+REPEAT = 3
+EPSILON = timedelta(microseconds=DateSpan.TIME_EPSILON_MICROSECONDS)
+
+
+def create_spans() -> list[DateSpan]:
+    base = datetime(2024, 1, 1)
+    # every third span leaves a gap, the others overlap or are consecutive
+    spans = [DateSpan(base + timedelta(seconds=i * 10), base + timedelta(seconds=i * 10 + (5 if i % 3 else 10)))
+             for i in range(COUNT)]
+    spans.reverse()
+    return spans
+
+
+def merge_datetimes(spans: list[DateSpan]) -> list[tuple]:
+    """The previous merge loop, comparing datetimes and timedeltas."""
+    spans = sorted(spans, key=lambda s: (s.start, s.end))
+    merged = []
+    start, end = spans[0].start, spans[0].end
+    for span in spans[1:]:
+        if span.start <= end or timedelta(0) <= span.start - end <= EPSILON:
+            end = max(end, span.end)
+        else:
+            merged.append((start, end))
+            start, end = span.start, span.end
+    merged.append((start, end))
+    return merged
+
+
+def merge_all(spans: list[DateSpan]) -> list[tuple]:
+    """`DateSpanSet._merge_all()` on the given DateSpans."""
+    dss = DateSpanSet()
+    dss._spans = spans
+    dss._merge_all()
+    return dss.to_tuples()
+
+
+def measure(function) -> tuple[float, list[tuple]]:
+    """Returns the best time of `function` over fresh DateSpans and its result."""
+    best, result = float('inf'), None
+    for _ in range(REPEAT):
+        spans = create_spans()
+        start = time.perf_counter()
+        result = function(spans)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    before, expected = measure(merge_datetimes)
+    after, result = measure(merge_all)
+    assert result == expected
+    print(f"{'implementation':<28}{'seconds per 1M':>16}")
+    print(f"{'datetime loop (before)':<28}{before:>16.2f}")
+    print(f"{'DateSpanSet._merge_all()':<28}{after:>16.2f}")
+    print(f"{len(expected):,} merged spans")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# datespan - Copyright (c)2024, Thomas Zeutschler, MIT license
+
+"""
+Measures 10M calls of `DateSpan.shift()` for day, hour, week, month and mixed unit shifts, compared to the
+previous implementation building two `relativedelta` objects per call. The previous implementation is too
+slow for 10M calls, its results are extrapolated.
+
+Usage (from the repository root): python -m benchmarks.bench_datespan_shift
+"""
+
+import time
+from datetime import datetime, timedelta
+
+from dateutil.relativedelta import relativedelta
+
+from datespan.date_span import DateSpan
+
+COUNT = 10_000_000
+BEFORE_COUNT = 200_000
+
+
+def shift_before(span, years=0, months=0, days=0, hours=0, minutes=0, seconds=0, microseconds=0, weeks=0):
+    start = span.start + relativedelta(years=years, months=months, days=days, hours=hours, minutes=minutes,
+                                       seconds=seconds, microseconds=microseconds)
+    end = span.end + relativedelta(years=years, months=months, days=days, hours=hours, minutes=minutes,
+                                   seconds=seconds, microseconds=microseconds)
+    if weeks:
+        start += timedelta(weeks=weeks)
+        end += timedelta(weeks=weeks)
+    elif days or hours or minutes or seconds or microseconds:
+        pass
+    elif span.ends_on_month_end:
+        end = end.replace(day=1, hour=23, minute=59, second=59, microsecond=999999) + relativedelta(months=1, days=-1)
+    return DateSpan(start, end)
+
+
+def measure(function, span, count, kwargs) -> float:
+    start = time.perf_counter()
+    for _ in range(count):
+        function(span, **kwargs)
+    return time.perf_counter() - start
+
+
+def main():
+    span = DateSpan(datetime(2024, 1, 1), datetime(2024, 1, 31, 23, 59, 59, 999999))
+    cases = [("days=1", dict(days=1)), ("hours=6", dict(hours=6)), ("weeks=2", dict(weeks=2)),
+             ("months=1", dict(months=1)), ("years=-1", dict(years=-1)), ("months=1, days=3", dict(months=1, days=3))]
+    print(f"{'shift':<20}{'before (s)':>12}{'after (s)':>12}{'speedup':>10}   per {COUNT:,} shifts")
+    for name, kwargs in cases:
+        assert shift_before(span, **kwargs) == span.shift(**kwargs)
+        before = measure(shift_before, span, BEFORE_COUNT, kwargs) * COUNT / BEFORE_COUNT
+        after = measure(DateSpan.shift, span, COUNT, kwargs)
+        print(f"{name:<20}{before:>12.2f}{after:>12.2f}{before / after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
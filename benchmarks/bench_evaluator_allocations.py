@@ -0,0 +1,65 @@
+# datespan - Copyright (c)2024, Thomas Zeutschler, MIT license
+
+"""
+Compares the memory allocated while resolving relative date expressions via chains of DateSpan
+objects (as the Evaluator did before) with the allocation-lean calendar arithmetic of the Evaluator.
+
+Usage (from the repository root): python -m benchmarks.bench_evaluator_allocations
+"""
+
+import timeit
+import tracemalloc
+
+from datespan.date_span import DateSpan
+from datespan.parser.evaluator import Evaluator
+
+# (unit, DateSpan chain as used by the previous Evaluator implementation, Evaluator method)
+CASES = [
+    ("previous 3 months",
+     lambda: DateSpan.today().shift(months=-1).full_month.shift_start(months=-2).to_tuple_list(),
+     lambda e: e.calculate_previous(3, "month")),
+    ("previous 2 quarters",
+     lambda: DateSpan.today().shift(months=-3).full_quarter.shift_start(months=-3).to_tuple_list(),
+     lambda e: e.calculate_previous(2, "quarter")),
+    ("next 4 weeks",
+     lambda: DateSpan.today().shift(weeks=1).full_week.shift_end(weeks=3).to_tuple_list(),
+     lambda e: e.calculate_future(4, "week")),
+    ("rolling 12 months",
+     lambda: DateSpan.now().shift_start(months=-12).to_tuple_list(),
+     lambda e: e.calculate_rolling(12, "month")),
+    ("this quarter",
+     lambda: DateSpan.now().full_quarter.to_tuple_list(),
+     lambda e: e.calculate_this("quarter")),
+    ("ytd",
+     lambda: DateSpan().ytd.to_tuple_list(),
+     lambda e: e.evaluate_special("ytd")),
+]
+
+
+def peak_bytes(func, repeat: int = 100) -> float:
+    """Returns the average peak of memory allocated while executing `func`."""
+    total = 0
+    for _ in range(repeat):
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        total += peak - before
+    return total / repeat
+
+
+def main():
+    evaluator = Evaluator([])
+    print(f"{'expression':<22}{'DateSpan chain':>18}{'calendar core':>18}{'chain µs':>12}{'core µs':>12}")
+    for name, chain, core in CASES:
+        tracemalloc.start()
+        chain_bytes = peak_bytes(chain)
+        core_bytes = peak_bytes(lambda: core(evaluator))
+        tracemalloc.stop()
+        chain_time = timeit.timeit(chain, number=10_000) / 10_000 * 1e6
+        core_time = timeit.timeit(lambda: core(evaluator), number=10_000) / 10_000 * 1e6
+        print(f"{name:<22}{chain_bytes:>16.0f} B{core_bytes:>16.0f} B{chain_time:>12.2f}{core_time:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
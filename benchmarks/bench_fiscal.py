@@ -0,0 +1,68 @@
+# datespan - Copyright (c)2024, Thomas Zeutschler, MIT license
+
+"""
+Measures fiscal quarter lookups for 100,000 dates with `FiscalCalendar.span()` on the precomputed period tables,
+compared to per-call date arithmetic: `relativedelta` month math for a fiscal year starting in October, and
+computing the year start and walking the 4-4-5 weeks for a retail calendar.
+
+Usage (from the repository root): python -m benchmarks.bench_fiscal
+"""
+
+import timeit
+from datetime import datetime, timedelta
+
+from dateutil.relativedelta import relativedelta
+
+from datespan import FiscalCalendar
+
+COUNT = 100_000
+_END = timedelta(microseconds=1)
+
+
+def seconds(function, number: int = 3) -> float:
+    return min(timeit.repeat(function, number=number, repeat=5)) / number
+
+
+def month_quarter(dt: datetime, start_month: int = 10) -> tuple[datetime, datetime]:
+    months = (dt.month - start_month) % 12 // 3 * 3
+    start = datetime(dt.year, dt.month, 1) - relativedelta(months=(dt.month - start_month) % 12 - months)
+    return start, start + relativedelta(months=3) - _END
+
+
+def retail_year_start(year: int) -> datetime:
+    anchor = datetime(year, 2, 1)
+    offset = (anchor.weekday() + 1) % 7  # weeks start on Sunday
+    return anchor - timedelta(days=offset if offset <= 3 else offset - 7)
+
+
+def retail_quarter(dt: datetime) -> tuple[datetime, datetime]:
+    start = retail_year_start(dt.year + 1)
+    if start > dt:
+        start = retail_year_start(dt.year)
+        if start > dt:
+            start = retail_year_start(dt.year - 1)
+    end = retail_year_start(start.year + 1)
+    for quarter in range(4):
+        following = start + timedelta(weeks=13) if quarter < 3 else end
+        if dt < following:
+            return start, following - _END
+        start = following
+
+
+def main():
+    base = datetime(2000, 1, 1)
+    days = [base + timedelta(days=i % 9000, hours=i % 24) for i in range(COUNT)]
+    months = FiscalCalendar(start_month=10)
+    retail = FiscalCalendar(start_month=2, pattern='4-4-5', week_start=6, method='nearest')
+
+    print(f"{'100,000 fiscal quarters':<28}{'arithmetic (ms)':>16}{'tables (ms)':>13}{'speedup':>10}")
+    for label, calendar, reference in [('October fiscal year', months, month_quarter),
+                                       ('4-4-5 retail calendar', retail, retail_quarter)]:
+        assert [calendar.span(day, 'quarter') for day in days] == [reference(day) for day in days]
+        before = seconds(lambda: [reference(day) for day in days])
+        after = seconds(lambda: [calendar.span(day, 'quarter') for day in days])
+        print(f"{label:<28}{before * 1000:>16.2f}{after * 1000:>13.2f}{before / after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+# datespan - Copyright (c)2024, Thomas Zeutschler, MIT license
+
+"""
+Measures dictionary and set operations with 1M spans as keys, e.g. per-window aggregates, for DateSpan keys
+that hash their start and end datetimes on every lookup and FrozenDateSpan keys with a cached hash.
+
+Usage (from the repository root): python -m benchmarks.bench_frozen_datespan
+"""
+
+import time
+from datetime import datetime, timedelta
+
+from datespan.date_span import DateSpan
+
+COUNT = 1_000_000
+ROUNDS = 3
+
+
+def aggregate(keys) -> float:
+    totals = {}
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for key in keys:
+            totals[key] = totals.get(key, 0) + 1
+    len(set(keys))
+    return time.perf_counter() - start
+
+
+def main():
+    base = datetime(2024, 1, 1)
+    spans = [DateSpan(base + timedelta(minutes=i), base + timedelta(minutes=i, seconds=59)) for i in range(COUNT)]
+    frozen = [span.freeze() for span in spans]
+    print(f"{'key type':<16}{'seconds':>10}   {ROUNDS} x {COUNT:,} dict updates and one set")
+    print(f"{'DateSpan':<16}{aggregate(spans):>10.2f}")
+    print(f"{'FrozenDateSpan':<16}{aggregate(frozen):>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
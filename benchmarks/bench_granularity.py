@@ -0,0 +1,46 @@
+# datespan - Copyright (c)2024, Thomas Zeutschler, MIT license
+
+"""
+Measures the `is_full_*` checks and `to_lambda()` code generation on 100,000 calendar spans, created by
+the `full_*` properties and thus knowing their granularity, compared to the same spans created from plain
+start and end datetimes, which need to check their start and end against the calendar.
+
+Usage (from the repository root): python -m benchmarks.bench_granularity
+"""
+
+import timeit
+from datetime import datetime, timedelta
+
+from datespan import DateSpan, DateSpanSet
+
+COUNT = 100_000
+CHECKS = ("is_full_day", "is_full_week", "is_full_month", "is_full_quarter", "is_full_year")
+
+
+def seconds(function, number: int = 3) -> float:
+    return min(timeit.repeat(function, number=number, repeat=5)) / number
+
+
+def main():
+    base = datetime(2000, 1, 1)
+    days = [base + timedelta(days=i % 9000, hours=i % 24) for i in range(COUNT)]
+    properties = ("full_day", "full_week", "full_month", "full_quarter", "full_year")
+    known = [getattr(DateSpan(day, day), properties[i % 5]) for i, day in enumerate(days)]
+    unknown = [DateSpan(span.start, span.end) for span in known]
+
+    print(f"{'100,000 calendar spans':<24}{'unknown (ms)':>14}{'known (ms)':>12}{'speedup':>10}")
+    for check in CHECKS:
+        assert [getattr(span, check) for span in known] == [getattr(span, check) for span in unknown]
+        before = seconds(lambda: [getattr(span, check) for span in unknown])
+        after = seconds(lambda: [getattr(span, check) for span in known])
+        print(f"{check:<24}{before * 1000:>14.2f}{after * 1000:>12.2f}{before / after:>9.1f}x")
+
+    known_set, unknown_set = DateSpanSet(known[::50]), DateSpanSet(unknown[::50])
+    assert known_set.to_lambda(True) == unknown_set.to_lambda(True)
+    before = seconds(lambda: unknown_set.to_lambda(True), 20)
+    after = seconds(lambda: known_set.to_lambda(True), 20)
+    print(f"{'to_lambda() source':<24}{before * 1000:>14.2f}{after * 1000:>12.2f}{before / after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
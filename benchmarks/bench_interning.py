@@ -0,0 +1,54 @@
+# datespan - Copyright (c)2024, Thomas Zeutschler, MIT license
+
+"""
+Measures the memory of a multi-year daily workload with and without the intern pool: 1M records over
+10 years are each mapped to the DateSpan of their day, month and quarter, as e.g. per-window aggregates do.
+Durations include the tracing overhead of tracemalloc.
+
+Usage (from the repository root): python -m benchmarks.bench_interning
+"""
+
+import gc
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from datespan import calendar_math as cm
+from datespan.date_span import DateSpan
+from datespan.interning import InternPool
+
+RECORDS = 1_000_000
+DAYS = 3653  # 10 years
+
+
+def periods(timestamp: datetime):
+    day_start = timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+    month = cm.month_index(timestamp)
+    return ((day_start, cm.day_end(timestamp)), cm.months_span(month, month),
+            cm.months_span(month - month % 3, month - month % 3 + 2))
+
+
+def run(factory, bounds) -> tuple[float, float, int]:
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    spans = [factory(s, e) for s, e in bounds]
+    duration = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size / 2 ** 20, duration, len(set(map(id, spans)))
+
+
+def main():
+    base = datetime(2015, 1, 1)
+    timestamps = [base + timedelta(days=i * DAYS / RECORDS) for i in range(RECORDS)]
+    bounds = [period for timestamp in timestamps for period in periods(timestamp)]
+    pool = InternPool()
+    print(f"{len(bounds):,} day, month and quarter spans")
+    print(f"{'spans':<24}{'MiB':>10}{'seconds':>10}{'objects':>12}")
+    print(f"{'DateSpan (no interning)':<24}{'%10.1f%10.2f%12d' % run(DateSpan.from_bounds, bounds)}")
+    print(f"{'InternPool.intern':<24}{'%10.1f%10.2f%12d' % run(pool.intern, bounds)}")
+
+
+if __name__ == "__main__":
+    main()
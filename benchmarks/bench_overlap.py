@@ -0,0 +1,59 @@
+# datespan - Copyright (c)2024, Thomas Zeutschler, MIT license
+
+"""
+Measures `DateSpanSet.overlap_duration()` for 10,000 sessions against a set of 250 reporting periods, compared to
+a Python double loop over `DateSpan.intersect()` and `timedelta` arithmetic, plus the vectorized version alone
+for 1,000,000 sessions. Requires numpy.
+
+Usage (from the repository root): python -m benchmarks.bench_overlap
+"""
+
+import timeit
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from datespan import DateSpan, DateSpanSet
+
+EVENTS = 10_000
+PERIODS = 250
+_US = timedelta(microseconds=1)
+
+
+def seconds(function, number: int = 3) -> float:
+    return min(timeit.repeat(function, number=number, repeat=5)) / number
+
+
+def main():
+    base = datetime(2024, 1, 1)
+    periods = DateSpanSet([DateSpan(base + timedelta(days=i * 1.4), base + timedelta(days=i * 1.4 + 0.5))
+                           for i in range(PERIODS)])
+    rng = np.random.default_rng(7)
+    starts = np.datetime64(base, 'us') + rng.integers(0, 365 * 86_400, EVENTS).astype('m8[s]')
+    ends = starts + rng.integers(60, 8 * 3600, EVENTS).astype('m8[s]')
+    events = [DateSpan(start, end - _US) for start, end in zip(starts.tolist(), ends.tolist())]
+
+    def double_loop():
+        result = []
+        for event in events:
+            total = 0.0
+            for period in periods:
+                overlap = event.intersect(period)
+                if not overlap.is_undefined:
+                    total += (overlap.end - overlap.start + _US).total_seconds()
+            result.append(total)
+        return result
+
+    assert np.allclose(double_loop(), periods.overlap_duration(starts, ends))
+    before = seconds(double_loop, 1)
+    after = seconds(lambda: periods.overlap_duration(starts, ends))
+    print(f"{'operation':<40}{'loop (ms)':>12}{'vectorized (ms)':>17}{'speedup':>10}")
+    print(f"{'10,000 sessions x 250 periods':<40}{before * 1000:>12.2f}{after * 1000:>17.2f}{before / after:>9.1f}x")
+
+    many = np.resize(starts, 1_000_000), np.resize(ends, 1_000_000)
+    after = seconds(lambda: periods.overlap_duration(*many))
+    print(f"{'1,000,000 sessions x 250 periods':<40}{'':>12}{after * 1000:>17.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+# datespan - Copyright (c)2024, Thomas Zeutschler, MIT license
+
+"""
+Measures the throughput of a single DateSpanParser instance shared by 1, 4 and 16 threads and checks that
+all threads return the same results. On free-threaded CPython builds (3.13t) the throughput should
+scale with the number of threads, on regular builds it is bound by the GIL.
+
+Usage (from the repository root): python -m benchmarks.bench_parser_threads
+"""
+
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from datespan.parser.datespanparser import AST_CACHE, DateSpanParser
+
+EXPRESSIONS = [
+    "2024-09-10", "15.09.2024", "dec 31 2023 23:59", "yesterday", "last month", "next 3 days",
+    "this quarter", "ytd", "l4q", "jan, feb and mar of 2024", "between 2024-01-01 and 2024-03-31",
+]
+PARSES_PER_THREAD = 20_000
+
+
+def work(parser: DateSpanParser, count: int) -> list:
+    results = []
+    for i in range(count):
+        results.append(parser.parse(EXPRESSIONS[i % len(EXPRESSIONS)]))
+    return results[:len(EXPRESSIONS)]
+
+
+def main():
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"Python {sys.version.split()[0]}, GIL {'enabled' if gil else 'disabled'}")
+    parser = DateSpanParser()
+    expected = work(parser, len(EXPRESSIONS))
+    print(f"{'threads':>8}{'parses/s':>14}{'identical':>11}")
+    for threads in (1, 4, 16):
+        AST_CACHE.clear()
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            futures = [executor.submit(work, parser, PARSES_PER_THREAD) for _ in range(threads)]
+            results = [f.result() for f in futures]
+        duration = time.perf_counter() - start
+        identical = all(r == expected for r in results)
+        print(f"{threads:>8}{threads * PARSES_PER_THREAD / duration:>14,.0f}{str(identical):>11}")
+
+
+if __name__ == "__main__":
+    main()
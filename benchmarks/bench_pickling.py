@@ -0,0 +1,55 @@
+# datespan - Copyright (c)2024, Thomas Zeutschler, MIT license
+
+"""
+Measures pickling a DateSpanSet of 100,000 spans, as two packed int64 buffers, compared to pickling the
+same spans as a list of (start, end) datetime tuples. Also measures cloning the set with shared interned
+spans compared to cloning every DateSpan.
+
+Usage (from the repository root): python -m benchmarks.bench_pickling
+"""
+
+import pickle
+import timeit
+from datetime import datetime, timedelta
+
+from datespan import DateSpan, DateSpanSet, interning
+
+COUNT = 100_000
+
+
+def seconds(function, number: int = 5) -> float:
+    return min(timeit.repeat(function, number=number, repeat=5)) / number
+
+
+def main():
+    base = datetime(2000, 1, 1)
+    dss = DateSpanSet([DateSpan(base + timedelta(hours=7 * i), base + timedelta(hours=7 * i + 3))
+                       for i in range(COUNT)])
+    dss._definition = "100,000 spans"
+    tuples = dss.to_tuples()
+    assert pickle.loads(pickle.dumps(dss)).to_tuples() == tuples
+
+    print(f"{'100,000 spans':<28}{'KiB':>10}{'dumps (ms)':>12}{'loads (ms)':>12}")
+    for name, value in (("list of datetime tuples", tuples), ("DateSpanSet", dss)):
+        state = pickle.dumps(value)
+        dumps = seconds(lambda: pickle.dumps(value))
+        loads = seconds(lambda: pickle.loads(state))
+        print(f"{name:<28}{len(state) / 1024:>10.0f}{dumps * 1000:>12.1f}{loads * 1000:>12.1f}")
+
+    days = DateSpanSet([DateSpan(base + timedelta(days=2 * i)) for i in range(COUNT)])
+    days.spans
+    interning.configure(enabled=True)
+    try:
+        interned = DateSpanSet([DateSpan(base + timedelta(days=2 * i)) for i in range(COUNT)])
+        interned.spans
+        before = seconds(days.clone)
+        after = seconds(interned.clone)
+    finally:
+        interning.configure(enabled=False)
+    print(f"\n{'clone() of 100,000 days':<28}{'ms':>10}")
+    print(f"{'cloned DateSpans':<28}{before * 1000:>10.1f}")
+    print(f"{'shared FrozenDateSpans':<28}{after * 1000:>10.1f}   {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
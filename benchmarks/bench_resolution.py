@@ -0,0 +1,52 @@
+# datespan - Copyright (c)2024, Thomas Zeutschler, MIT license
+
+"""
+Measures DateSpanSets of 100,000 day-grained spans at the default microsecond resolution compared to a
+resolution of 'day', storing the spans as integer ticks: memory of the stored spans and the time to build,
+merge, subtract and intersect the sets.
+
+Usage (from the repository root): python -m benchmarks.bench_resolution
+"""
+
+import sys
+import timeit
+from datetime import datetime, timedelta
+
+from datespan import DateSpan, DateSpanSet
+
+COUNT = 100_000
+
+
+def seconds(function, number: int = 3) -> float:
+    return min(timeit.repeat(function, number=number, repeat=3)) / number
+
+
+def stored_bytes(dss: DateSpanSet) -> int:
+    if dss._ticks is not None:
+        return dss._ticks.nbytes
+    return sys.getsizeof(dss._raw) + sum(sys.getsizeof(t) + sys.getsizeof(t[0]) + sys.getsizeof(t[1])
+                                         for t in dss._raw)
+
+
+def main():
+    base = datetime(1800, 1, 1)
+    spans = [DateSpan(base + timedelta(days=3 * i, hours=i % 24), base + timedelta(days=3 * i + 1))
+             for i in range(COUNT)]
+    others = [DateSpan(base + timedelta(days=5 * i), base + timedelta(days=5 * i + 1, hours=6)) for i in range(COUNT)]
+
+    print(f"{'100,000 spans':<16}{'KiB':>10}{'build (ms)':>12}{'merge (ms)':>12}{'subtract (ms)':>15}"
+          f"{'intersect (ms)':>16}")
+    for resolution in ("us", "day"):
+        dss = DateSpanSet(spans, resolution=resolution)
+        other = DateSpanSet(others, resolution=resolution)
+        build = seconds(lambda: DateSpanSet(spans, resolution=resolution))
+        merge = seconds(lambda: dss.merge(other))
+        subtract = seconds(lambda: dss.subtract(other), number=1) if resolution != "us" else float("nan")
+        intersect = seconds(lambda: dss.intersect(other))
+        print(f"{resolution:<16}{stored_bytes(dss) / 1024:>10.0f}{build * 1000:>12.1f}{merge * 1000:>12.1f}"
+              f"{subtract * 1000:>15.1f}{intersect * 1000:>16.1f}")
+    print("\nsubtract() of microsecond sets subtracts span by span and is not measured for 100,000 spans.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# datespan - Copyright (c)2024, Thomas Zeutschler, MIT license
+
+"""
+Measures resolving relative expressions like 'today' or 'this week' for users in 40 time zones. Parsing
+the text once per time zone, localizing every datetime through zoneinfo, is compared to `parse_zones()`,
+which evaluates the text once per distinct wall-clock time and localizes all results with offset lookups
+in the cached transition tables. Also measures normalizing 10,000 naive spans of a time zone to UTC
+microseconds, through zoneinfo per datetime and with a single vectorized lookup by `DateSpanSet.localize()`.
+
+Usage (from the repository root): python -m benchmarks.bench_timezones
+"""
+
+import timeit
+from datetime import datetime, timedelta, timezone
+
+import datespan
+from datespan import DateSpanSet
+from datespan.calendar_math import to_epoch_us
+from datespan.timezones import resolve_zone
+
+ZONES = ["UTC", "Europe/London", "Europe/Berlin", "Europe/Paris", "Europe/Madrid", "Europe/Rome", "Europe/Warsaw",
+         "Europe/Athens", "Europe/Helsinki", "Europe/Istanbul", "Europe/Moscow", "Africa/Cairo",
+         "Africa/Johannesburg", "Africa/Lagos", "Africa/Nairobi", "Asia/Dubai", "Asia/Karachi", "Asia/Kolkata",
+         "Asia/Dhaka", "Asia/Bangkok", "Asia/Jakarta", "Asia/Shanghai", "Asia/Singapore", "Asia/Hong_Kong",
+         "Asia/Seoul", "Asia/Tokyo", "Australia/Perth", "Australia/Adelaide", "Australia/Sydney",
+         "Pacific/Auckland", "Pacific/Honolulu", "America/Anchorage", "America/Los_Angeles", "America/Denver",
+         "America/Phoenix", "America/Chicago", "America/Mexico_City", "America/New_York", "America/Sao_Paulo",
+         "America/Argentina/Buenos_Aires"]
+TEXTS = ["today", "this week", "last month", "next 3 days"]
+AS_OF = datetime(2024, 3, 5, 20, tzinfo=timezone.utc)
+REPEAT = 200
+SPANS = 10_000
+
+
+def per_zone():
+    return {zone: datespan.parse(text, as_of=AS_OF, tz=zone) for text in TEXTS for zone in ZONES}
+
+
+def all_zones():
+    return [datespan.parse_zones(text, ZONES, as_of=AS_OF) for text in TEXTS]
+
+
+def seconds(function, number: int) -> float:
+    return min(timeit.repeat(function, number=number, repeat=5))
+
+
+def main():
+    assert len(ZONES) == 40
+    for text, result in zip(TEXTS, all_zones()):
+        for zone in ZONES:
+            assert result[zone].to_tuples() == datespan.parse(text, as_of=AS_OF, tz=zone).to_tuples()
+
+    before = seconds(per_zone, REPEAT)
+    after = seconds(all_zones, REPEAT)
+    print(f"{'40 time zones x 4 texts':<28}{'ms per call':>12}")
+    print(f"{'parse() per time zone':<28}{before / REPEAT * 1000:>12.2f}")
+    print(f"{'parse_zones()':<28}{after / REPEAT * 1000:>12.2f}   {before / after:.1f}x")
+
+    naive = DateSpanSet([datetime(2000, 1, 1) + timedelta(hours=7 * i) for i in range(SPANS)])
+    zone = resolve_zone("America/New_York")
+
+    def zoneinfo_offsets():
+        return [(to_epoch_us(start.replace(tzinfo=zone)), to_epoch_us(end.replace(tzinfo=zone)))
+                for start, end in naive.to_tuples()]
+
+    def localize():
+        return naive.localize(zone)
+
+    assert [(span.start_us, span.end_us) for span in localize()] == zoneinfo_offsets()
+    before = seconds(zoneinfo_offsets, 20)
+    after = seconds(localize, 20)
+    print(f"\n{f'localize {SPANS:,} spans':<28}{'ms per call':>12}")
+    print(f"{'zoneinfo per datetime':<28}{before / 20 * 1000:>12.2f}")
+    print(f"{'DateSpanSet.localize()':<28}{after / 20 * 1000:>12.2f}   {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,11 +2,16 @@
 
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import datetime, timezone, tzinfo
 from dateutil.parser import parserinfo
 
-from datespan.date_span import DateSpan
+from datespan.business import BusinessCalendar
+from datespan.date_span import DateSpan, FrozenDateSpan
 from datespan.date_span_set import DateSpanSet
+from datespan.fiscal import FiscalCalendar
+from datespan.parser.numeric_dates import infer_date_format
+from datespan.timezones import resolve_zone, wall_clock
+from datespan.aio import aparse, aparse_many
 
 __author__ = "Thomas Zeutschler"
 __version__ = "0.2.9"
@@ -16,12 +21,28 @@ VERSION = __version__
 __all__ = [
     "DateSpanSet",
     "DateSpan",
+    "FrozenDateSpan",
+    "FiscalCalendar",
+    "BusinessCalendar",
     "parse",
+    "parse_zones",
+    "aparse",
+    "aparse_many",
+    "infer_date_format",
     "VERSION",
 ]
 
 
-def parse(datespan_text: str, parser_info: parserinfo = None) -> DateSpanSet:
+def __getattr__(name: str):
+    if name == "DateSpanArray":  # requires numpy, imported on first use only
+        from datespan.date_span_array import DateSpanArray
+        return DateSpanArray
+    raise AttributeError(f"module 'datespan' has no attribute '{name}'")
+
+
+def parse(datespan_text: str, parser_info: parserinfo = None, date_format: str = None,
+          as_of: datetime = None, tz: tzinfo | str = None, fiscal_calendar: FiscalCalendar = None,
+          business_calendar: BusinessCalendar = None) -> DateSpanSet:
     """
     Creates a new DateSpanSet instance and parses the given text into a set of DateSpan objects.
 
@@ -30,6 +51,13 @@ def parse(datespan_text: str, parser_info: parserinfo = None) -> DateSpanSet:
         language: (optional) An ISO 639-1 2-digit compliant language code for the language of the text to parse.
         parser_info: (optional) A dateutil.parser_old.parserinfo instance to use for parsing dates contained
             datespan_text. If not defined, the default parser_old of the dateutil library will be used.
+        date_format: (optional) Format hint for numeric dates like '03.04.2024', either 'ymd', 'dmy' or 'mdy'.
+            Use `infer_date_format()` to infer the hint once from sample values of a data source.
+        as_of: (optional) The date and time relative expressions like 'today' refer to. Defaults to now.
+        tz: (optional) A tzinfo or time zone name like 'Europe/Berlin'. If defined, the text is evaluated
+            in wall-clock time of the time zone and results in timezone-aware DateSpans.
+        fiscal_calendar: (optional) A FiscalCalendar for fiscal expressions like 'fy', 'fytd' or 'last fiscal year'.
+        business_calendar: (optional) A BusinessCalendar for expressions like 'last 10 business days'.
 
     Returns:
         The DateSpanSet instance contain 0 to N DateSpan objects derived from the given text.
@@ -38,4 +66,49 @@ def parse(datespan_text: str, parser_info: parserinfo = None) -> DateSpanSet:
         >>> DateSpanSet('last month')  # if today would be 2024-02-12
         DateSpanSet([DateSpan(datetime.datetime(2024, 1, 1, 0, 0), datetime.datetime(2024, 1, 31, 23, 59, 59, 999999))])
     """
-    return DateSpanSet(definition=datespan_text, parser_info=parser_info)
+    return DateSpanSet(definition=datespan_text, parser_info=parser_info, date_format=date_format, as_of=as_of, tz=tz,
+                       fiscal_calendar=fiscal_calendar, business_calendar=business_calendar)
+
+
+def parse_zones(datespan_text: str, zones, as_of: datetime = None, parser_info: parserinfo = None,
+                date_format: str = None) -> dict:
+    """
+    Parses the given text for many time zones at once, e.g. to resolve 'today' or 'this week' for users
+    all around the world. The text is evaluated only once per distinct wall-clock time of `as_of` in the
+    given time zones, the results are then localized per time zone with a vectorized UTC offset lookup.
+
+    Arguments:
+        datespan_text: The date span text to parse, e.g. 'today', 'this week' or 'last month'.
+        zones: An iterable of tzinfo instances or time zone names like 'Europe/Berlin'.
+        as_of: (optional) The point in time relative expressions refer to. Defaults to now. Naive datetimes
+            are used as the wall-clock time in every time zone.
+        parser_info: (optional) A dateutil.parser.parserinfo instance to use for parsing dates contained
+            datespan_text.
+        date_format: (optional) Format hint for numeric dates like '03.04.2024', either 'ymd', 'dmy' or 'mdy'.
+
+    Returns:
+        A dictionary of the given time zones and their timezone-aware DateSpanSets.
+
+    Errors:
+        ValueError: If a time zone is unknown or the text cannot be parsed.
+
+    Examples:
+        >>> sets = parse_zones('today', ['Asia/Tokyo', 'America/New_York'])
+        >>> sets['Asia/Tokyo'].tz
+        zoneinfo.ZoneInfo(key='Asia/Tokyo')
+    """
+    if as_of is None:
+        as_of = datetime.now(timezone.utc)
+    groups: dict[datetime, list] = {}
+    for zone in zones:
+        tz = resolve_zone(zone)
+        groups.setdefault(wall_clock(as_of, tz), []).append((zone, tz))
+    result = {}
+    for wall, members in groups.items():
+        naive = DateSpanSet(datespan_text, parser_info=parser_info, date_format=date_format, as_of=wall)
+        bounds = naive._wall_bounds()
+        for zone, tz in members:
+            dss = naive.localize(tz) if bounds is None else naive._localized(bounds, tz)
+            dss._as_of = as_of
+            result[zone] = dss
+    return result
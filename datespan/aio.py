@@ -0,0 +1,142 @@
+# datespan - Copyright (c)2024, Thomas Zeutschler, MIT license
+
+"""
+asyncio-native parsing of date span texts.
+
+Texts whose tokens and AST are already cached are parsed inline, as only their (cheap) evaluation is left.
+All other texts are parsed in an executor, so the event loop is never blocked by lexing, parsing or
+dateutil fallbacks. A bounded semaphore per event loop limits the number of parses in flight and
+identical concurrent requests are coalesced into a single computation.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import Executor
+from typing import Iterable
+from weakref import WeakKeyDictionary
+
+from dateutil.parser import parserinfo
+
+from datespan.date_span_set import DateSpanSet
+from datespan.parser.datespanparser import DateSpanParser
+
+_executor: Executor | None = None
+_max_in_flight: int = 64
+_loop_states: WeakKeyDictionary = WeakKeyDictionary()
+
+
+class _LoopState:
+    """The semaphore and the requests in flight of a single event loop."""
+
+    def __init__(self, max_in_flight: int):
+        self.semaphore = asyncio.Semaphore(max_in_flight)
+        self.in_flight: dict[tuple, _Request] = {}
+
+
+class _Request:
+    """A parse in flight, run as its own task, and the number of callers waiting for it."""
+    __slots__ = ('task', 'waiters')
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+def configure(executor: Executor = None, max_in_flight: int = 64):
+    """
+    Configures the asynchronous parsing.
+
+    Arguments:
+        executor: (optional) A thread or process pool executor to parse texts with. If not defined,
+            the default executor of the event loop is used. Note that a process pool executor does not
+            fill the caches of the calling process, so inline parsing of cached texts does not apply.
+        max_in_flight: (optional) The maximum number of texts parsed concurrently per event loop.
+    """
+    global _executor, _max_in_flight
+    if max_in_flight < 1:
+        raise ValueError(f"max_in_flight must be a positive integer, but is {max_in_flight}.")
+    _executor = executor
+    _max_in_flight = max_in_flight
+    _loop_states.clear()
+
+
+def _parse(text: str, parser_info: parserinfo = None, date_format: str = None) -> DateSpanSet:
+    return DateSpanSet(definition=text, parser_info=parser_info, date_format=date_format)
+
+
+async def _parse_limited(state: _LoopState, key: tuple) -> DateSpanSet:
+    async with state.semaphore:
+        return await asyncio.get_running_loop().run_in_executor(_executor, _parse, *key)
+
+
+def _release(state: _LoopState, key: tuple, request: _Request):
+    if state.in_flight.get(key) is request:
+        del state.in_flight[key]
+
+
+async def aparse(datespan_text: str, parser_info: parserinfo = None, date_format: str = None) -> DateSpanSet:
+    """
+    Asynchronously creates a new DateSpanSet instance and parses the given text into a set of DateSpan objects.
+
+    Arguments:
+        datespan_text: The date span text to parse, e.g. 'last month', 'next 3 days', 'yesterday' or 'Jan 2024'.
+        parser_info: (optional) A dateutil.parser.parserinfo instance to use for parsing dates contained
+            datespan_text. If not defined, the default parser of the dateutil library will be used.
+        date_format: (optional) Format hint for numeric dates like '03.04.2024', either 'ymd', 'dmy' or 'mdy'.
+
+    Returns:
+        The DateSpanSet instance contain 0 to N DateSpan objects derived from the given text.
+
+    Errors:
+        ValueError: If the text cannot be parsed.
+
+    Examples:
+        >>> await aparse('last month')  # if today would be in February 2024
+        DateSpanSet([DateSpan(datetime.datetime(2024, 1, 1, 0, 0), datetime.datetime(2024, 1, 31, 23, 59, 59, 999999))])
+    """
+    if not isinstance(datespan_text, str) or DateSpanParser.is_compiled(datespan_text, parser_info):
+        return _parse(datespan_text, parser_info, date_format)
+
+    loop = asyncio.get_running_loop()
+    state = _loop_states.get(loop)
+    if state is None:
+        state = _loop_states[loop] = _LoopState(_max_in_flight)
+
+    key = (datespan_text, parser_info, date_format)
+    request = state.in_flight.get(key)
+    first = request is None
+    if first:
+        # the parse runs as its own task, so cancelling one caller does not cancel it for the others
+        request = state.in_flight[key] = _Request(loop.create_task(_parse_limited(state, key)))
+        request.task.add_done_callback(lambda _, request=request: _release(state, key, request))
+
+    request.waiters += 1
+    try:
+        result = await asyncio.shield(request.task)
+    finally:
+        request.waiters -= 1
+        if request.waiters == 0 and not request.task.done():
+            # all callers have been cancelled, nobody is waiting for the result anymore
+            _release(state, key, request)
+            request.task.cancel()
+    return result if first else result.clone()
+
+
+async def aparse_many(datespan_texts: Iterable[str], parser_info: parserinfo = None, date_format: str = None,
+                      return_exceptions: bool = False) -> list:
+    """
+    Asynchronously parses multiple date span texts into DateSpanSet instances.
+
+    Arguments:
+        datespan_texts: The date span texts to parse.
+        parser_info: (optional) A dateutil.parser.parserinfo instance to use for parsing dates contained in the texts.
+        date_format: (optional) Format hint for numeric dates like '03.04.2024', either 'ymd', 'dmy' or 'mdy'.
+        return_exceptions: (optional) If True, errors are returned in place of the DateSpanSet of the
+            failing text, otherwise the first error is raised.
+
+    Returns:
+        A list of DateSpanSet instances in the order of the given texts.
+    """
+    return list(await asyncio.gather(*(aparse(text, parser_info, date_format) for text in datespan_texts),
+                                     return_exceptions=return_exceptions))
@@ -0,0 +1,238 @@
+# datespan - Copyright (c)2024, Thomas Zeutschler, MIT license
+
+"""
+Business day calendars, the days from `DateSpan.MIN_DATE` to `DateSpan.MAX_DATE` as a bitmap of one bit per day,
+set for business days, plus the running count of business days before each byte of the bitmap.
+
+Counting the business days between two dates is a difference of two running counts plus the popcount of two
+partial bytes, shifting a date by N business days a binary search in the running counts. Both are independent
+of the length of the range, no day-by-day loops.
+
+Examples:
+    >>> calendar = BusinessCalendar(holidays=[date(2024, 12, 25), date(2024, 12, 26)])
+    >>> calendar.count(date(2024, 12, 23), date(2024, 12, 31))
+    5
+    >>> calendar.shift(date(2024, 12, 24), 1)
+    datetime.datetime(2024, 12, 27, 0, 0)
+"""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_right
+from datetime import date, datetime, time
+from itertools import accumulate
+
+from datespan import calendar_math as cm
+from datespan.date_span import DateSpan
+
+FIRST_ORDINAL = DateSpan.MIN_DATE.toordinal()
+"""The day ordinal of the first day of the bitmaps."""
+DAYS = DateSpan.MAX_DATE.toordinal() - FIRST_ORDINAL + 1
+"""The number of days of the bitmaps."""
+
+_POPCOUNT = bytes(bin(value).count('1') for value in range(256))  # the number of set bits of each byte value
+
+
+class BusinessCalendar:
+    """
+    A calendar of business days, all days except weekend days and holidays. Used by the `Evaluator` for
+    expressions like 'last 10 business days' or 'every workday of last quarter' and by the business day
+    methods of DateSpanSet. Instances are immutable, hashable and compare equal if their weekend days and
+    holidays are equal. The bitmap is built on first use.
+    """
+    __slots__ = ('weekend', 'holidays', '_bitmap', '_counts')
+
+    def __init__(self, holidays=(), weekend=(5, 6)):
+        """
+        Arguments:
+            holidays: (optional) The holidays, an iterable of dates, datetimes, DateSpans or date span texts,
+                or a DateSpanSet. DateSpans and texts make all days they touch holidays.
+            weekend: (optional) The weekdays that are no business days, Monday is 0 and Sunday is 6.
+                Defaults to Saturday and Sunday.
+
+        Errors:
+            ValueError: If a weekday or holiday is not supported.
+
+        Examples:
+            >>> calendar = BusinessCalendar(holidays=['2024-12-24', date(2024, 12, 25), date(2024, 12, 26)])
+        """
+        weekend = tuple(sorted(set(weekend)))
+        if not all(isinstance(day, int) and 0 <= day <= 6 for day in weekend):
+            raise ValueError(f"Invalid weekend days {weekend}, use 0 (Monday) to 6 (Sunday).")
+        self.weekend: tuple[int, ...] = weekend
+        self.holidays: tuple[tuple[int, int], ...] = _day_ranges(holidays)  # (first, last) day ordinals
+        self._bitmap: bytearray | None = None
+        self._counts: array | None = None
+
+    def __repr__(self):
+        return f"BusinessCalendar(holidays={len(self.holidays)} ranges, weekend={self.weekend})"
+
+    def __eq__(self, other):
+        return (isinstance(other, BusinessCalendar) and self.weekend == other.weekend
+                and self.holidays == other.holidays)
+
+    def __hash__(self):
+        return hash((self.weekend, self.holidays))
+
+    # region lookups
+    def is_business_day(self, dt) -> bool:
+        """Returns True if the day of the given date or datetime is a business day."""
+        index = _index(dt.toordinal())
+        return bool(self._bits()[index >> 3] >> (index & 7) & 1)
+
+    def count(self, start, end) -> int:
+        """
+        Returns the number of business days from the day of `start` to the day of `end`, both included.
+
+        Errors:
+            ValueError: If a date is outside the range from `DateSpan.MIN_DATE` to `DateSpan.MAX_DATE`.
+        """
+        first, last = _index(start.toordinal()), _index(end.toordinal())
+        if first > last:
+            return 0
+        return self._rank(last + 1) - self._rank(first)
+
+    def shift(self, dt, days: int):
+        """
+        Returns the date or datetime shifted by the given +/- number of business days, keeping the time of day.
+        Shifting by 0 days returns the given day if it is a business day, otherwise the next business day.
+
+        Errors:
+            ValueError: If the result is outside the range from `DateSpan.MIN_DATE` to `DateSpan.MAX_DATE`.
+
+        Examples:
+            >>> BusinessCalendar().shift(datetime(2024, 11, 15, 10, 30), 1)  # a Friday
+            datetime.datetime(2024, 11, 18, 10, 30)
+        """
+        index = _index(dt.toordinal())
+        rank = self._rank(index + 1) + days - 1 if days > 0 else self._rank(index) + days
+        ordinal = FIRST_ORDINAL + self._select(rank)
+        if not isinstance(dt, datetime):
+            return date.fromordinal(ordinal)
+        return datetime.combine(date.fromordinal(ordinal), dt.timetz())
+
+    def spans(self, start, end) -> list[tuple[datetime, datetime]]:
+        """
+        Returns the (start, end) tuples of the runs of consecutive business days from `start` to `end`, the
+        first and last run clipped to `start` and `end`. Timezone-aware datetimes keep their time zone.
+
+        Examples:
+            >>> BusinessCalendar().spans(datetime(2024, 11, 15), datetime(2024, 11, 18, 23, 59, 59, 999999))
+            [(datetime.datetime(2024, 11, 15, 0, 0), datetime.datetime(2024, 11, 15, 23, 59, 59, 999999)),
+             (datetime.datetime(2024, 11, 18, 0, 0), datetime.datetime(2024, 11, 18, 23, 59, 59, 999999))]
+        """
+        start, end = _as_datetime(start), _as_datetime(end, time.max)
+        first, last = _index(start.toordinal()), _index(end.toordinal())
+        if first > last:
+            return []
+        bitmap = self._bits()
+        offset = first & ~7
+        bits = int.from_bytes(bitmap[offset >> 3:(last >> 3) + 1], 'little') >> (first - offset)
+        bits &= (1 << (last - first + 1)) - 1
+        tz = start.tzinfo
+        result = []
+        while bits:
+            low = (bits & -bits).bit_length() - 1
+            run = bits >> low
+            length = (~run & (run + 1)).bit_length() - 1  # the number of consecutive set bits
+            bits &= ~(((1 << length) - 1) << low)
+            run_start = datetime.fromordinal(FIRST_ORDINAL + first + low).replace(tzinfo=tz)
+            run_end = datetime.fromordinal(FIRST_ORDINAL + first + low + length) - cm.MICROSECOND
+            run_end = run_end.replace(tzinfo=tz)
+            granularity = 'day'
+            if run_start < start:
+                run_start, granularity = start, None
+            if run_end > end:
+                run_end, granularity = end, None
+            result.append(cm.calendar_span(run_start, run_end, granularity))
+        return result
+    # endregion
+
+    # region bitmap
+    def _bits(self) -> bytearray:
+        """Returns the bitmap of business days, built on first use."""
+        if self._bitmap is None:
+            self._build()
+        return self._bitmap
+
+    def _build(self):
+        """Builds the bitmap from a repeated 56 day (7 byte) weekday pattern and the running byte counts."""
+        weekday = DateSpan.MIN_DATE.weekday()
+        pattern = bytes(sum(((weekday + byte * 8 + bit) % 7 not in self.weekend) << bit for bit in range(8))
+                        for byte in range(7))
+        size = (DAYS + 7) >> 3
+        bitmap = bytearray(pattern * (size // 7 + 1))[:size]
+        bitmap[-1] &= (1 << (DAYS - (size - 1) * 8)) - 1  # no business days after the last day
+        for first, last in self.holidays:
+            for index in range(max(first - FIRST_ORDINAL, 0), min(last - FIRST_ORDINAL, DAYS - 1) + 1):
+                bitmap[index >> 3] &= ~(1 << (index & 7))
+        counts = array('i', [0])
+        counts.extend(accumulate(bitmap.translate(_POPCOUNT)))
+        self._bitmap, self._counts = bitmap, counts
+
+    def _rank(self, index: int) -> int:
+        """Returns the number of business days before the day with the given index of the bitmap."""
+        bitmap = self._bits()
+        byte = index >> 3
+        if byte == len(bitmap):
+            return self._counts[byte]
+        return self._counts[byte] + _POPCOUNT[bitmap[byte] & ((1 << (index & 7)) - 1)]
+
+    def _select(self, rank: int) -> int:
+        """Returns the index of the business day preceded by `rank` business days."""
+        bitmap, counts = self._bits(), self._counts
+        byte = bisect_right(counts, rank) - 1
+        if rank < 0 or byte >= len(bitmap):
+            raise ValueError("The shifted date is outside the range of the business calendar.")
+        rank -= counts[byte]
+        bits = bitmap[byte]
+        for bit in range(8):  # at most 8 bits of a single byte
+            if bits >> bit & 1:
+                if rank == 0:
+                    return (byte << 3) + bit
+                rank -= 1
+    # endregion
+
+
+def _index(ordinal: int) -> int:
+    """Returns the index of the day ordinal in the bitmaps."""
+    index = ordinal - FIRST_ORDINAL
+    if not 0 <= index < DAYS:
+        raise ValueError(f"The date '{date.fromordinal(ordinal)}' is outside the range of the business calendar.")
+    return index
+
+
+def _as_datetime(value, default: time = time.min) -> datetime:
+    """Returns a datetime for a date or datetime, dates at the given time of day."""
+    if isinstance(value, datetime):
+        return value
+    return datetime.combine(value, default)
+
+
+def _day_ranges(holidays) -> tuple[tuple[int, int], ...]:
+    """Returns the sorted (first, last) day ordinals of holidays given as dates, DateSpans, DateSpanSets or texts."""
+    if isinstance(holidays, (str, date, DateSpan)):
+        holidays = [holidays]
+    if not holidays:
+        return ()
+    from datespan.date_span_set import DateSpanSet  # DateSpanSet imports this module
+
+    ranges = []
+    for holiday in holidays:
+        if isinstance(holiday, str):
+            holiday = DateSpanSet(holiday)
+        if isinstance(holiday, DateSpanSet):
+            ranges.extend((start.toordinal(), end.toordinal()) for start, end in holiday.to_tuples())
+        elif isinstance(holiday, DateSpan):
+            if not holiday.is_undefined:
+                ranges.append((holiday.start.toordinal(), holiday.end.toordinal()))
+        elif isinstance(holiday, date):
+            ranges.append((holiday.toordinal(), holiday.toordinal()))
+        else:
+            raise ValueError(f"Holidays of type '{type(holiday)}' are not supported.")
+    return tuple(sorted(ranges))
+
+
+WEEKDAYS = BusinessCalendar()
+"""The default business calendar, Monday to Friday without holidays."""
@@ -0,0 +1,362 @@
+# datespan - Copyright (c)2024, Thomas Zeutschler, MIT license
+
+"""
+Allocation-lean calendar arithmetic on plain integers and datetimes.
+
+All functions return final `datetime` values or `(start, end)` tuples, without building intermediate
+DateSpan objects or relativedelta instances. Used by the Evaluator to resolve relative date expressions.
+Tuples of full days, weeks, months, quarters or years are tagged with their granularity, see `CalendarSpan`.
+"""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_right
+from datetime import datetime, timedelta, timezone, tzinfo
+
+_DAYS_IN_MONTH = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+HOUR = timedelta(hours=1)
+MINUTE = timedelta(minutes=1)
+SECOND = timedelta(seconds=1)
+MILLISECOND = timedelta(milliseconds=1)
+MICROSECOND = timedelta(microseconds=1)
+
+EPOCH = datetime(1970, 1, 1)
+EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+EPOCH_ORDINAL = EPOCH.toordinal()
+DAY_US = 86_400_000_000
+_UNIT_US = (('week', 7 * DAY_US), ('day', DAY_US), ('hour', 3_600_000_000), ('minute', 60_000_000),
+            ('second', 1_000_000))
+
+
+def is_leap_year(year: int) -> bool:
+    """Returns True if the given year is a leap year."""
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+
+def days_in_month(year: int, month: int) -> int:
+    """Returns the number of days of the given month."""
+    if month == 2 and is_leap_year(year):
+        return 29
+    return _DAYS_IN_MONTH[month - 1]
+
+
+# region granularity
+GRANULARITIES = ('microsecond', 'second', 'minute', 'hour', 'day', 'week', 'month', 'quarter', 'year')
+"""The calendar units a span can be made of, from the finest to the coarsest. Weeks start on Monday."""
+
+_DAY_UNITS = frozenset(('day', 'week', 'month', 'quarter', 'year'))
+ALIGNED = {
+    'year': frozenset(('year',)),
+    'quarter': frozenset(('quarter', 'year')),
+    'month': frozenset(('month', 'quarter', 'year')),
+    'week': frozenset(('week',)),
+    'day': _DAY_UNITS,
+    'hour': _DAY_UNITS | {'hour'},
+    'minute': _DAY_UNITS | {'hour', 'minute'},
+    'second': _DAY_UNITS | {'hour', 'minute', 'second'},
+    'microsecond': frozenset(GRANULARITIES),
+}
+"""Maps each unit to the granularities of spans made of full units, e.g. spans of quarters are made of full months."""
+
+
+class CalendarSpan(tuple):
+    """
+    A `(start, end)` tuple made of full calendar units, e.g. as returned by `months_span()`. Behaves and
+    compares like a plain tuple, its subclass defines the `granularity`, so the tuple stays as lean as a plain one.
+    """
+    __slots__ = ()
+    granularity: str = None
+
+    def __reduce__(self):
+        return calendar_span, (self[0], self[1], self.granularity)
+
+
+_CALENDAR_SPANS = {unit: type(f"{unit.title()}Span", (CalendarSpan,), {'__slots__': (), 'granularity': unit})
+                   for unit in GRANULARITIES}
+_DAYS, _WEEKS, _MONTHS, _QUARTERS, _YEARS = (_CALENDAR_SPANS[unit]
+                                             for unit in ('day', 'week', 'month', 'quarter', 'year'))
+
+
+def calendar_span(start, end, granularity: str | None) -> tuple:
+    """Returns the `(start, end)` tuple tagged with the given granularity, a plain tuple if it is None."""
+    if granularity is None:
+        return start, end
+    return _CALENDAR_SPANS[granularity]((start, end))
+
+
+def granularity_of(span: tuple) -> str | None:
+    """Returns the granularity of a `(start, end)` tuple, or None for plain tuples."""
+    return None if type(span) is tuple else span.granularity
+
+
+def common_granularity(first: str | None, second: str | None) -> str | None:
+    """
+    Returns the coarsest granularity that spans of both granularities are made of, e.g. 'day' for
+    'week' and 'month', or None if one of the granularities is unknown. Used for merged or shifted spans.
+    """
+    if first == second:
+        return first
+    if first is None or second is None:
+        return None
+    for unit in reversed(GRANULARITIES):
+        aligned = ALIGNED[unit]
+        if first in aligned and second in aligned:
+            return unit
+
+
+def months_granularity(months: int) -> str:
+    """Returns the coarsest granularity of a shift by the given number of months."""
+    if months % 12 == 0:
+        return 'year'
+    return 'quarter' if months % 3 == 0 else 'month'
+
+
+def delta_granularity(us: int) -> str:
+    """Returns the coarsest granularity of a shift by the given number of microseconds."""
+    for unit, length in _UNIT_US:
+        if us % length == 0:
+            return unit
+    return 'microsecond'
+# endregion
+
+
+# region days
+def day_start(dt) -> datetime:
+    """Returns the beginning of the day (00:00:00.000000) of the given date or datetime."""
+    return datetime(dt.year, dt.month, dt.day)
+
+
+def day_end(dt) -> datetime:
+    """Returns the end of the day (23:59:59.999999) of the given date or datetime."""
+    return datetime(dt.year, dt.month, dt.day, 23, 59, 59, 999999)
+
+
+def days_span(first, last) -> tuple[datetime, datetime]:
+    """Returns the span from the beginning of day `first` to the end of day `last`."""
+    return _DAYS((datetime(first.year, first.month, first.day),
+                  datetime(last.year, last.month, last.day, 23, 59, 59, 999999)))
+
+
+def ordinal_span(first: int, last: int) -> tuple[datetime, datetime]:
+    """Returns the span from the beginning of the day with ordinal `first` to the end of day with ordinal `last`."""
+    return _DAYS((datetime.fromordinal(first), datetime.fromordinal(last + 1) - MICROSECOND))
+# endregion
+
+
+# region weeks
+def week_start_ordinal(dt, week_start: int = 0) -> int:
+    """
+    Returns the day ordinal of the first day of the week containing `dt`.
+    `week_start` defines the first day of the week, Monday is 0 and Sunday is 6.
+    """
+    return dt.toordinal() - (dt.weekday() - week_start) % 7
+
+
+def weeks_span(dt, first: int, last: int, week_start: int = 0) -> tuple[datetime, datetime]:
+    """
+    Returns the span from the beginning of the week `first` to the end of week `last`, both relative
+    to the week containing `dt`, e.g. `weeks_span(dt, -3, -1)` returns the three weeks before the current week.
+    """
+    base = week_start_ordinal(dt, week_start)
+    span = ordinal_span(base + 7 * first, base + 7 * last + 6)
+    return _WEEKS(span) if week_start == 0 else span
+# endregion
+
+
+# region months, quarters and years
+def month_index(dt) -> int:
+    """Returns a continuous month index for the given date or datetime, `year * 12 + month - 1`."""
+    return dt.year * 12 + dt.month - 1
+
+
+def month_start(index: int) -> datetime:
+    """Returns the beginning of the month with the given continuous month index."""
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def month_end(index: int) -> datetime:
+    """Returns the end (last day, 23:59:59.999999) of the month with the given continuous month index."""
+    year, month = divmod(index, 12)
+    month += 1
+    return datetime(year, month, days_in_month(year, month), 23, 59, 59, 999999)
+
+
+def months_span(first: int, last: int) -> tuple[datetime, datetime]:
+    """Returns the span from the beginning of month index `first` to the end of month index `last`."""
+    return _MONTHS((month_start(first), month_end(last)))
+
+
+def quarter_index(dt) -> int:
+    """Returns a continuous quarter index for the given date or datetime, `year * 4 + quarter - 1`."""
+    return dt.year * 4 + (dt.month - 1) // 3
+
+
+def quarters_span(first: int, last: int) -> tuple[datetime, datetime]:
+    """Returns the span from the beginning of quarter index `first` to the end of quarter index `last`."""
+    return _QUARTERS((month_start(first * 3), month_end(last * 3 + 2)))
+
+
+def years_span(first: int, last: int) -> tuple[datetime, datetime]:
+    """Returns the span from the beginning of year `first` to the end of year `last`."""
+    return _YEARS((datetime(first, 1, 1), datetime(last, 12, 31, 23, 59, 59, 999999)))
+
+
+def add_months(dt: datetime, months: int) -> datetime:
+    """
+    Adds the given +/- number of months to a datetime. The day is clipped to the last day of the target month,
+    e.g. 31st of March minus one month returns the 28th or 29th of February. Same as `dt + relativedelta(months=n)`.
+    """
+    year, month = divmod(dt.year * 12 + dt.month - 1 + months, 12)
+    month += 1
+    day = dt.day
+    if day > 28:
+        day = min(day, days_in_month(year, month))
+    return dt.replace(year=year, month=month, day=day)
+# endregion
+
+
+# region time of day
+def floor_hour(dt: datetime) -> datetime:
+    """Returns the beginning of the hour of the given datetime."""
+    return dt.replace(minute=0, second=0, microsecond=0)
+
+
+def floor_minute(dt: datetime) -> datetime:
+    """Returns the beginning of the minute of the given datetime."""
+    return dt.replace(second=0, microsecond=0)
+
+
+def floor_second(dt: datetime) -> datetime:
+    """Returns the beginning of the second of the given datetime."""
+    return dt.replace(microsecond=0)
+
+
+def floor_millisecond(dt: datetime) -> datetime:
+    """Returns the beginning of the millisecond of the given datetime."""
+    return dt.replace(microsecond=dt.microsecond // 1000 * 1000)
+# endregion
+
+
+# region epoch microseconds
+def to_epoch_us(dt: datetime) -> int:
+    """
+    Returns the microseconds since 1970-01-01 for a datetime. Naive datetimes are counted in wall-clock time,
+    timezone-aware datetimes in UTC.
+    """
+    if dt.tzinfo is None:
+        return (dt - EPOCH) // MICROSECOND
+    return (dt - EPOCH_UTC) // MICROSECOND
+
+
+def from_epoch_us(us: int, tz: tzinfo = None) -> datetime:
+    """
+    Returns the datetime for the given microseconds since 1970-01-01. If a timezone is given, the
+    microseconds are interpreted as UTC and converted to the timezone, otherwise a naive datetime is returned.
+    """
+    dt = EPOCH + timedelta(microseconds=us)
+    if tz is None:
+        return dt
+    return tz.fromutc(dt.replace(tzinfo=tz))
+# endregion
+
+
+# region boundary tables
+TABLE_FIRST_YEAR = 1678
+TABLE_LAST_YEAR = 2261
+_TABLE_FIRST_MONTH = TABLE_FIRST_YEAR * 12
+_EPOCH_WEEKDAY = EPOCH.weekday()
+
+MONTH_STARTS = array('q', [to_epoch_us(month_start(index))
+                           for index in range(_TABLE_FIRST_MONTH, (TABLE_LAST_YEAR + 1) * 12 + 1)])
+"""
+Microseconds since 1970-01-01 of the beginning of every month from January 1678 to January 2262, indexed by
+`month_index(dt) - TABLE_FIRST_YEAR * 12`. The month after the last month closes the end of the table.
+"""
+
+
+def months_span_us(first: int, last: int) -> tuple[int, int] | None:
+    """
+    Returns the span from the beginning of month index `first` to the end of month index `last` as
+    microseconds since 1970-01-01, or None if the months are outside the range of the boundary tables.
+    """
+    first -= _TABLE_FIRST_MONTH
+    last -= _TABLE_FIRST_MONTH - 1
+    if first < 0 or last >= len(MONTH_STARTS):
+        return None
+    return MONTH_STARTS[first], MONTH_STARTS[last] - 1
+
+
+def month_index_us(us: int) -> int | None:
+    """
+    Returns the continuous month index for microseconds since 1970-01-01,
+    or None if outside the range of the boundary tables.
+    """
+    position = bisect_right(MONTH_STARTS, us)
+    if position == 0 or position == len(MONTH_STARTS):
+        return None
+    return position - 1 + _TABLE_FIRST_MONTH
+
+
+def weeks_span_us(first: int, last: int, week_start: int = 0) -> tuple[int, int]:
+    """
+    Returns the span from the beginning of the week containing `first` to the end of the week containing `last`,
+    all as microseconds since 1970-01-01. `week_start` defines the first day of the week, Monday is 0.
+    """
+    first_day = first // DAY_US
+    last_day = last // DAY_US
+    first_day -= (first_day + _EPOCH_WEEKDAY - week_start) % 7
+    last_day += 7 - (last_day + _EPOCH_WEEKDAY - week_start) % 7
+    return first_day * DAY_US, last_day * DAY_US - 1
+# endregion
+
+
+# region calendar buckets
+BUCKETS = ('day', 'week', 'month', 'quarter', 'year')
+"""The calendar units spans can be split into, see `DateSpan.iter_days()` or `DateSpanArray.buckets()`."""
+
+_BUCKET_MONTHS = {'month': 1, 'quarter': 3, 'year': 12}
+
+
+def month_start_us(index: int) -> int:
+    """Returns the beginning of the month with the given continuous month index as microseconds since 1970-01-01."""
+    position = index - _TABLE_FIRST_MONTH
+    if 0 <= position < len(MONTH_STARTS):
+        return MONTH_STARTS[position]
+    return to_epoch_us(month_start(index))
+
+
+def bucket_starts_us(start: int, end: int, granularity: str):
+    """
+    Yields the beginning of every day, week, month, quarter or year touched by the span from `start` to `end`,
+    followed by the beginning of the next bucket after `end`, all as wall-clock microseconds since 1970-01-01.
+    Weeks start on Monday.
+
+    Errors:
+        ValueError: If the granularity is not one of `BUCKETS`.
+    """
+    if granularity == 'day' or granularity == 'week':
+        if granularity == 'day':
+            edge, step = start - start % DAY_US, DAY_US
+        else:
+            edge, step = weeks_span_us(start, start)[0], 7 * DAY_US
+        while True:
+            yield edge
+            if edge > end:
+                return
+            edge += step
+    months = _BUCKET_MONTHS.get(granularity)
+    if months is None:
+        raise ValueError(f"Unsupported granularity '{granularity}', use one of {', '.join(BUCKETS)}.")
+    index = month_index_us(start)
+    if index is None:
+        index = month_index(from_epoch_us(start))
+    index -= index % months
+    while True:
+        edge = month_start_us(index)
+        yield edge
+        if edge > end:
+            return
+        index += months
+# endregion
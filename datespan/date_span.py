@@ -2,11 +2,15 @@
 
 from __future__ import annotations
 
-from datetime import datetime, time, timedelta
+from datetime import date, datetime, time, timedelta, tzinfo
+from typing import Iterator
 
 from dateutil.relativedelta import MO
 from dateutil.relativedelta import relativedelta
 
+from datespan import calendar_math as cm
+from datespan.timezones import TransitionTable, resolve_zone
+
 
 class DateSpan:
     """
@@ -15,6 +19,8 @@ class DateSpan:
 
     The DateSpan is immutable, all methods that change the DateSpan will return a new DateSpan.
     """
+    __slots__ = ('_dt_start', '_dt_end', '_us_start', '_us_end', '_tz', '_meta', '_grain')
+
     TIME_EPSILON_MICROSECONDS = 100_000  # 0.1 seconds
     """The time epsilon in microseconds used for detecting overlapping or consecutive date time spans."""
 
@@ -44,32 +50,117 @@ class DateSpan:
             parsing of the DateSpan would result in more than one DateSpan. For such cases use the DateSpanSet
             class to parse multipart date spans.
         """
-        self._arg_start = start
-        self._arg_end = end if end is not None else start
-        self._message: str = message
-
+        # the original arguments and the message are only kept for text arguments or explicit messages
+        if message is not None or isinstance(start, str) or isinstance(end, str):
+            self._meta: tuple = (start, end if end is not None else start, message)
+        else:
+            self._meta: tuple = _NO_META
+
+        # Start and end are kept as datetimes and/or as microseconds since epoch, the missing representation
+        # is created on first access and cached. Comparisons and merges operate on the microseconds.
+        self._us_start: int | None = None
+        self._us_end: int | None = None
+        # The granularity is known for calendar expressions like 'last month', otherwise determined on demand.
+        self._grain: str | None = None
         if isinstance(start, datetime) and isinstance(end, datetime):
-            self._start: datetime = start
-            self._end: datetime = end if end is not None else start
-            self._start, self._end = self._swap()
+            if start > end:
+                start, end = end, start
+            self._dt_start: datetime | None = start
+            self._dt_end: datetime | None = end
         elif start is None and end is None:
-            self._start: datetime = None
-            self._end: datetime = None
+            self._dt_start = None
+            self._dt_end = None
         else:
-            try:
-                self._start, self._end = self._parse(start, end)
-            except ValueError as e:
-                raise e
+            bounds = _value_bounds(start, end)
+            if bounds is None:
+                bounds = self._parse(start, end)
+            self._dt_start, self._dt_end = bounds
+            self._grain = cm.granularity_of(bounds)
+        self._tz = None if self._dt_start is None else self._dt_start.tzinfo
 
     @property
     def message(self) -> str:
         """Returns the message of the DateSpan."""
-        return self._message
+        return self._meta[2]
+
+    @property
+    def _arg_start(self):
+        """Returns the original start argument of the DateSpan."""
+        return self._start if self._meta is _NO_META else self._meta[0]
+
+    @property
+    def _arg_end(self):
+        """Returns the original end argument of the DateSpan."""
+        return self._end if self._meta is _NO_META else self._meta[1]
 
     @property
     def is_undefined(self) -> bool:
         """Returns True if the DateSpan is undefined."""
-        return self._start is None and self._end is None
+        return self._dt_start is None and self._us_start is None
+
+    @property
+    def _start(self) -> datetime:
+        dt = self._dt_start
+        if dt is None and self._us_start is not None:
+            dt = self._dt_start = cm.from_epoch_us(self._us_start, self._tz)
+        return dt
+
+    @_start.setter
+    def _start(self, value: datetime):
+        self._dt_start = value
+        self._us_start = None
+        self._tz = None if value is None else value.tzinfo
+        self._grain = None
+
+    @property
+    def _end(self) -> datetime:
+        dt = self._dt_end
+        if dt is None and self._us_end is not None:
+            dt = self._dt_end = cm.from_epoch_us(self._us_end, self._tz)
+        return dt
+
+    @_end.setter
+    def _end(self, value: datetime):
+        self._dt_end = value
+        self._us_end = None
+        self._grain = None
+
+    @property
+    def start_us(self) -> int:
+        """
+        Returns the start of the DateSpan as microseconds since 1970-01-01,
+        in UTC for timezone-aware DateSpans, in wall-clock time otherwise.
+        """
+        us = self._us_start
+        if us is None and self._dt_start is not None:
+            us = self._us_start = cm.to_epoch_us(self._dt_start)
+        return us
+
+    @property
+    def end_us(self) -> int:
+        """
+        Returns the end of the DateSpan as microseconds since 1970-01-01,
+        in UTC for timezone-aware DateSpans, in wall-clock time otherwise.
+        """
+        us = self._us_end
+        if us is None and self._dt_end is not None:
+            us = self._us_end = cm.to_epoch_us(self._dt_end)
+        return us
+
+    @property
+    def tz(self) -> tzinfo | None:
+        """Returns the time zone of a timezone-aware DateSpan, or None for naive DateSpans."""
+        return self._tz
+
+    @classmethod
+    def _join(cls, first: DateSpan, last: DateSpan) -> DateSpan:
+        """Returns a new DateSpan from the start of `first` to the end of `last`, reusing their representations."""
+        span = cls.__new__(cls)
+        span._dt_start, span._us_start, span._tz = first._dt_start, first._us_start, first._tz
+        span._dt_end, span._us_end = last._dt_end, last._us_end
+        span._meta = _NO_META
+        span._grain = cm.common_granularity(first._grain, last._grain)
+        return span
 
     @property
     def start(self) -> datetime:
@@ -104,7 +195,13 @@ class DateSpan:
 
     def clone(self) -> DateSpan:
         """Returns a new DateSpan with the same start and end date."""
-        return DateSpan(self._start, self._end)
+        return self._join(self, self)
+
+    def freeze(self) -> FrozenDateSpan:
+        """Returns an immutable FrozenDateSpan with the same start and end date, e.g. for use as a dictionary key."""
+        span = FrozenDateSpan._join(self, self)
+        span._meta = self._meta
+        return span
 
     def overlaps_with(self, other: DateSpan) -> bool:
         """
@@ -112,7 +209,8 @@ class DateSpan:
         """
         if self.is_undefined or other.is_undefined:
             return False
-        return max(self._start, other._start) <= min(self._end, other._end)
+        self._check_comparable(other)
+        return max(self.start_us, other.start_us) <= min(self.end_us, other.end_us)
 
     def consecutive_with(self, other: DateSpan) -> bool:
         """
@@ -120,22 +218,17 @@ class DateSpan:
         """
         if self.is_undefined or other.is_undefined:
             return False
-        if self._start > other._start:
-            delta = self._start - other._end
-            return timedelta(microseconds=0) <= delta <= timedelta(microseconds=self.TIME_EPSILON_MICROSECONDS)
-        delta = other._start - self._end
-        return timedelta(microseconds=0) <= delta <= timedelta(microseconds=self.TIME_EPSILON_MICROSECONDS)
+        self._check_comparable(other)
+        if self.start_us > other.start_us:
+            return 0 <= self.start_us - other.end_us <= self.TIME_EPSILON_MICROSECONDS
+        return 0 <= other.start_us - self.end_us <= self.TIME_EPSILON_MICROSECONDS
 
     def almost_equals(self, other: DateSpan, epsilon: int = TIME_EPSILON_MICROSECONDS) -> bool:
         """
         Returns True if the DateSpan is almost equal to the given DateSpan.
         """
-        start_diff = self._start - other._start
-        end_diff = self._end - other._end
-        min = timedelta(microseconds=-epsilon)
-        max = timedelta(microseconds=epsilon)
-
-        return min <= start_diff <= max and min <= end_diff <= max
+        self._check_comparable(other)
+        return abs(self.start_us - other.start_us) <= epsilon and abs(self.end_us - other.end_us) <= epsilon
 
     def merge(self, other: DateSpan) -> DateSpan:
         """
@@ -147,7 +240,8 @@ class DateSpan:
         if other.is_undefined:
             return self
         if self.overlaps_with(other) or self.consecutive_with(other):
-            return DateSpan(min(self._start, other._start), max(self._end, other._end))
+            return DateSpan._join(self if self.start_us <= other.start_us else other,
+                                  self if self.end_us >= other.end_us else other)
         raise ValueError("Cannot merge DateSpans that do not overlap or are not consecutive.")
 
     def can_merge(self, other: DateSpan) -> bool:
@@ -168,7 +262,8 @@ class DateSpan:
         if other.is_undefined:
             return self
         if self.overlaps_with(other):
-            return DateSpan(max(self._start, other._start), min(self._end, other._end))
+            return DateSpan._join(self if self.start_us >= other.start_us else other,
+                                  self if self.end_us <= other.end_us else other)
         return DateSpan.undefined()
 
     def subtract(self, other: DateSpan, allow_split: bool = False):
@@ -281,24 +376,24 @@ class DateSpan:
         """
         Returns a new DateSpan with the start and end date set to the beginning and end of the respective second(s).
         """
-        return DateSpan(self._start.replace(microsecond=0),
-                        self._end.replace(microsecond=999999))
+        return _with_granularity(DateSpan(self._start.replace(microsecond=0),
+                                          self._end.replace(microsecond=999999)), 'second')
 
     @property
     def full_minute(self) -> DateSpan:
         """
         Returns a new DateSpan with the start and end date set to the beginning and end of the respective minute(s).
         """
-        return DateSpan(self._start.replace(second=0, microsecond=0),
-                        self._end.replace(second=59, microsecond=999999))
+        return _with_granularity(DateSpan(self._start.replace(second=0, microsecond=0),
+                                          self._end.replace(second=59, microsecond=999999)), 'minute')
 
     @property
     def full_hour(self) -> DateSpan:
         """
         Returns a new DateSpan with the start and end date set to the beginning and end of the respective hour(s).
         """
-        return DateSpan(self._start.replace(minute=0, second=0, microsecond=0),
-                        self._end.replace(minute=59, second=59, microsecond=999999))
+        return _with_granularity(DateSpan(self._start.replace(minute=0, second=0, microsecond=0),
+                                          self._end.replace(minute=59, second=59, microsecond=999999)), 'hour')
 
     @property
     def full_day(self) -> DateSpan:
@@ -306,55 +401,48 @@ class DateSpan:
         Returns a new DateSpan with the start and end date set to the beginning and end of the respective day(s).
         """
         if self.is_undefined:
-            return DateSpan(datetime.now().replace(hour=0, minute=0, second=0, microsecond=0),
+            span = DateSpan(datetime.now().replace(hour=0, minute=0, second=0, microsecond=0),
                             datetime.now().replace(hour=23, minute=59, second=59, microsecond=999999))
-
-        return DateSpan(self._start.replace(hour=0, minute=0, second=0, microsecond=0),
-                        self._end.replace(hour=23, minute=59, second=59, microsecond=999999))
+        else:
+            span = DateSpan(self._start.replace(hour=0, minute=0, second=0, microsecond=0),
+                            self._end.replace(hour=23, minute=59, second=59, microsecond=999999))
+        return _with_granularity(span, 'day')
 
     @property
     def full_week(self) -> DateSpan:
         """
         Returns a new DateSpan with the start and end date set to the beginning and end of the respective week(s).
         """
-        start = self._start - relativedelta(days=self._start.weekday())
-        end = self._end + relativedelta(days=6 - self._end.weekday())
-        return DateSpan(start.replace(hour=0, minute=0, second=0, microsecond=0),
-                        end.replace(hour=23, minute=59, second=59, microsecond=999999))
+        if self._tz is None:
+            return _with_granularity(DateSpan.from_epoch_us(*cm.weeks_span_us(self.start_us, self.end_us)), 'week')
+        start = self._start - timedelta(days=self._start.weekday())
+        end = self._end + timedelta(days=6 - self._end.weekday())
+        return _with_granularity(DateSpan(start.replace(hour=0, minute=0, second=0, microsecond=0),
+                                          end.replace(hour=23, minute=59, second=59, microsecond=999999)), 'week')
 
     @property
     def full_month(self) -> DateSpan:
         """
         Returns a new DateSpan with the start and end date set to the beginning and end of the respective month(s).
         """
-        start = self._start.replace(day=1)
-        end = self._end.replace(day=1) + relativedelta(day=31)
-        return DateSpan(start.replace(hour=0, minute=0, second=0, microsecond=0),
-                        end.replace(hour=23, minute=59, second=59, microsecond=999999))
+        first, last = self._month_indexes()
+        return self._months_span(first, last)
 
     @property
     def full_quarter(self) -> DateSpan:
         """
         Returns a new DateSpan with the start and end date set to the beginning and end of the respective quarter(s).
         """
-        q_start = (self._start.month - 1) // 3 + 1
-        q_end = (self._end.month - 1) // 3 + 1
-        m_start = (q_start - 1) * 3 + 1
-        m_end = q_end * 3
-        start = self._start.replace(month=m_start, day=1)
-        end = self._end.replace(month=m_end, day=1) + relativedelta(months=1, days=-1)
-        return DateSpan(start.replace(hour=0, minute=0, second=0, microsecond=0),
-                        end.replace(hour=23, minute=59, second=59, microsecond=999999))
+        first, last = self._month_indexes()
+        return self._months_span(first - first % 3, last - last % 3 + 2, 'quarter')
 
     @property
     def full_year(self) -> DateSpan:
         """
         Returns a new DateSpan with the start and end date set to the beginning and end of the respective year(s).
         """
-        start = self._start.replace(month=1, day=1)
-        end = self._end.replace(month=1, day=1) + relativedelta(years=1, days=-1)
-        return DateSpan(start.replace(hour=0, minute=0, second=0, microsecond=0),
-                        end.replace(hour=23, minute=59, second=59, microsecond=999999))
+        first, last = self._month_indexes()
+        return self._months_span(first - first % 12, last - last % 12 + 11, 'year')
 
     @property
     def ltm(self) -> DateSpan:
@@ -409,6 +497,78 @@ class DateSpan:
         return DateSpan(start=self.with_start(self.full_week.start).start,
                         end=self.end.replace(hour=23, minute=59, second=59, microsecond=999999))
 
+    # region calendar buckets
+    def iter_days(self) -> Iterator[DateSpan]:
+        """
+        Yields a DateSpan for every day of the DateSpan, the first and last day clipped to the DateSpan.
+        The buckets are created lazily from integer microseconds, without running the DateSpan constructor.
+
+        Examples:
+            >>> span = DateSpan(datetime(2024, 1, 1, 12), datetime(2024, 1, 2, 6))
+            >>> [(day.start.hour, day.end.hour) for day in span.iter_days()]
+            [(12, 23), (0, 6)]
+        """
+        return self._iter_buckets('day')
+
+    def iter_weeks(self) -> Iterator[DateSpan]:
+        """Yields a DateSpan for every week, Monday to Sunday, of the DateSpan, clipped to the DateSpan."""
+        return self._iter_buckets('week')
+
+    def iter_months(self) -> Iterator[DateSpan]:
+        """Yields a DateSpan for every month of the DateSpan, clipped to the DateSpan."""
+        return self._iter_buckets('month')
+
+    def iter_quarters(self) -> Iterator[DateSpan]:
+        """Yields a DateSpan for every quarter of the DateSpan, clipped to the DateSpan."""
+        return self._iter_buckets('quarter')
+
+    def iter_years(self) -> Iterator[DateSpan]:
+        """Yields a DateSpan for every year of the DateSpan, clipped to the DateSpan."""
+        return self._iter_buckets('year')
+
+    def buckets(self, granularity: str):
+        """
+        Returns the days, weeks, months, quarters or years of the DateSpan, clipped to the DateSpan, as a
+        DateSpanArray. The bucket edges are computed at once on numpy arrays, use this instead of the
+        `iter_*()` methods for large numbers of buckets. Requires numpy.
+
+        Arguments:
+            granularity: Either 'day', 'week' (Monday to Sunday), 'month', 'quarter' or 'year'.
+
+        Errors:
+            ValueError: If the granularity is not supported.
+
+        Examples:
+            >>> DateSpan(datetime(2024, 1, 15), datetime(2024, 3, 10)).buckets('month').start
+            array(['2024-01-15T00:00:00.000000', '2024-02-01T00:00:00.000000',
+                   '2024-03-01T00:00:00.000000'], dtype='datetime64[us]')
+        """
+        from datespan.date_span_array import DateSpanArray
+        return DateSpanArray.from_spans([self]).buckets(granularity)
+
+    def _iter_buckets(self, granularity: str) -> Iterator[DateSpan]:
+        """Yields the clipped buckets of the given granularity, full buckets are tagged with the granularity."""
+        if self.is_undefined:
+            return
+        start, end, tz = self.start_us, self.end_us, self._tz
+        if tz is None:
+            edges = cm.bucket_starts_us(start, end, granularity)
+        else:
+            table = TransitionTable.get(tz)
+            edges = map(table.to_utc, cm.bucket_starts_us(cm.to_epoch_us(self._start.replace(tzinfo=None)),
+                                                          cm.to_epoch_us(self._end.replace(tzinfo=None)),
+                                                          granularity))
+        bucket_start = next(edges)
+        for next_start in edges:
+            first = bucket_start if bucket_start > start else start
+            last = next_start - 1 if next_start <= end else end
+            span = DateSpan.from_epoch_us(first, last, tz)
+            if first == bucket_start and last == next_start - 1:
+                span._grain = granularity
+            yield span
+            bucket_start = next_start
+    # endregion
+
     def _begin_of_day(self, dt: datetime) -> datetime:
         """Returns the beginning of the day for the given datetime."""
         return dt.replace(hour=0, minute=0, second=0, microsecond=0)
@@ -423,11 +583,42 @@ class DateSpan:
 
     def _end_of_month(self, dt: datetime) -> datetime:
         """Returns the end of the month for the given datetime."""
-        return dt.replace(day=1, hour=23, minute=59, second=59, microsecond=999999) + relativedelta(months=1, days=-1)
+        return dt.replace(day=cm.days_in_month(dt.year, dt.month), hour=23, minute=59, second=59, microsecond=999999)
 
     def _last_day_of_month(self, dt: datetime) -> datetime:
         """Returns the last day of the month for the given datetime."""
-        return dt + relativedelta(day=31)
+        return dt.replace(day=cm.days_in_month(dt.year, dt.month))
+
+    def _month_indexes(self) -> tuple[int, int]:
+        """Returns the continuous month indexes of the start and end of the DateSpan."""
+        if self._tz is None and self._dt_start is None:
+            first, last = cm.month_index_us(self._us_start), cm.month_index_us(self._us_end)
+            if first is not None and last is not None:
+                return first, last
+        return cm.month_index(self._start), cm.month_index(self._end)
+
+    def _months_span(self, first: int, last: int, granularity: str = 'month') -> DateSpan:
+        """
+        Returns a new DateSpan from the beginning of month index `first` to the end of month index `last`,
+        made of months, quarters or years as defined by `granularity`.
+        Naive DateSpans within MIN_DATE and MAX_DATE are resolved from the month boundary table.
+        """
+        bounds = cm.months_span_us(first, last) if self._tz is None else None
+        if bounds is not None:
+            span = DateSpan.from_epoch_us(*bounds)
+        else:
+            start, end = cm.months_span(first, last)
+            span = DateSpan(start.replace(tzinfo=self._start.tzinfo), end.replace(tzinfo=self._end.tzinfo))
+        return _with_granularity(span, granularity)
+
+    def _is_months_span(self, first: int, last: int) -> bool:
+        """Returns True if the DateSpan ranges from the beginning of month index `first` to the end of `last`."""
+        if self._tz is None:
+            bounds = cm.months_span_us(first, last)
+            if bounds is not None:
+                return bounds == (self.start_us, self.end_us)
+        start, end = cm.months_span(first, last)
+        return start == self._start.replace(tzinfo=None) and end == self._end.replace(tzinfo=None)
 
     def _first_day_of_month(self, dt: datetime) -> datetime:
         return dt.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
@@ -451,47 +642,112 @@ class DateSpan:
         """
         Returns True if the DateSpan represents one or more full months.
         """
-        return (self._start == self._begin_of_month(self._start) and
-                self._end == self._end_of_month(self._end))
+        if self._grain in _MONTH_ALIGNED:
+            return True
+        if self.is_undefined:
+            return False
+        first, last = self._month_indexes()
+        return self._is_months_span(first, last)
 
     @property
     def is_full_quarter(self) -> bool:
         """
         Returns True if the DateSpan represents one or more full quarters.
         """
-        return (self._start == self._begin_of_month(self._start) and self._start.month % 3 == 1 and
-                self._end == self._end_of_month(self._end) and self._end.month % 3 == 0)
+        if self._grain in _QUARTER_ALIGNED:
+            return True
+        if self.is_undefined:
+            return False
+        first, last = self._month_indexes()
+        return first % 3 == 0 and last % 3 == 2 and self._is_months_span(first, last)
 
     @property
     def is_full_year(self) -> bool:
         """
         Returns True if the DateSpan represents one or more full year.
         """
-        return (self._start == self._start.replace(month=1, day=1, hour=0, minute=0, second=0, microsecond=0) and
-                self._end == self._end.replace(month=12, day=31, hour=23, minute=59, second=59, microsecond=999999))
+        if self._grain == 'year':
+            return True
+        if self.is_undefined:
+            return False
+        first, last = self._month_indexes()
+        return first % 12 == 0 and last % 12 == 11 and self._is_months_span(first, last)
 
     @property
     def is_full_week(self) -> bool:
         """
         Returns True if the DateSpan represents one or more full weeks.
         """
-        return (self._start == self._begin_of_day(self._start - timedelta(days=self._start.weekday())) and
-                self._end == self._end_of_day(self._end + timedelta(days=6 - self._end.weekday())))
+        if self._grain == 'week':
+            return True
+        if self.is_undefined:
+            return False
+        return self._is_weeks_span()
 
     @property
     def is_full_day(self) -> bool:
         """
         Returns True if the DateSpan represents one or more full days.
         """
+        if self._grain in _DAY_ALIGNED:
+            return True
         return (self._start == self._begin_of_day(self._start) and
                 self._end == self._end_of_day(self._end))
 
+    @property
+    def granularity(self) -> str | None:
+        """
+        Returns the calendar unit the DateSpan is made of: 'year', 'quarter', 'month', 'week', 'day', 'hour',
+        'minute', 'second' or 'microsecond', or None for undefined DateSpans. DateSpans created from calendar
+        expressions or by the `full_*` properties keep the granularity they were created with, e.g. 'day' for
+        '2024-01-01 to 2024-01-31'. For all other DateSpans, the coarsest unit their start and end are aligned
+        to is determined on first access.
+
+        Examples:
+            >>> DateSpan("last month").granularity
+            'month'
+            >>> DateSpan(datetime(2024, 1, 1, 10), datetime(2024, 1, 1, 11, 59, 59, 999999)).granularity
+            'hour'
+        """
+        if self._grain is None and not self.is_undefined:
+            self._grain = self._find_granularity()
+        return self._grain
+
+    def _find_granularity(self) -> str:
+        """Returns the coarsest calendar unit the start and end of the DateSpan are aligned to."""
+        first, last = self._month_indexes()
+        if self._is_months_span(first, last):
+            if first % 12 == 0 and last % 12 == 11:
+                return 'year'
+            return 'quarter' if first % 3 == 0 and last % 3 == 2 else 'month'
+        if self._is_weeks_span():
+            return 'week'
+        start, end = self._start, self._end
+        if start.microsecond or end.microsecond != 999999:
+            return 'microsecond'
+        if start.second or end.second != 59:
+            return 'second'
+        if start.minute or end.minute != 59:
+            return 'minute'
+        if start.hour or end.hour != 23:
+            return 'hour'
+        return 'day'
+
+    def _is_weeks_span(self) -> bool:
+        """Returns True if the DateSpan ranges from the beginning of a week to the end of a week."""
+        if self._tz is None:
+            return cm.weeks_span_us(self.start_us, self.end_us) == (self.start_us, self.end_us)
+        return (self._start == self._begin_of_day(self._start - timedelta(days=self._start.weekday())) and
+                self._end == self._end_of_day(self._end + timedelta(days=6 - self._end.weekday())))
+
     def replace(self, year: int = None, month: int = None, day: int = None,
                 hour: int = None,
                 minute: int = None, second: int = None, microsecond: int = None) -> DateSpan:
         """
         Returns a new DateSpan with the start and end date replaced by the given datetime parts.
         """
+        keeps_time = hour is None and minute is None and second is None and microsecond is None
+        keeps_day = day is None
         if year is None:
             year = self._start.year
         if month is None:
@@ -528,6 +784,10 @@ class DateSpan:
         if self.ends_on_month_end:
             # months and years need to be shifted to proper month end
             end = self._end_of_month(end)
+            if keeps_time and self._grain in _DAY_ALIGNED:
+                # spans of days and months keep their granularity, ending on the proper month end
+                granularity = 'month' if keeps_day and self._grain in _MONTH_ALIGNED else 'day'
+                return _with_granularity(DateSpan(start, end), granularity)
 
         return DateSpan(start, end)._swap()
 
@@ -538,20 +798,37 @@ class DateSpan:
         """
         if self.is_undefined:
             raise ValueError("Cannot shift undefined DateSpan.")
-        start = self._start + relativedelta(years=years, months=months, days=days, hours=hours, minutes=minutes,
-                                            seconds=seconds, microseconds=microseconds)
-
-        end = self._end + relativedelta(years=years, months=months, days=days, hours=hours, minutes=minutes,
-                                        seconds=seconds, microseconds=microseconds)
-        if weeks:
-            start += timedelta(weeks=weeks)
-            end += timedelta(weeks=weeks)
-        elif days or hours or minutes or seconds or microseconds:
-            pass
-        elif self.ends_on_month_end:
-            # months and years need to be shifted to proper month end
-            end = self._end_of_month(end)
-        return DateSpan(start, end)
+        months += years * 12
+        if not (days or hours or minutes or seconds or microseconds or weeks):
+            # months and years only, DateSpans ending on a month end are shifted to the proper month end
+            start, end = cm.add_months(self._start, months), self._shift_end_months(months)
+            if start > end:  # clipping to the end of a shorter month can reverse spans shorter than a day
+                start, end = end, start
+            span = DateSpan.from_bounds(start, end)
+            if self._grain is not None:
+                span._grain = self._shifted_granularity(months, None)
+            return span
+        delta = timedelta(weeks=weeks, days=days, hours=hours, minutes=minutes, seconds=seconds,
+                          microseconds=microseconds)
+        if not months:
+            span = DateSpan.from_bounds(self._start + delta, self._end + delta)
+        else:
+            # relativedelta applies the months before the remaining time delta
+            months_delta = relativedelta(months=months)
+            span = DateSpan(self._start + months_delta + delta, self._end + months_delta + delta)
+        if self._grain is not None:
+            span._grain = self._shifted_granularity(months, delta)
+        return span
+
+    def _shifted_granularity(self, months: int, delta: timedelta | None) -> str | None:
+        """Returns the granularity of the DateSpan after a shift by the given months and time delta."""
+        granularity = self._grain
+        if months:
+            # shifted spans of days keep their time of day, spans of months end on the proper month end
+            granularity = cm.common_granularity(granularity, cm.months_granularity(months))
+        if delta:
+            granularity = cm.common_granularity(granularity, cm.delta_granularity(delta // cm.MICROSECOND))
+        return granularity
 
     def shift_start(self, years: int = 0, months: int = 0, days: int = 0, hours: int = 0, minutes: int = 0,
                     seconds: int = 0,
@@ -561,17 +838,17 @@ class DateSpan:
         """
         if self.is_undefined:
             raise ValueError("Cannot shift undefined DateSpan.")
-        start = self._start + relativedelta(years=years, months=months, days=days, hours=hours, minutes=minutes,
-                                            seconds=seconds, microseconds=microseconds)
-        if weeks:
-            start += timedelta(weeks=weeks)
+        months += years * 12
+        if not (days or hours or minutes or seconds or microseconds or weeks):
+            start = cm.add_months(self._start, months)
+        else:
+            start = self._start + timedelta(weeks=weeks, days=days, hours=hours, minutes=minutes, seconds=seconds,
+                                            microseconds=microseconds)
+            if months:
+                start = cm.add_months(self._start, months) + (start - self._start)
         if abs(start - self._end) <= timedelta(microseconds=self.TIME_EPSILON_MICROSECONDS):
-            return DateSpan(start, start)
-
-        result = DateSpan(start, self._end)._swap()
-        if result.end - result.start < timedelta(microseconds=self.TIME_EPSILON_MICROSECONDS):
-            return DateSpan(result.start, result.start)
-        return result
+            return DateSpan.from_bounds(start, start)
+        return self._bounded(start, self._end)
 
     def shift_end(self, years: int = 0, months: int = 0, days: int = 0, hours: int = 0, minutes: int = 0,
                   seconds: int = 0,
@@ -581,19 +858,36 @@ class DateSpan:
         """
         if self.is_undefined:
             raise ValueError("Cannot shift undefined DateSpan.")
-        end = self._end + relativedelta(years=years, months=months, days=days, hours=hours, minutes=minutes,
-                                        seconds=seconds, microseconds=microseconds)
-        if weeks:
-            end += timedelta(weeks=weeks)
-        elif days or hours or minutes or seconds or microseconds:
-            pass
-        elif self.ends_on_month_end:
-            # months and years need to be shifted to proper month end
-            end = self._end_of_month(end)
-        result = DateSpan(self._start, end)._swap()
-        if result.end - result.start < timedelta(microseconds=self.TIME_EPSILON_MICROSECONDS):
-            return DateSpan(result.start, result.start)
-        return result
+        months += years * 12
+        if not (days or hours or minutes or seconds or microseconds or weeks):
+            end = self._shift_end_months(months)
+        else:
+            end = self._end + timedelta(weeks=weeks, days=days, hours=hours, minutes=minutes, seconds=seconds,
+                                        microseconds=microseconds)
+            if months:
+                end = cm.add_months(self._end, months) + (end - self._end)
+        return self._bounded(self._start, end)
+
+    def _shift_end_months(self, months: int) -> datetime:
+        """
+        Returns the end date shifted by the given +/- number of months. If the DateSpan ends on the last day of
+        a month, the end of the last day of the target month is returned.
+        """
+        end = self._end
+        if end.day == cm.days_in_month(end.year, end.month):
+            return cm.month_end(cm.month_index(end) + months).replace(tzinfo=end.tzinfo)
+        return cm.add_months(end, months)
+
+    def _bounded(self, start: datetime, end: datetime) -> DateSpan:
+        """
+        Returns a new DateSpan from the given, possibly swapped start and end date. Start and end dates closer
+        than the time epsilon collapse to the start date.
+        """
+        if start > end:
+            start, end = end, start
+        if end - start < timedelta(microseconds=self.TIME_EPSILON_MICROSECONDS):
+            return DateSpan.from_bounds(start, start)
+        return DateSpan.from_bounds(start, end)
 
     def set_start(self, year: int = None, month: int = None, day: int = None,
                   hour: int = None, minute: int = None, second: int = None,
@@ -700,6 +994,47 @@ class DateSpan:
         """
         return [(self._start, self._end), ]
 
+    def astimezone(self, tz: tzinfo | str) -> DateSpan:
+        """
+        Returns the same span of time as a DateSpan in the given time zone. Timezone-aware DateSpans are
+        stored as UTC microseconds, so the conversion is free, datetimes are created on first access.
+
+        Arguments:
+            tz: A tzinfo or time zone name like 'Europe/Berlin'.
+
+        Errors:
+            ValueError: If the DateSpan is naive, use `localize()` instead.
+        """
+        tz = resolve_zone(tz)
+        if tz is None:
+            raise ValueError("A time zone is required.")
+        if self.is_undefined:
+            return self.clone()
+        if self._tz is None:
+            raise ValueError("Naive DateSpans can not be converted, use 'localize()' to assign a time zone.")
+        return DateSpan.from_epoch_us(self.start_us, self.end_us, tz)
+
+    def localize(self, tz: tzinfo | str) -> DateSpan:
+        """
+        Returns a timezone-aware DateSpan for a naive DateSpan, interpreting start and end as wall-clock
+        time of the given time zone. Ambiguous and non-existent wall-clock times resolve like `fold=0`.
+        Timezone-aware DateSpans are converted to the time zone, same as `astimezone()`.
+
+        Arguments:
+            tz: A tzinfo or time zone name like 'Europe/Berlin'.
+        """
+        tz = resolve_zone(tz)
+        if tz is None:
+            raise ValueError("A time zone is required.")
+        if self.is_undefined:
+            return self.clone()
+        if self._tz is not None:
+            return DateSpan.from_epoch_us(self.start_us, self.end_us, tz)
+        table = TransitionTable.get(tz)
+        span = DateSpan.from_epoch_us(table.to_utc(self.start_us), table.to_utc(self.end_us), tz)
+        span._grain = self._grain  # the wall-clock time is kept
+        return span
+
     # region Static Days, Month and other calculations
     @classmethod
     def max(cls) -> DateSpan:
@@ -734,6 +1069,76 @@ class DateSpan:
         """Returns an undefined DateSpan. Same as `span = DateSpan()`."""
         return DateSpan(None, None)
 
+    @classmethod
+    def from_bounds(cls, start: datetime, end: datetime, validated: bool = True) -> DateSpan:
+        """
+        Creates a new DateSpan from trusted start and end datetimes, skipping all type checks.
+
+        Arguments:
+            start: The start datetime of the DateSpan.
+            end: The end datetime of the DateSpan.
+            validated: (optional) If True (default), `start` and `end` must be datetimes of the same
+                kind (naive or timezone-aware) with `start <= end`. If False, the arguments are
+                passed to the regular DateSpan constructor.
+
+        Returns:
+            A new DateSpan.
+        """
+        if not validated:
+            return cls(start, end)
+        span = cls.__new__(cls)
+        span._dt_start, span._dt_end = start, end
+        span._us_start = span._us_end = None
+        span._tz = start.tzinfo
+        span._meta = _NO_META
+        span._grain = None
+        return span
+
+    @classmethod
+    def from_epoch_us(cls, start: int, end: int, tz: tzinfo = None) -> DateSpan:
+        """
+        Creates a new DateSpan from microseconds since 1970-01-01, without creating datetimes.
+        The datetimes are created on first access.
+
+        Arguments:
+            start: The start as microseconds since 1970-01-01.
+            end: The (inclusive) end as microseconds since 1970-01-01, must not be smaller than `start`.
+            tz: (optional) If defined, the microseconds are interpreted as UTC and the DateSpan
+                is timezone-aware, otherwise the DateSpan is naive.
+
+        Returns:
+            A new DateSpan.
+
+        Examples:
+            >>> DateSpan.from_epoch_us(0, 86_399_999_999)
+            DateSpan(1970-01-01 00:00:00, 1970-01-01 23:59:59.999999)
+        """
+        span = cls.__new__(cls)
+        span._dt_start = span._dt_end = None
+        span._us_start, span._us_end = start, end
+        span._tz = tz
+        span._meta = _NO_META
+        span._grain = None
+        return span
+
+    @classmethod
+    def from_ordinal_days(cls, first: int, last: int) -> DateSpan:
+        """
+        Creates a new DateSpan from the beginning of the day with ordinal `first` to the end of the day
+        with ordinal `last`, as returned by `date.toordinal()`.
+
+        Examples:
+            >>> DateSpan.from_ordinal_days(date(2024, 1, 1).toordinal(), date(2024, 1, 31).toordinal())
+            DateSpan(2024-01-01 00:00:00, 2024-01-31 23:59:59.999999)
+        """
+        span = cls.__new__(cls)
+        span._dt_start = span._dt_end = span._tz = None
+        span._us_start = (first - cm.EPOCH_ORDINAL) * cm.DAY_US
+        span._us_end = (last + 1 - cm.EPOCH_ORDINAL) * cm.DAY_US - 1
+        span._meta = _NO_META
+        span._grain = 'day'
+        return span
+
     @classmethod
     def _monday(cls, base: datetime = None, offset_weeks: int = 0, offset_years: int = 0, offset_months: int = 0,
                 offset_days: int = 0) -> DateSpan:
@@ -947,7 +1352,8 @@ class DateSpan:
         if isinstance(item, datetime):
             return self._start <= item <= self._end
         if isinstance(item, DateSpan):
-            return self._start <= item.start <= item.end <= self._end
+            self._check_comparable(item)
+            return self.start_us <= item.start_us <= item.end_us <= self.end_us
         if isinstance(item, float):
             item = datetime.fromtimestamp(item)
             return self.start <= item <= self.end
@@ -971,15 +1377,12 @@ class DateSpan:
         if other is None:
             return self._start is None and self._end is None
         if isinstance(other, DateSpan):
-            if self.is_undefined and other.is_undefined:
-                return True
+            if (self._tz is None) == (other._tz is None):
+                # undefined DateSpans are naive with None bounds, so they are only equal to undefined DateSpans
+                return self.start_us == other.start_us and self.end_us == other.end_us
+            # naive and timezone-aware DateSpans are compared by wall-clock time, for compatibility
             if self.is_undefined or other.is_undefined:
                 return False
-
-            if self.start.tzinfo is not None and other.start.tzinfo is not None:
-                return self.start == other.start and self.end == other.end
-            if self.start.tzinfo is None and other.start.tzinfo is None:
-                return self.start == other.start and self.end == other.end
             return self.start.replace(tzinfo=None) == other.start.replace(tzinfo=None) and self.end.replace(
                 tzinfo=None) == other.end.replace(tzinfo=None)
         if isinstance(other, datetime):
@@ -993,6 +1396,8 @@ class DateSpan:
 
     def __gt__(self, other):
         if isinstance(other, DateSpan):
+            if (self._tz is None) == (other._tz is None):
+                return self.start_us > other.start_us and self.end_us > other.end_us
             return self.start > other.start and self.end > other.end
         if isinstance(other, datetime):
             return self.start > other and self.end > other
@@ -1005,6 +1410,8 @@ class DateSpan:
 
     def __ge__(self, other):
         if isinstance(other, DateSpan):
+            if (self._tz is None) == (other._tz is None):
+                return self.start_us >= other.start_us and self.end_us >= other.end_us
             return self.start >= other.start and self.end >= other.end
         if isinstance(other, datetime):
             return self.start >= other and self.end >= other
@@ -1017,6 +1424,8 @@ class DateSpan:
 
     def __lt__(self, other):
         if isinstance(other, DateSpan):
+            if (self._tz is None) == (other._tz is None):
+                return self.start_us < other.start_us and self.end_us < other.end_us
             return self.start < other.start and self.end < other.end
         if isinstance(other, datetime):
             return self.start < other and self.end < other
@@ -1029,6 +1438,8 @@ class DateSpan:
 
     def __le__(self, other):
         if isinstance(other, DateSpan):
+            if (self._tz is None) == (other._tz is None):
+                return self.start_us <= other.start_us and self.end_us <= other.end_us
             return self.start <= other.start and self.end <= other.end
         if isinstance(other, datetime):
             return self.start <= other and self.end <= other
@@ -1039,12 +1450,39 @@ class DateSpan:
             return self.start <= other and self.end <= other
         return False
 
+    def sort_key(self) -> tuple[int, int]:
+        """
+        Returns the start and end of the DateSpan as a tuple of integer microseconds for sorting, e.g.
+        `spans.sort(key=DateSpan.sort_key)`. Timezone-aware DateSpans are sorted by UTC, naive DateSpans by
+        wall-clock time. Undefined DateSpans are sorted first.
+        """
+        if self.is_undefined:
+            return _UNDEFINED_SORT_KEY
+        return self.start_us, self.end_us
+
     def __hash__(self):
         return hash((self._start, self._end))
 
+    def __copy__(self) -> DateSpan:
+        return self.clone()
+
+    def __reduce__(self):
+        # pickled as microseconds, the original arguments are only kept for DateSpans created from text
+        if self._meta is _NO_META:
+            return _unpickle, (self.__class__, self.start_us, self.end_us, self._tz, self._grain)
+        return _unpickle, (self.__class__, self.start_us, self.end_us, self._tz, self._grain, self._meta)
+
     # endregion
 
     # region private methods
+    def _check_comparable(self, other: DateSpan):
+        """
+        Raises a TypeError if one DateSpan is naive and the other timezone-aware. Their microseconds are
+        wall-clock time and UTC, like datetimes they can not be compared.
+        """
+        if (self._tz is None) != (other._tz is None):
+            raise TypeError("Can't compare naive and timezone-aware DateSpans.")
+
     def _swap(self) -> DateSpan:
         """Swap start and end date if start is greater than end."""
         if self._start is None or self._end is None:
@@ -1065,7 +1503,6 @@ class DateSpan:
             expected_spans = 2
             text = f"{start}; {end}"  # merge start and end into a single date span statement
 
-        self._message = None
         try:
             from datespan.parser.datespanparser import DateSpanParser  # overcome circular import
             date_span_parser: DateSpanParser = DateSpanParser(text)
@@ -1075,13 +1512,170 @@ class DateSpan:
                                  f"more than just a single date span. "
                                  f"Use 'DateSpanSet('{text}')' to parse multi-part date spans.")
             if expected_spans == 2:
-                start = expressions[0][0][0]
-                end = expressions[1][0][1]
-            else:
-                start = expressions[0][0][0]
-                end = expressions[0][0][1]
-
-            return start, end
+                first, last = expressions[0][0], expressions[1][0]
+                return cm.calendar_span(first[0], last[1],
+                                        cm.common_granularity(cm.granularity_of(first), cm.granularity_of(last)))
+            return expressions[0][0]
         except Exception as e:
-            self._message = str(e)
             raise ValueError(str(e))
+
+
+class FrozenDateSpan(DateSpan):
+    """
+    A DateSpan that rejects changes of its start and end date and caches its hash, for use as a key of
+    large dictionaries and sets. Methods that derive new spans, e.g. `shift()` or `merge()`, return regular
+    DateSpans. FrozenDateSpans are equal to and hash the same as DateSpans with the same start and end date.
+
+    Examples:
+        >>> totals = {DateSpan("2024-01").freeze(): 42.0}
+        >>> totals[FrozenDateSpan("2024-01")]
+        42.0
+    """
+    __slots__ = ('_hash', '__weakref__')
+
+    @DateSpan.start.setter
+    def start(self, value: datetime):
+        raise AttributeError("FrozenDateSpan is immutable, use `with_start()` to create a new DateSpan.")
+
+    @DateSpan.end.setter
+    def end(self, value: datetime):
+        raise AttributeError("FrozenDateSpan is immutable, use `with_end()` to create a new DateSpan.")
+
+    def freeze(self) -> FrozenDateSpan:
+        """Returns the FrozenDateSpan itself."""
+        return self
+
+    def __copy__(self) -> FrozenDateSpan:
+        return self
+
+    def __deepcopy__(self, memo) -> FrozenDateSpan:
+        return self
+
+    def __hash__(self):
+        try:
+            return self._hash
+        except AttributeError:
+            self._hash = hash((self._start, self._end))
+            return self._hash
+
+
+_NO_META = (None, None, None)
+"""Shared metadata of all DateSpans not created from text, the original arguments are the start and end."""
+
+_DAY_ALIGNED = cm.ALIGNED['day']
+_MONTH_ALIGNED = cm.ALIGNED['month']
+_QUARTER_ALIGNED = cm.ALIGNED['quarter']
+
+
+def _unpickle(cls, start_us: int | None, end_us: int | None, tz: tzinfo | None, granularity: str | None,
+              meta: tuple = _NO_META) -> DateSpan:
+    """Restores a pickled DateSpan, its datetimes are created on first access."""
+    span = cls.from_epoch_us(start_us, end_us, tz)
+    span._grain = granularity
+    span._meta = meta
+    return span
+
+
+def _with_granularity(span: DateSpan, granularity: str) -> DateSpan:
+    """Records the known granularity of a newly created DateSpan and returns it."""
+    span._grain = granularity
+    return span
+
+
+_UNDEFINED_SORT_KEY = (-2 ** 63, -2 ** 63)
+"""Sort key of undefined DateSpans, smaller than the sort key of any defined DateSpan."""
+
+
+# region direct conversion of date and time values
+def _value_bounds(start, end=None) -> tuple[datetime, datetime] | None:
+    """
+    Returns the `(start, end)` bounds for date and time values without using the text parser, or None if
+    a value needs to be parsed. If both values are defined, the bounds range from the start of the first
+    to the end of the second value, same as for text arguments.
+    """
+    first = _value_span(start)
+    if first is None or end is None:
+        return first
+    last = _value_span(end)
+    if last is None:
+        return None
+    return cm.calendar_span(min(first[0], last[0]), max(first[1], last[1]),
+                            cm.common_granularity(cm.granularity_of(first), cm.granularity_of(last)))
+
+
+def _value_span(value) -> tuple[datetime, datetime] | None:
+    """
+    Returns the span defined by a single datetime, date, time, pandas Timestamp, numpy datetime64 or
+    epoch number, with the same granularity rules as for date literals: A datetime at midnight
+    defines the entire day, a datetime without microseconds an entire second, all others a point in time.
+    Returns None for values that need to be parsed, like strings.
+    """
+    if isinstance(value, datetime):
+        if type(value) is not datetime:  # e.g. pandas.Timestamp
+            nanosecond = getattr(value, 'nanosecond', 0)
+            value = datetime(value.year, value.month, value.day, value.hour, value.minute, value.second,
+                             value.microsecond, value.tzinfo)
+            if nanosecond:
+                return value, value
+        return _datetime_span(value)
+    if isinstance(value, date):
+        start = datetime(value.year, value.month, value.day)
+        return cm.calendar_span(start, start.replace(hour=23, minute=59, second=59, microsecond=999999), 'day')
+    if isinstance(value, time):
+        return _datetime_span(datetime.combine(date.today(), value))
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        if DateSpan.MIN_DATE.year <= value <= DateSpan.MAX_DATE.year:
+            return cm.years_span(value, value)  # e.g. 2024
+        return _datetime_span(_from_timestamp(value))  # epoch seconds
+    if isinstance(value, float):
+        value = _from_timestamp(value)
+        return value, value
+    if type(value).__name__ == 'datetime64':
+        return _datetime64_span(value)
+    return None
+
+
+def _datetime_span(value: datetime) -> tuple[datetime, datetime]:
+    if value.microsecond:
+        return value, value
+    if value.hour == 0 and value.minute == 0 and value.second == 0:
+        return cm.calendar_span(value, value.replace(hour=23, minute=59, second=59, microsecond=999999), 'day')
+    return cm.calendar_span(value, value.replace(microsecond=999999), 'second')
+
+
+def _from_timestamp(value) -> datetime:
+    try:
+        return datetime.fromtimestamp(value)
+    except (OverflowError, OSError) as e:
+        raise ValueError(f"Invalid epoch timestamp {value}. {e}")
+
+
+def _datetime64_span(value) -> tuple[datetime, datetime]:
+    import numpy as np  # only available if a datetime64 value was passed in
+
+    if np.isnat(value):
+        raise ValueError("Failed to create a DateSpan from NaT (not a time).")
+    unit, _ = np.datetime_data(value.dtype)
+    if unit == 'Y':
+        year = int(value.astype(int)) + 1970
+        return cm.years_span(year, year)
+    if unit == 'M':
+        month = int(value.astype(int)) + 1970 * 12
+        return cm.months_span(month, month)
+    start = (value if unit == 'us' else value.astype('datetime64[us]')).item()
+    if unit == 'W':
+        return cm.days_span(start, start + timedelta(days=6))
+    if unit == 'D':
+        return cm.days_span(start, start)
+    if unit == 'h':
+        return cm.calendar_span(start, start + (cm.HOUR - cm.MICROSECOND), 'hour')
+    if unit == 'm':
+        return cm.calendar_span(start, start + (cm.MINUTE - cm.MICROSECOND), 'minute')
+    if unit == 's':
+        return cm.calendar_span(start, start + (cm.SECOND - cm.MICROSECOND), 'second')
+    if unit == 'ns' and value.astype(np.int64) % 1000:
+        return start, start  # nanoseconds define a point in time
+    return _datetime_span(start)
+# endregion
@@ -0,0 +1,578 @@
+# datespan - Copyright (c)2024, Thomas Zeutschler, MIT license
+
+"""
+Columnar arrays of date spans, backed by numpy.
+
+A `DateSpanArray` stores the starts and (inclusive) ends of many spans as two int64 arrays of microseconds since
+1970-01-01, exposed as `datetime64[us]` arrays. All operations work on the whole arrays at once, no DateSpan
+objects are created unless single spans are accessed. Undefined spans are stored as NaT. Timezone-aware arrays
+store UTC microseconds, calendar operations are done in wall-clock time of the time zone.
+
+Requires numpy, `datespan.pandas_extension` makes DateSpanArrays usable in pandas Series and DataFrames.
+"""
+
+from __future__ import annotations
+
+from array import array
+from datetime import datetime, tzinfo
+from typing import Any, Iterable
+
+import numpy as np
+
+from datespan import calendar_math as cm
+from datespan.date_span import DateSpan
+from datespan.ticks import TickSpans, max_gap, resolution_unit
+from datespan.timezones import TransitionTable, resolve_zone
+
+NAT = np.iinfo(np.int64).min
+"""The int64 value of NaT, marks undefined spans."""
+
+_EPOCH_WEEKDAY = cm.EPOCH.weekday()
+_BUCKET_MONTHS = {'month': 1, 'quarter': 3, 'year': 12}
+
+
+class DateSpanArray:
+    """
+    A columnar, numpy-backed array of date spans with vectorized versions of the DateSpan API, e.g.
+    `shift()`, `full_month`, `contains()`, `overlaps()` or `intersect()`.
+
+    Examples:
+        >>> spans = DateSpanArray(np.array(['2024-01-15', '2024-02-20'], dtype='datetime64[us]'))
+        >>> spans.full_month.end
+        array(['2024-01-31T23:59:59.999999', '2024-02-29T23:59:59.999999'], dtype='datetime64[us]')
+    """
+    __slots__ = ('_start', '_end', '_tz')
+
+    def __init__(self, start: Any = (), end: Any = None, tz: tzinfo | str = None):
+        """
+        Initializes a new DateSpanArray from arrays of start and end datetimes.
+
+        Arguments:
+            start: An array-like of start datetimes, e.g. a numpy datetime64 array, a pandas Series or Index
+                or a list of naive datetimes.
+            end: (optional) An array-like of (inclusive) end datetimes of the same length. If not defined,
+                the spans represent single points in time. Starts larger than ends are swapped.
+            tz: (optional) A tzinfo or time zone name. If defined, start and end are UTC and the spans are
+                timezone-aware.
+
+        Errors:
+            ValueError: If the arrays are not one-dimensional datetime arrays of the same length.
+        """
+        start = _to_us(start)
+        end = start if end is None else _to_us(end)
+        if start.ndim != 1 or start.shape != end.shape:
+            raise ValueError(f"Start and end must be one-dimensional arrays of the same length, "
+                             f"not of shape {start.shape} and {end.shape}.")
+        self._tz: tzinfo | None = resolve_zone(tz)
+        self._set_bounds(start, end)
+
+    def _set_bounds(self, start: np.ndarray, end: np.ndarray):
+        """Sets the bounds, swapping reversed bounds. Spans with only one NaT bound become undefined."""
+        undefined = (start == NAT) | (end == NAT)
+        if undefined.any():
+            start = np.where(undefined, NAT, start)
+            end = np.where(undefined, NAT, end)
+        if (start > end).any():
+            start, end = np.minimum(start, end), np.maximum(start, end)
+        self._start: np.ndarray = start
+        self._end: np.ndarray = end
+
+    @classmethod
+    def _join(cls, start: np.ndarray, end: np.ndarray, tz: tzinfo = None) -> DateSpanArray:
+        """Returns a new DateSpanArray for trusted int64 bounds, skipping all checks."""
+        array = cls.__new__(cls)
+        array._start, array._end, array._tz = start, end, tz
+        return array
+
+    # region Factories
+    @classmethod
+    def from_epoch_us(cls, start: Any, end: Any = None, tz: tzinfo | str = None) -> DateSpanArray:
+        """
+        Creates a new DateSpanArray from array-likes of microseconds since 1970-01-01, UTC if `tz` is defined.
+        Integer numpy arrays are used without copying.
+        """
+        start = np.asarray(start, dtype=np.int64)
+        end = start if end is None else np.asarray(end, dtype=np.int64)
+        return cls(start.view('M8[us]'), end.view('M8[us]'), tz=tz)
+
+    @classmethod
+    def from_spans(cls, spans: Iterable[DateSpan]) -> DateSpanArray:
+        """
+        Creates a new DateSpanArray from DateSpans, e.g. a list of DateSpans or a DateSpanSet.
+        Timezone-aware arrays get the time zone of the first span.
+
+        Errors:
+            ValueError: If naive and timezone-aware DateSpans are mixed.
+        """
+        from datespan.date_span_set import DateSpanSet
+        if isinstance(spans, DateSpanSet):
+            tuples = spans.to_tuples()
+            bounds = [(cm.to_epoch_us(start), cm.to_epoch_us(end)) for start, end in tuples]
+            zones = [start.tzinfo for start, _ in tuples]
+        else:
+            spans = list(spans)
+            bounds = [(NAT, NAT) if span.is_undefined else (span.start_us, span.end_us) for span in spans]
+            zones = [span.tz for span in spans if not span.is_undefined]
+        tz = zones[0] if zones else None
+        if (tz is None) != all(zone is None for zone in zones):
+            raise ValueError("Naive and timezone-aware DateSpans can not be mixed in a DateSpanArray.")
+        values = np.array(bounds, dtype=np.int64).reshape(-1, 2)
+        return cls._join(values[:, 0].copy(), values[:, 1].copy(), tz)
+
+    @classmethod
+    def concat(cls, arrays: Iterable[DateSpanArray]) -> DateSpanArray:
+        """Returns a new DateSpanArray concatenating the given DateSpanArrays, all naive or all timezone-aware."""
+        arrays = list(arrays)
+        if not arrays:
+            return cls()
+        if len({array._tz is None for array in arrays}) > 1:
+            raise ValueError("Naive and timezone-aware DateSpanArrays can not be concatenated.")
+        return cls._join(np.concatenate([array._start for array in arrays]),
+                         np.concatenate([array._end for array in arrays]), arrays[0]._tz)
+    # endregion
+
+    # region Magic Methods
+    def __len__(self):
+        return len(self._start)
+
+    def __getitem__(self, item) -> DateSpan | DateSpanArray:
+        if isinstance(item, (int, np.integer)):
+            start, end = int(self._start[item]), int(self._end[item])
+            if start == NAT:
+                return DateSpan.undefined()
+            return DateSpan.from_epoch_us(start, end, self._tz)
+        return self._join(self._start[item], self._end[item], self._tz)
+
+    def __iter__(self):
+        tz = self._tz
+        for start, end in zip(self._start.tolist(), self._end.tolist()):
+            yield DateSpan.undefined() if start == NAT else DateSpan.from_epoch_us(start, end, tz)
+
+    def __eq__(self, other) -> np.ndarray:
+        """Returns a boolean array, True where the spans are equal to the other DateSpan or DateSpanArray."""
+        if not isinstance(other, (DateSpan, DateSpanArray)):
+            return np.zeros(len(self), dtype=bool)
+        start, end = self._other_bounds(other)
+        return (self._start == start) & (self._end == end)
+
+    def __ne__(self, other) -> np.ndarray:
+        return ~self.__eq__(other)
+
+    __hash__ = None
+
+    def __repr__(self):
+        if len(self) > 6:
+            items = [str(span) for span in self[:3]] + ["..."] + [str(span) for span in self[-3:]]
+        else:
+            items = [str(span) for span in self]
+        return f"DateSpanArray([{', '.join(items)}], length={len(self)})"
+
+    def __str__(self):
+        return self.__repr__()
+    # endregion
+
+    # region Properties
+    @property
+    def start(self) -> np.ndarray:
+        """Returns the starts as a datetime64[us] array, in UTC for timezone-aware arrays."""
+        return self._start.view('M8[us]')
+
+    @property
+    def end(self) -> np.ndarray:
+        """Returns the (inclusive) ends as a datetime64[us] array, in UTC for timezone-aware arrays."""
+        return self._end.view('M8[us]')
+
+    @property
+    def start_us(self) -> np.ndarray:
+        """Returns the starts as an int64 array of microseconds since 1970-01-01."""
+        return self._start
+
+    @property
+    def end_us(self) -> np.ndarray:
+        """Returns the ends as an int64 array of microseconds since 1970-01-01."""
+        return self._end
+
+    @property
+    def tz(self) -> tzinfo | None:
+        """Returns the time zone of a timezone-aware DateSpanArray, or None."""
+        return self._tz
+
+    @property
+    def is_undefined(self) -> np.ndarray:
+        """Returns a boolean array, True for undefined spans."""
+        return self._start == NAT
+
+    @property
+    def nbytes(self) -> int:
+        """Returns the number of bytes used by the start and end arrays."""
+        return self._start.nbytes + self._end.nbytes
+
+    @property
+    def timedelta(self) -> np.ndarray:
+        """Returns the time deltas between start and end as a timedelta64[us] array, NaT for undefined spans."""
+        return self.end - self.start
+
+    @property
+    def duration(self) -> np.ndarray:
+        """Returns the durations in days as a float array, NaN for undefined spans."""
+        duration = (self._end - self._start) / 1_000_000 / 86400.0  # same rounding as DateSpan.duration
+        return np.where(self.is_undefined, np.nan, duration)
+    # endregion
+
+    # region Conversions
+    def copy(self) -> DateSpanArray:
+        """Returns a copy of the DateSpanArray."""
+        return self._join(self._start.copy(), self._end.copy(), self._tz)
+
+    def to_spans(self) -> list[DateSpan]:
+        """Returns the spans as a list of DateSpans. Their datetimes are created on first access only."""
+        return list(self)
+
+    def to_tuples(self) -> list[tuple[datetime, datetime]]:
+        """Returns the spans as a list of (start, end) datetime tuples, (None, None) for undefined spans."""
+        return [span.to_tuple() for span in self]
+
+    def to_ticks(self, resolution: str) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the first and last tick of all spans in wall-clock time as int64 arrays, e.g. the days since
+        1970-01-01 for a resolution of 'day'. Undefined spans are returned as NAT.
+
+        Arguments:
+            resolution: The resolution of the ticks, 'us', 'ms', 's' or 'day'.
+
+        Errors:
+            ValueError: If the resolution is not supported.
+        """
+        unit = resolution_unit(resolution)
+        start, end = self._wall()
+        start, end = start // unit, end // unit
+        undefined = self.is_undefined
+        if undefined.any():
+            start, end = np.where(undefined, NAT, start), np.where(undefined, NAT, end)
+        return start, end
+
+    def to_date_span_set(self, resolution: str = 'us'):
+        """
+        Returns a DateSpanSet of all defined spans. Overlapping and consecutive spans are sorted and
+        merged on the arrays, as DateSpanSet does for DateSpans.
+
+        Arguments:
+            resolution: (optional) The resolution of the DateSpanSet, 'us' (default), 'ms', 's' or 'day'.
+                Spans are widened to full ticks and merged on the tick arrays.
+        """
+        from datespan.date_span_set import DateSpanSet
+        defined = ~self.is_undefined
+        if resolution != 'us':
+            start, end = self.to_ticks(resolution)
+            return self._tick_set(start[defined], end[defined], resolution)
+        start, end = self._start[defined], self._end[defined]
+        order = np.lexsort((end, start))
+        start, end = start[order], end[order]
+        dss = DateSpanSet()
+        dss._tz = self._tz
+        if len(start):
+            reach = np.maximum.accumulate(end)
+            gap = np.flatnonzero(start[1:] - reach[:-1] > DateSpan.TIME_EPSILON_MICROSECONDS) + 1
+            first = np.concatenate(([0], gap))
+            last = np.concatenate((gap - 1, [len(start) - 1]))
+            dss._spans = [DateSpan.from_epoch_us(s, e, self._tz)
+                          for s, e in zip(start[first].tolist(), reach[last].tolist())]
+        return dss
+
+    def astimezone(self, tz: tzinfo | str) -> DateSpanArray:
+        """
+        Returns the same spans of time in the given time zone. The UTC microseconds are kept as they are.
+
+        Errors:
+            ValueError: If the DateSpanArray is naive, use `localize()` instead.
+        """
+        tz = resolve_zone(tz)
+        if tz is None or self._tz is None:
+            raise ValueError("Only timezone-aware DateSpanArrays can be converted, use 'localize()' instead.")
+        return self._join(self._start, self._end, tz)
+
+    def localize(self, tz: tzinfo | str) -> DateSpanArray:
+        """
+        Returns a timezone-aware DateSpanArray, interpreting the spans of a naive array as wall-clock time of
+        the given time zone. The UTC offsets are looked up at once in the cached transition table of the time zone.
+        Timezone-aware arrays are converted to the time zone, same as `astimezone()`.
+        """
+        tz = resolve_zone(tz)
+        if tz is None:
+            raise ValueError("A time zone is required.")
+        if self._tz is not None:
+            return self.astimezone(tz)
+        return self._from_wall(self._start, self._end, tz)
+    # endregion
+
+    # region Span Operations
+    def _other_bounds(self, other) -> tuple[Any, Any]:
+        """Returns the int64 bounds of another DateSpanArray or DateSpan, the latter as scalars."""
+        if isinstance(other, DateSpanArray):
+            if len(other) != len(self):
+                raise ValueError(f"DateSpanArrays of length {len(self)} and {len(other)} can not be combined.")
+            return other._start, other._end
+        if isinstance(other, DateSpan):
+            if other.is_undefined:
+                return NAT, NAT
+            return other.start_us, other.end_us
+        raise ValueError(f"Objects of type '{type(other)}' are not supported, use a DateSpan or DateSpanArray.")
+
+    def contains(self, other) -> np.ndarray:
+        """
+        Returns a boolean array, True where the span contains the given point(s) in time or span(s).
+
+        Arguments:
+            other: A datetime, an array-like of datetimes with the length of the DateSpanArray,
+                a DateSpan or a DateSpanArray. Datetime64 values of timezone-aware arrays are UTC.
+        """
+        if isinstance(other, (DateSpan, DateSpanArray)):
+            start, end = self._other_bounds(other)
+            return (self._start <= start) & (end <= self._end) & (start != NAT) & ~self.is_undefined
+        if isinstance(other, datetime):
+            points = cm.to_epoch_us(other)
+        else:
+            points = _to_us(other)
+        return (self._start <= points) & (points <= self._end) & (points != NAT) & ~self.is_undefined
+
+    def overlaps(self, other) -> np.ndarray:
+        """Returns a boolean array, True where the span overlaps with the given DateSpan or DateSpanArray."""
+        start, end = self._other_bounds(other)
+        overlapping = np.maximum(self._start, start) <= np.minimum(self._end, end)
+        return overlapping & ~self.is_undefined & (start != NAT)
+
+    def intersect(self, other) -> DateSpanArray:
+        """
+        Returns the intersections with the given DateSpan or DateSpanArray. Spans without intersection are
+        undefined. As for DateSpans, the intersection with an undefined span is the other span.
+        """
+        other_start, other_end = self._other_bounds(other)
+        start = np.maximum(self._start, other_start)
+        end = np.minimum(self._end, other_end)
+        start = np.where(start <= end, start, NAT)
+        end = np.where(start == NAT, NAT, end)
+        undefined = self.is_undefined
+        start = np.where(undefined, other_start, np.where(other_start == NAT, self._start, start))
+        end = np.where(undefined, other_end, np.where(other_start == NAT, self._end, end))
+        return self._join(start, end, self._tz)
+
+    def shift(self, years: int = 0, months: int = 0, days: int = 0, hours: int = 0, minutes: int = 0,
+              seconds: int = 0, microseconds: int = 0, weeks: int = 0) -> DateSpanArray:
+        """
+        Returns a new DateSpanArray with all spans shifted by the given +/- time delta, same as `DateSpan.shift()`.
+        Spans ending on the last day of a month end on the last day of the target month when shifted
+        by months or years only.
+        """
+        months += years * 12
+        delta = ((((weeks * 7 + days) * 24 + hours) * 60 + minutes) * 60 + seconds) * 1_000_000 + microseconds
+        start, end = self._wall()
+        if not months:
+            return self._with_wall(start + delta, end + delta)
+        if not delta:
+            start, end = _add_months(start, months), _shift_end_months(end, months)
+        else:
+            start, end = _add_months(start, months) + delta, _add_months(end, months) + delta
+        start, end = np.minimum(start, end), np.maximum(start, end)  # day clipping may reverse short spans
+        return self._with_wall(start, end)
+
+    @property
+    def full_day(self) -> DateSpanArray:
+        """Returns the spans extended to the beginning and end of their respective day(s)."""
+        start, end = self._wall()
+        return self._with_wall(_floor(start, cm.DAY_US), _floor(end, cm.DAY_US) + cm.DAY_US - 1)
+
+    @property
+    def full_week(self) -> DateSpanArray:
+        """Returns the spans extended to the beginning and end of their respective week(s), Monday to Sunday."""
+        start, end = self._wall()
+        first = start // cm.DAY_US
+        last = end // cm.DAY_US
+        first -= (first + _EPOCH_WEEKDAY) % 7
+        last += 7 - (last + _EPOCH_WEEKDAY) % 7
+        return self._with_wall(first * cm.DAY_US, last * cm.DAY_US - 1)
+
+    @property
+    def full_month(self) -> DateSpanArray:
+        """Returns the spans extended to the beginning and end of their respective month(s)."""
+        return self._months_span(1)
+
+    @property
+    def full_quarter(self) -> DateSpanArray:
+        """Returns the spans extended to the beginning and end of their respective quarter(s)."""
+        return self._months_span(3)
+
+    @property
+    def full_year(self) -> DateSpanArray:
+        """Returns the spans extended to the beginning and end of their respective year(s)."""
+        return self._months_span(12)
+
+    def buckets(self, granularity: str) -> DateSpanArray:
+        """
+        Returns the days, weeks, months, quarters or years of all defined spans, clipped to the spans, as one
+        DateSpanArray in the order of the spans. The bucket edges of all spans are computed at once.
+
+        Arguments:
+            granularity: Either 'day', 'week' (Monday to Sunday), 'month', 'quarter' or 'year'.
+
+        Errors:
+            ValueError: If the granularity is not supported.
+
+        Examples:
+            >>> spans = DateSpanArray(np.array(['2024-01-30T12:00'], dtype='datetime64[us]'),
+            ...                       np.array(['2024-02-01T06:00'], dtype='datetime64[us]'))
+            >>> spans.buckets('day').start
+            array(['2024-01-30T12:00:00.000000', '2024-01-31T00:00:00.000000',
+                   '2024-02-01T00:00:00.000000'], dtype='datetime64[us]')
+        """
+        if granularity not in cm.BUCKETS:
+            raise ValueError(f"Unsupported granularity '{granularity}', use one of {', '.join(cm.BUCKETS)}.")
+        defined = ~self.is_undefined
+        start, end = self._wall()
+        start, end = start[defined], end[defined]
+        first, last = _bucket_index(start, granularity), _bucket_index(end, granularity)
+        counts = last - first + 1
+        owner = np.repeat(np.arange(len(start)), counts)  # the span of each bucket
+        index = first[owner] + np.arange(len(owner)) - np.repeat(np.cumsum(counts) - counts, counts)
+        bucket_start = np.maximum(_bucket_start(index, granularity), start[owner])
+        bucket_end = np.minimum(_bucket_start(index + 1, granularity) - 1, end[owner])
+        if self._tz is None:
+            return self._join(bucket_start, bucket_end)
+        # clipped bounds keep the UTC microseconds of the spans, e.g. the second of two ambiguous wall-clock times
+        buckets = self._from_wall(bucket_start, bucket_end, self._tz)
+        return self._join(np.where(bucket_start == start[owner], self._start[defined][owner], buckets._start),
+                          np.where(bucket_end == end[owner], self._end[defined][owner], buckets._end), self._tz)
+
+    def _months_span(self, months: int) -> DateSpanArray:
+        """Returns the spans extended to full periods of the given number of months, aligned to January."""
+        start, end = self._wall()
+        first = _month_index(start)
+        last = _month_index(end)
+        first -= first % months
+        last += months - last % months
+        return self._with_wall(_month_start(first), _month_start(last) - 1)
+    # endregion
+
+    # region Internal Methods
+    def _tick_set(self, start: np.ndarray, end: np.ndarray, resolution: str):
+        """Returns a DateSpanSet of the given resolution from the ticks of defined spans, merged on the arrays."""
+        from datespan.date_span_set import DateSpanSet
+        order = np.lexsort((end, start))
+        start, end = start[order], end[order]
+        if len(start):
+            reach = np.maximum.accumulate(end)
+            gap = np.flatnonzero(start[1:] - reach[:-1] > max_gap(resolution_unit(resolution)) + 1) + 1
+            start = start[np.concatenate(([0], gap))]
+            end = reach[np.concatenate((gap - 1, [len(reach) - 1]))]
+        dss = DateSpanSet(resolution=resolution)
+        dss._tz = self._tz
+        dss._ticks = TickSpans(array('q', start.astype(np.int64).tobytes()),
+                               array('q', end.astype(np.int64).tobytes()), resolution, self._tz)
+        dss._raw = None
+        return dss
+
+    def _wall(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the bounds as wall-clock microseconds, the stored bounds for naive arrays. Undefined spans
+        are returned as 0 to keep the calendar arithmetic in range, `_with_wall()` restores them.
+        """
+        start, end = self._start, self._end
+        undefined = self.is_undefined
+        if undefined.any():
+            start, end = np.where(undefined, 0, start), np.where(undefined, 0, end)
+        if self._tz is None:
+            return start, end
+        table = TransitionTable.get(self._tz)
+        return start + table.utc_offsets(start), end + table.utc_offsets(end)
+
+    def _with_wall(self, start: np.ndarray, end: np.ndarray) -> DateSpanArray:
+        """Returns a new DateSpanArray from wall-clock bounds computed by `_wall()`, keeping undefined spans."""
+        undefined = self.is_undefined
+        if undefined.any():
+            start = np.where(undefined, NAT, start)
+            end = np.where(undefined, NAT, end)
+        if self._tz is None:
+            return self._join(start, end)
+        return self._from_wall(start, end, self._tz)
+
+    def _from_wall(self, start: np.ndarray, end: np.ndarray, tz: tzinfo) -> DateSpanArray:
+        """Returns a new timezone-aware DateSpanArray for wall-clock bounds of the given time zone."""
+        table = TransitionTable.get(tz)
+        undefined = start == NAT
+        start_utc = table.to_utc_many(np.where(undefined, 0, start))
+        end_utc = table.to_utc_many(np.where(undefined, 0, end))
+        return self._join(np.where(undefined, NAT, start_utc), np.where(undefined, NAT, end_utc), tz)
+    # endregion
+
+
+def _to_us(values) -> np.ndarray:
+    """Returns the given datetime values as an int64 array of microseconds since 1970-01-01."""
+    if isinstance(values, DateSpanArray):
+        raise ValueError("Use the start and end properties of a DateSpanArray.")
+    values = np.asarray(values)
+    if values.dtype.kind != 'M':
+        try:
+            values = values.astype('M8[us]')
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Values of type '{values.dtype}' are not supported as datetimes. {e}")
+    elif values.dtype != np.dtype('M8[us]'):
+        values = values.astype('M8[us]')
+    return values.view(np.int64)
+
+
+def _floor(values: np.ndarray, unit: int) -> np.ndarray:
+    return values - values % unit
+
+
+def _month_index(values: np.ndarray) -> np.ndarray:
+    """Returns the months since January 1970 of the given microseconds."""
+    return (values // cm.DAY_US).astype('M8[D]').astype('M8[M]').view(np.int64)
+
+
+def _month_start(index: np.ndarray) -> np.ndarray:
+    """Returns the microseconds of the beginning of the given months since January 1970."""
+    return index.astype('M8[M]').astype('M8[D]').view(np.int64) * cm.DAY_US
+
+
+def _bucket_index(values: np.ndarray, granularity: str) -> np.ndarray:
+    """Returns the continuous index of the day, week, month, quarter or year of the given microseconds."""
+    if granularity == 'day':
+        return values // cm.DAY_US
+    if granularity == 'week':
+        return (values // cm.DAY_US + _EPOCH_WEEKDAY) // 7  # week 0 starts on Monday, 1969-12-29
+    return _month_index(values) // _BUCKET_MONTHS[granularity]
+
+
+def _bucket_start(index: np.ndarray, granularity: str) -> np.ndarray:
+    """Returns the microseconds of the beginning of the buckets with the given indexes of `_bucket_index()`."""
+    if granularity == 'day':
+        return index * cm.DAY_US
+    if granularity == 'week':
+        return (index * 7 - _EPOCH_WEEKDAY) * cm.DAY_US
+    return _month_start(index * _BUCKET_MONTHS[granularity])
+
+
+def _add_months(values: np.ndarray, months: int) -> np.ndarray:
+    """Adds months to microseconds, clipping the day to the last day of the target month like `cm.add_months()`."""
+    if not months:
+        return values
+    days = values // cm.DAY_US
+    month = _month_index(values)
+    first_day = _month_start(month) // cm.DAY_US
+    target = month + months
+    target_first = _month_start(target)
+    days_in_target = (_month_start(target + 1) - target_first) // cm.DAY_US
+    day = np.minimum(days - first_day, days_in_target - 1)
+    return target_first + day * cm.DAY_US + values % cm.DAY_US
+
+
+def _shift_end_months(values: np.ndarray, months: int) -> np.ndarray:
+    """
+    Shifts ends by months, ends on the last day of a month are moved to the end of the last day of the target
+    month, same as `DateSpan.shift()` does.
+    """
+    if not months:
+        return values
+    month = _month_index(values)
+    month_end = _month_start(month + 1)
+    on_month_end = values // cm.DAY_US == month_end // cm.DAY_US - 1
+    return np.where(on_month_end, _month_start(month + months + 1) - 1, _add_months(values, months))
@@ -3,13 +3,20 @@
 from __future__ import annotations
 
 import uuid
-from datetime import datetime, date, time
-from typing import Any, Union
+from array import array
+from datetime import datetime, date, time, timedelta, tzinfo
+from typing import Any, Iterator, Union
 
 from dateutil.parser import parserinfo
 
-from datespan.date_span import DateSpan
+from datespan import calendar_math as cm
+from datespan import interning
+from datespan.business import BusinessCalendar, WEEKDAYS
+from datespan.date_span import DateSpan, FrozenDateSpan
+from datespan.fiscal import FiscalCalendar
 from datespan.parser.datespanparser import DateSpanParser
+from datespan.ticks import TickSpans, resolution_unit
+from datespan.timezones import TransitionTable, resolve_zone
 
 
 class DateSpanSet:
@@ -20,7 +27,9 @@ class DateSpanSet:
     """
 
 
-    def __init__(self, definition: Any = None, parser_info: parserinfo = None):
+    def __init__(self, definition: Any = None, parser_info: parserinfo = None, date_format: str = None,
+                 as_of: datetime = None, tz: tzinfo | str = None, resolution: str = 'us',
+                 fiscal_calendar: FiscalCalendar = None, business_calendar: BusinessCalendar = None):
         """
         Initializes a new DateSpanSet based on a given set of date span set definition.
         The date span set definition can be a string, a DateSpan, datetime, date or time object or a list of these.
@@ -32,12 +41,41 @@ class DateSpanSet:
             parser_info: (optional) A dateutil.parser.parserinfo instance to use for parsing date formats contained
                 in date span text. If not defined, the default parserinfo of the dateutil library will be used.
 
+            date_format: (optional) Format hint for numeric dates like '03.04.2024', either 'ymd', 'dmy' or 'mdy'.
+                Use `datespan.infer_date_format()` to infer the hint once from sample values of a data source.
+
+            as_of: (optional) The date and time relative expressions like 'today' refer to. Defaults to now.
+
+            tz: (optional) A tzinfo or time zone name like 'Europe/Berlin'. If defined, date span text is evaluated
+                in wall-clock time of the time zone and results in timezone-aware DateSpans. Defaults to the
+                time zone of `as_of`.
+
+            resolution: (optional) The time resolution of the spans, 'us' (default), 'ms', 's' or 'day'. Spans of
+                a coarser resolution are widened to full milliseconds, seconds or days and stored as integer ticks,
+                merge, subtract and intersect are computed on the ticks and SQL and filter predicates compare
+                against the exclusive end of the spans, e.g. `date < '2024-02-01'`.
+
+            fiscal_calendar: (optional) A `datespan.FiscalCalendar` for fiscal expressions like 'fy', 'fytd' or
+                'last fiscal quarter', e.g. `FiscalCalendar(start_month=10)`. Defaults to calendar years.
+
+            business_calendar: (optional) A `datespan.BusinessCalendar` of weekend days and holidays for expressions
+                like 'last 10 business days' and the business day methods. Defaults to Monday to Friday.
+
         Errors:
-            ValueError: If the language is not supported or the text cannot be parsed.
+            ValueError: If the language or resolution is not supported or the text cannot be parsed.
         """
-        self._spans: list[DateSpan] = []
+        resolution_unit(resolution)
+        self._resolution: str = resolution
+        self._ticks: TickSpans | None = None  # the spans as integer ticks of a resolution other than 'us'
+        self._raw: list[tuple[datetime, datetime]] = []  # sorted and merged (start, end) tuples
+        self._span_objects: list[DateSpan] | None = None  # DateSpan objects, created lazily from _raw
         self._definition = definition
         self._parser_info: parserinfo = parser_info
+        self._date_format: str = date_format
+        self._as_of: datetime | None = as_of
+        self._fiscal_calendar: FiscalCalendar | None = fiscal_calendar
+        self._business_calendar: BusinessCalendar | None = business_calendar
+        self._tz: tzinfo | None = resolve_zone(tz) if tz is not None else (as_of.tzinfo if as_of else None)
         self._iter_index = 0
 
         if definition is not None:
@@ -56,7 +94,7 @@ class DateSpanSet:
 
             elif isinstance(definition, DateSpanSet):
                 self._definition = definition._definition
-                expressions.extend(definition._spans)
+                expressions.extend(definition.to_tuples())
 
             elif isinstance(definition, (list, tuple)):
                 definitions = []
@@ -66,12 +104,14 @@ class DateSpanSet:
                         expressions.append(item)
                     elif isinstance(item, DateSpanSet):
                         definitions.append(str(item._definition))
-                        expressions.extend(item._spans)
+                        expressions.extend(item.to_tuples())
                     elif isinstance(item, (datetime, time, date)):
                         definitions.append(str(item))
                         expressions.append(item)
                     elif isinstance(item, str):
-                        dss = DateSpanSet(item)
+                        dss = DateSpanSet(item, parser_info=self._parser_info, date_format=self._date_format,
+                                          as_of=self._as_of, tz=self._tz, fiscal_calendar=self._fiscal_calendar,
+                                          business_calendar=self._business_calendar)
                         definitions.append(str(dss._definition))
                         definitions.append(dss._spans)
                     else:
@@ -80,16 +120,32 @@ class DateSpanSet:
 
             # parse definitions
             try:
+                raw: list[tuple[datetime, datetime]] = []
+                wall_us: list[tuple[int, int]] = []  # naive DateSpans as microseconds, for a resolution only
+                ticks = self._resolution != 'us'
                 for exp in expressions:
-                    if isinstance(exp, DateSpan):
-                        self._spans.append(exp)
+                    if isinstance(exp, tuple):
+                        raw.append(exp)  # (start, end) tuple of another DateSpanSet
+                    elif isinstance(exp, DateSpan):
+                        if exp.is_undefined:
+                            continue
+                        if ticks and exp._tz is None:
+                            wall_us.append((exp.start_us, exp.end_us))
+                        else:
+                            raw.append(cm.calendar_span(exp._start, exp._end, exp._grain))
                     elif isinstance(exp, str):
-                        self._parse(exp)
+                        raw.extend(self._parse(exp))
                     elif isinstance(exp, (datetime, date, time)):
-                        self._spans.append(DateSpan(exp))
+                        span = DateSpan(exp)
+                        raw.append((span._start, span._end))
                     else:
                         raise ValueError(f"Objects of type '{type(exp)}' are not supported for DateSpanSet.")
-                self._merge_all()
+                if ticks:
+                    self._ticks = TickSpans.from_tuples(raw, self._resolution, self._tick_zone(raw), wall_us)
+                    self._raw = None
+                else:
+                    self._raw = _merge_tuples(raw)
+                self._span_objects = None
             except ValueError as e:
                 raise ValueError(f"Failed to parse '{definition}'. {e}")
 
@@ -105,7 +161,11 @@ class DateSpanSet:
         raise StopIteration
 
     def __len__(self):
-        return len(self._spans)
+        if self._ticks is not None:
+            return len(self._ticks)
+        if self._span_objects is None:
+            return len(self._raw)
+        return len(self._span_objects)
 
     def __getitem__(self, item) -> DateSpan:
         return self._spans[item]
@@ -182,14 +242,69 @@ class DateSpanSet:
         return True
 
     def __bool__(self) -> bool:
-        return len(self._spans) > 0
+        return len(self) > 0
 
     def __hash__(self) -> int:
-        return hash(tuple(self._spans))
+        # the hash of a DateSpan equals the hash of its (start, end) tuple, FrozenDateSpans return a cached hash
+        if self._span_objects is not None:
+            return hash(tuple(map(hash, self._span_objects)))
+        if self._ticks is not None:
+            return hash(tuple(map(hash, self._ticks.to_tuples())))
+        return hash(tuple(map(hash, self._raw)))
 
     def __copy__(self) -> DateSpanSet:
         return self.clone()
 
+    def __getstate__(self) -> tuple:
+        """
+        Returns the compact pickle state: the definition text, the time zone and the start and end microseconds
+        of all spans as two packed int64 buffers. Parser settings are not pickled. Sets of spans in different
+        time zones are pickled as a list of DateSpans instead, sets with a resolution as their ticks.
+        """
+        definition = None if self._definition is None else str(self._definition)
+        if self._ticks is not None:
+            ticks = self._ticks
+            return (definition, self._tz, ticks.tz, ticks.starts.tobytes(), ticks.ends.tobytes(),
+                    self._resolution)
+        if self._span_objects is None:
+            tuples = self._raw
+            zones = {start.tzinfo for start, _ in tuples}
+            if len(zones) <= 1:
+                starts = array('q', [cm.to_epoch_us(start) for start, _ in tuples])
+                ends = array('q', [cm.to_epoch_us(end) for _, end in tuples])
+                return definition, self._tz, zones.pop() if zones else None, starts.tobytes(), ends.tobytes()
+        else:
+            spans = self._span_objects
+            zones = {span._tz for span in spans}
+            if len(zones) <= 1:
+                starts = array('q', [span.start_us for span in spans])
+                ends = array('q', [span.end_us for span in spans])
+                return definition, self._tz, zones.pop() if zones else None, starts.tobytes(), ends.tobytes()
+        return definition, self._tz, self._spans
+
+    def __setstate__(self, state: tuple):
+        self._definition, self._tz = state[0], state[1]
+        self._resolution = 'us'
+        self._ticks = None
+        spans = None
+        if len(state) == 3:
+            spans = state[2]
+        elif len(state) == 5:
+            span_tz, starts, ends = state[2:]
+            starts, ends = array('q', starts), array('q', ends)
+            spans = [DateSpan.from_epoch_us(start, end, span_tz) for start, end in zip(starts, ends)]
+        else:
+            span_tz, starts, ends, self._resolution = state[2:]
+            self._ticks = TickSpans(array('q', starts), array('q', ends), self._resolution, span_tz)
+        self._span_objects = spans
+        self._raw = None
+        self._parser_info = None
+        self._date_format = None
+        self._as_of = None
+        self._fiscal_calendar = None
+        self._business_calendar = None
+        self._iter_index = 0
+
     # endregion
 
     @property
@@ -197,37 +312,85 @@ class DateSpanSet:
         """Returns the list of DateSpan objects in the DateSpanSet."""
         return self._spans
 
+    @property
+    def resolution(self) -> str:
+        """Returns the time resolution of the spans, 'us', 'ms', 's' or 'day'."""
+        return self._resolution
+
+    @property
+    def _spans(self) -> list[DateSpan]:
+        """Returns the list of DateSpan objects, created on first access from the merged (start, end) tuples."""
+        if self._span_objects is None:
+            if self._ticks is not None:
+                self._span_objects = self._ticks.to_spans()  # FrozenDateSpans, the ticks are kept
+                return self._span_objects
+            if interning.is_enabled():
+                spans = [interning.POOL.intern(start, end) for start, end in self._raw]
+            else:
+                spans = [DateSpan(start, end) for start, end in self._raw]
+            for span, bounds in zip(spans, self._raw):
+                if span._grain is None:
+                    span._grain = cm.granularity_of(bounds)  # known for spans of calendar expressions
+            self._span_objects = spans
+            self._raw = None
+        return self._span_objects
+
+    @_spans.setter
+    def _spans(self, spans: list[DateSpan]):
+        self._span_objects = spans
+        self._raw = None
+        self._ticks = None
+
     @property
     def start(self) -> datetime:
         """Returns the start datetime of the first DateSpan object in the set."""
-        if len(self._spans) > 0:
-            return self._spans[0].start
+        if self._ticks is not None:
+            return self._ticks.bounds(0)[0] if self._ticks else None
+        if self._span_objects is None:
+            return self._raw[0][0] if self._raw else None
+        if len(self._span_objects) > 0:
+            return self._span_objects[0].start
         return None
 
     @property
     def end(self) -> datetime:
         """ Returns the end datetime of the last DateSpan object in the set."""
-        if len(self._spans) > 0:
-            return self._spans[-1].end
+        if self._ticks is not None:
+            return self._ticks.bounds(-1)[1] if self._ticks else None
+        if self._span_objects is None:
+            return self._raw[-1][1] if self._raw else None
+        if len(self._span_objects) > 0:
+            return self._span_objects[-1].end
         return None
 
     def clone(self) -> DateSpanSet:
         """ Returns a deep copy of the DateSpanSet object."""
         dss = DateSpanSet()
         dss._definition = self._definition
-        dss._spans = [ds.clone() for ds in self._spans]
+        dss._resolution = self._resolution
+        if self._ticks is not None:
+            dss._ticks = self._ticks  # the ticks and their FrozenDateSpans are immutable and shared
+            dss._span_objects = None if self._span_objects is None else list(self._span_objects)
+            dss._raw = None
+        elif self._span_objects is None:
+            dss._raw = list(self._raw)  # the (start, end) tuples are immutable and shared
+        else:
+            dss._spans = [ds if type(ds) is FrozenDateSpan else ds.clone() for ds in self._span_objects]
         dss._parser_info = self._parser_info
+        dss._date_format = self._date_format
+        dss._as_of = self._as_of
+        dss._fiscal_calendar = self._fiscal_calendar
+        dss._business_calendar = self._business_calendar
+        dss._tz = self._tz
         return dss
 
     def add(self, other):
         """ Adds a new DateSpan object to the DateSpanSet."""
-        merged = self.merge(other)
-        self._spans = merged._spans
-        self._definition = merged._definition
+        self._assign(self.merge(other))
 
     def remove(self, other):
         """ Removes a DateSpan object from the DateSpanSet."""
-        self._spans = self.intersect(other)._spans
+        self._assign(self.subtract(other))
 
     def shift(self, years: int = 0, months: int = 0, days: int = 0, hours: int = 0, minutes: int = 0, seconds: int = 0,
               microseconds: int = 0, weeks: int = 0) -> DateSpanSet:
@@ -242,11 +405,227 @@ class DateSpanSet:
             return DateSpanSet(new_spans)
         raise ValueError("Failed to shift empty DateSpanSet.")
 
+    def iter_days(self) -> Iterator[DateSpan]:
+        """
+        Yields a DateSpan for every day of all DateSpans in the set, the first and last day of each DateSpan
+        clipped to the DateSpan.
+
+        Examples:
+            >>> [day.start.day for day in DateSpanSet("from 2024-01-30 to 2024-02-02").iter_days()]
+            [30, 31, 1, 2]
+        """
+        return self._iter_buckets('day')
+
+    def iter_weeks(self) -> Iterator[DateSpan]:
+        """Yields a DateSpan for every week, Monday to Sunday, of all DateSpans in the set, clipped to the DateSpans."""
+        return self._iter_buckets('week')
+
+    def iter_months(self) -> Iterator[DateSpan]:
+        """Yields a DateSpan for every month of all DateSpans in the set, clipped to the DateSpans."""
+        return self._iter_buckets('month')
+
+    def iter_quarters(self) -> Iterator[DateSpan]:
+        """Yields a DateSpan for every quarter of all DateSpans in the set, clipped to the DateSpans."""
+        return self._iter_buckets('quarter')
+
+    def iter_years(self) -> Iterator[DateSpan]:
+        """Yields a DateSpan for every year of all DateSpans in the set, clipped to the DateSpans."""
+        return self._iter_buckets('year')
+
+    def buckets(self, granularity: str):
+        """
+        Returns the days, weeks, months, quarters or years of all DateSpans in the set, clipped to the DateSpans,
+        as a DateSpanArray. The bucket edges are computed at once on numpy arrays, use this instead of the
+        `iter_*()` methods for large numbers of buckets. Requires numpy.
+
+        Arguments:
+            granularity: Either 'day', 'week' (Monday to Sunday), 'month', 'quarter' or 'year'.
+
+        Errors:
+            ValueError: If the granularity is not supported or the set mixes naive and timezone-aware DateSpans.
+        """
+        from datespan.date_span_array import DateSpanArray
+        return DateSpanArray.from_spans(self._spans).buckets(granularity)
+
+    def _iter_buckets(self, granularity: str) -> Iterator[DateSpan]:
+        for span in self._spans:
+            yield from span._iter_buckets(granularity)
+
+    # region business days
+    def count_business_days(self, calendar: BusinessCalendar = None) -> int:
+        """
+        Returns the number of business days touched by the DateSpans in the set, each day counted once.
+
+        Arguments:
+            calendar: (optional) The BusinessCalendar to use. Defaults to the business calendar of the set,
+                Monday to Friday without holidays if not defined.
+
+        Errors:
+            ValueError: If a DateSpan is outside the range from `DateSpan.MIN_DATE` to `DateSpan.MAX_DATE`.
+
+        Examples:
+            >>> DateSpanSet("from 2024-11-01 to 2024-11-30").count_business_days()
+            21
+        """
+        calendar = calendar or self._business_calendar or WEEKDAYS
+        count, counted = 0, date.min  # the last counted day, spans of the same day count once
+        for start, end in self.to_tuples():
+            first, last = max(start.date(), counted + _DAY), end.date()
+            if first <= last:
+                count += calendar.count(first, last)
+                counted = last
+        return count
+
+    def shift_business_days(self, days: int, calendar: BusinessCalendar = None) -> DateSpanSet:
+        """
+        Returns a new DateSpanSet with the start and end of all DateSpans shifted by the given +/- number of
+        business days, keeping the time of day. Starts and ends on non-business days are first moved to the
+        next business day when shifting by 0 days.
+
+        Arguments:
+            days: The +/- number of business days to shift.
+            calendar: (optional) The BusinessCalendar to use. Defaults to the business calendar of the set,
+                Monday to Friday without holidays if not defined.
+
+        Errors:
+            ValueError: If a shifted date is outside the range from `DateSpan.MIN_DATE` to `DateSpan.MAX_DATE`.
+        """
+        calendar = calendar or self._business_calendar or WEEKDAYS
+        tuples = []
+        for span in self.to_tuples():
+            granularity = 'day' if cm.granularity_of(span) in _DAY_ALIGNED else None
+            start, end = span
+            tuples.append(cm.calendar_span(calendar.shift(start, days), calendar.shift(end, days), granularity))
+        return self._with_tuples(tuples, f"({self._definition}) shifted by {days} business days")
+
+    def business_days(self, calendar: BusinessCalendar = None) -> DateSpanSet:
+        """
+        Returns a new DateSpanSet with only the business days of the set, e.g. without weekends and holidays.
+        The runs of consecutive business days are read from the bitmap of the calendar.
+
+        Arguments:
+            calendar: (optional) The BusinessCalendar to use. Defaults to the business calendar of the set,
+                Monday to Friday without holidays if not defined.
+
+        Examples:
+            >>> len(DateSpanSet("from 2024-11-01 to 2024-11-30").business_days())  # 5 weeks of business days
+            5
+        """
+        calendar = calendar or self._business_calendar or WEEKDAYS
+        tuples = [run for start, end in self.to_tuples() for run in calendar.spans(start, end)]
+        return self._with_tuples(tuples, f"({self._definition}) business days")
+
+    def _with_tuples(self, tuples: list[tuple[datetime, datetime]], definition: str) -> DateSpanSet:
+        """Returns a new DateSpanSet of the resolution and settings of this set, holding the merged tuples."""
+        if self._ticks is not None:
+            ticks = TickSpans.from_tuples(tuples, self._resolution, self._ticks.tz)
+            return self._with_ticks(ticks, definition)
+        dss = self._derived(definition, self._tz)
+        dss._raw = _merge_tuples(tuples)
+        return dss
+    # endregion
+
+    def overlap_duration(self, starts, ends):
+        """
+        Returns the number of seconds each event overlaps with the DateSpans of the set, e.g. to bill sessions
+        by the hours within a reporting period. Events are half-open intervals from start to end, their duration
+        is `end - start`, DateSpans include their end. Requires numpy.
+
+        The bounds of the sorted and disjoint DateSpans and the prefix sums of their lengths are computed once,
+        the covered time up to any point in time is then a `searchsorted` lookup. For N events and K DateSpans
+        the cost is O((N + K) log K) instead of intersecting every event with every DateSpan.
+
+        Arguments:
+            starts: An array-like of event start datetimes, e.g. a numpy datetime64 array, a pandas Series or a
+                list of datetimes. Datetime64 values are UTC for timezone-aware DateSpanSets.
+            ends: An array-like of event end datetimes of the same length.
+
+        Returns:
+            A float64 numpy array of the overlapping seconds per event, 0.0 for events ending before they start
+            and NaN for events with a NaT bound.
+
+        Errors:
+            ValueError: If the arrays are no one-dimensional datetime arrays of the same length.
+
+        Examples:
+            >>> dss = DateSpanSet("from 2024-11-15 to 2024-11-15")
+            >>> dss.overlap_duration(['2024-11-14T23:00', '2024-11-15T10:00'], ['2024-11-15T01:00', '2024-11-15T10:30'])
+            array([3600., 1800.])
+        """
+        import numpy as np
+        from datespan.date_span_array import NAT, _to_us
+
+        starts, ends = _to_us(starts), _to_us(ends)
+        if starts.ndim != 1 or starts.shape != ends.shape:
+            raise ValueError(f"Starts and ends must be one-dimensional arrays of the same length, "
+                             f"not of shape {starts.shape} and {ends.shape}.")
+        tuples = self.to_tuples()
+        span_starts = np.fromiter((cm.to_epoch_us(start) for start, _ in tuples), np.int64, len(tuples))
+        span_ends = np.fromiter((cm.to_epoch_us(end) + 1 for _, end in tuples), np.int64, len(tuples))  # exclusive
+        covered = np.concatenate(([0], np.cumsum(span_ends - span_starts)))  # the length of all spans before
+
+        def covered_until(points: np.ndarray) -> np.ndarray:
+            # the time covered by the spans before the points, the full spans before the last span starting
+            # at or before the point, plus the part of that span before the point
+            index = np.searchsorted(span_starts, points, side='right') - 1
+            last = np.maximum(index, 0)
+            partial = np.clip(points - span_starts[last], 0, span_ends[last] - span_starts[last])
+            return np.where(index < 0, 0, covered[last] + partial)
+
+        if not tuples:
+            overlap = np.zeros(len(starts), dtype=np.float64)
+        else:
+            overlap = np.maximum(covered_until(ends) - covered_until(starts), 0) / 1_000_000
+        return np.where((starts == NAT) | (ends == NAT), np.nan, overlap)
+
+    @property
+    def tz(self) -> tzinfo | None:
+        """Returns the time zone the DateSpanSet was evaluated in or converted to, None for naive DateSpanSets."""
+        return self._tz
+
+    def astimezone(self, tz: tzinfo | str) -> DateSpanSet:
+        """
+        Returns a DateSpanSet covering the same spans of time in the given time zone. Timezone-aware DateSpans
+        are normalized to UTC microseconds, datetimes of the new time zone are only created on access.
+
+        Arguments:
+            tz: A tzinfo or time zone name like 'Europe/Berlin'.
+
+        Errors:
+            ValueError: If the DateSpanSet contains naive DateSpans, use `localize()` instead.
+        """
+        tz = resolve_zone(tz)
+        if tz is None:
+            raise ValueError("A time zone is required.")
+        tuples = self.to_tuples()
+        if any(start.tzinfo is None for start, _ in tuples):
+            raise ValueError("Naive DateSpanSets can not be converted, use 'localize()' to assign a time zone.")
+        return self._with_spans([DateSpan.from_epoch_us(cm.to_epoch_us(start), cm.to_epoch_us(end), tz)
+                                 for start, end in tuples], tz)
+
+    def localize(self, tz: tzinfo | str) -> DateSpanSet:
+        """
+        Returns a timezone-aware DateSpanSet, interpreting all naive DateSpans as wall-clock time of the given
+        time zone. The UTC offsets of all spans are looked up at once from the cached transition table of the
+        time zone. Timezone-aware DateSpans are converted to the time zone, same as `astimezone()`.
+
+        Arguments:
+            tz: A tzinfo or time zone name like 'Europe/Berlin'.
+        """
+        tz = resolve_zone(tz)
+        if tz is None:
+            raise ValueError("A time zone is required.")
+        bounds = self._wall_bounds()
+        if bounds is None:
+            return self._with_spans([DateSpan(start, end).localize(tz) for start, end in self.to_tuples()], tz)
+        return self._localized(bounds, tz)
+
     # endregion
 
     # region Class Methods
     @classmethod
-    def parse(cls, datespan_text: str, parser_info: parserinfo = None) -> DateSpanSet:
+    def parse(cls, datespan_text: str, parser_info: parserinfo = None, date_format: str = None,
+              as_of: datetime = None, tz: tzinfo | str = None) -> DateSpanSet:
         """
             Creates a new DateSpanSet instance and parses the given text into a set of DateSpan objects.
 
@@ -255,6 +634,9 @@ class DateSpanSet:
                 language: (optional) An ISO 639-1 2-digit compliant language code for the language of the text to parse.
                 parser_info: (optional) A dateutil.parser.parserinfo instance to use for parsing dates contained
                     datespan_text. If not defined, the default parser of the dateutil library will be used.
+                date_format: (optional) Format hint for numeric dates, either 'ymd', 'dmy' or 'mdy'.
+                as_of: (optional) The date and time relative expressions like 'today' refer to. Defaults to now.
+                tz: (optional) A tzinfo or time zone name to evaluate the text in, returns timezone-aware DateSpans.
 
             Returns:
                 The DateSpanSet instance contain 0 to N DateSpan objects derived from the given text.
@@ -263,10 +645,11 @@ class DateSpanSet:
                 >>> DateSpanSet.parse('last month')  # if today would be in February 2024
                 DateSpanSet([DateSpan(datetime.datetime(2024, 1, 1, 0, 0), datetime.datetime(2024, 1, 31, 23, 59, 59, 999999))])
             """
-        return cls(definition=datespan_text, parser_info=parser_info)
+        return cls(definition=datespan_text, parser_info=parser_info, date_format=date_format, as_of=as_of, tz=tz)
 
     @classmethod
-    def try_parse(cls, datespan_text: str, parser_info: parserinfo = None) -> DateSpanSet:
+    def try_parse(cls, datespan_text: str, parser_info: parserinfo = None, date_format: str = None,
+                  as_of: datetime = None, tz: tzinfo | str = None) -> DateSpanSet:
         """
             Creates a new DateSpanSet instance and parses the given text into a set of DateSpan objects. If
             the text cannot be parsed, None is returned.
@@ -275,6 +658,9 @@ class DateSpanSet:
                 datespan_text: The date span text to parse, e.g. 'last month', 'next 3 days', 'yesterday' or 'Jan 2024'.
                 parser_info: (optional) A dateutil.parser.parserinfo instance to use for parsing dates contained
                     datespan_text. If not defined, the default parser of the dateutil library will be used.
+                date_format: (optional) Format hint for numeric dates, either 'ymd', 'dmy' or 'mdy'.
+                as_of: (optional) The date and time relative expressions like 'today' refer to. Defaults to now.
+                tz: (optional) A tzinfo or time zone name to evaluate the text in, returns timezone-aware DateSpans.
 
             Returns:
                 The DateSpanSet instance contain 0 to N DateSpan objects derived from the given text or None.
@@ -284,7 +670,7 @@ class DateSpanSet:
                 DateSpanSet([DateSpan(datetime.datetime(2024, 1, 1, 0, 0), datetime.datetime(2024, 1, 31, 23, 59, 59, 999999))])
             """
         try:
-            dss = cls(definition=datespan_text, parser_info=parser_info)
+            dss = cls(definition=datespan_text, parser_info=parser_info, date_format=date_format, as_of=as_of, tz=tz)
             return dss
         except ValueError:
             return None
@@ -308,13 +694,20 @@ class DateSpanSet:
 
         Returns:
             A string containing an ANSI-SQL compliant fragment to be used in the WHERE clause of an SQL query.
+            DateSpanSets with a resolution filter on half-open ranges, e.g. `(date >= '2024-01-01' AND
+            date < '2024-02-01')` for a resolution of 'day'.
         """
         filters: list[str] = []
         column = column.strip()
         if " " in column and not column[0] in "['\"":
             column = f"[{column}]"
-        for i, span in enumerate(self._spans):
-            filters.append(f"({column} BETWEEN '{span.start.isoformat()}' AND '{span.end.isoformat()}')")
+        if self._ticks is not None:
+            for start, end in self._ticks.to_half_open():
+                filters.append(f"({column} >= '{_sql_literal(start)}' AND {column} < '{_sql_literal(end)}')")
+        for i, span in enumerate(self._spans if self._ticks is None else ()):
+            # spans made of full days start at midnight, written as a date literal
+            start = span.start.date() if _starts_at_midnight(span) else span.start
+            filters.append(f"({column} BETWEEN '{start.isoformat()}' AND '{span.end.isoformat()}')")
         comment = f"{len(filters)} filters added from {self.__str__()}" if add_comment else ""
         inline_comment = f" /* {comment} */ " if add_comment else ""
         separate_comment = f"-- {comment}" if add_comment else ""
@@ -349,17 +742,8 @@ class DateSpanSet:
         # prepare source
         func_name = f"filter_{str(uuid.uuid4()).lower().replace('-', '')}"
         filters: list[str] = [f"def {func_name}(x):", ]
-        for i, span in enumerate(self._spans):
-            s = span.start
-            e = span.end
-            if s.hour == 0 and s.minute == 0 and s.second == 0 and s.microsecond == 0 and s.microsecond == 0:
-                start = f"datetime(year={s.year}, month={s.month}, day={s.day})"
-            elif s.microsecond == 0:
-                start = f"datetime(year={s.year}, month={s.month}, day={s.day}, hour={s.hour}, minute={s.minute}, second={s.second})"
-            else:
-                start = f"datetime(year={s.year}, month={s.month}, day={s.day}, hour={s.hour}, minute={s.minute}, second={s.second}, microsecond={s.microsecond})"
-            end = f"datetime(year={e.year}, month={e.month}, day={e.day}, hour={e.hour}, minute={e.minute}, second={e.second}, microsecond={e.microsecond})"
-            filters.append(f"\tif {start} <= x <= {end}:")
+        for start, end, end_operator in self._bound_sources():
+            filters.append(f"\tif {start} <= x {end_operator} {end}:")
             filters.append(f"\t\treturn True")
         filters.append(f"\treturn False")
 
@@ -390,19 +774,10 @@ class DateSpanSet:
 
         # prepare source
         filters: list[str] = [f"lambda x :", ]
-        for i, span in enumerate(self._spans):
-            s = span.start
-            e = span.end
-            if s.hour == 0 and s.minute == 0 and s.second == 0 and s.microsecond == 0 and s.microsecond == 0:
-                start = f"datetime(year={s.year}, month={s.month}, day={s.day})"
-            elif s.microsecond == 0:
-                start = f"datetime(year={s.year}, month={s.month}, day={s.day}, hour={s.hour}, minute={s.minute}, second={s.second})"
-            else:
-                start = f"datetime(year={s.year}, month={s.month}, day={s.day}, hour={s.hour}, minute={s.minute}, second={s.second}, microsecond={s.microsecond})"
-            end = f"datetime(year={e.year}, month={e.month}, day={e.day}, hour={e.hour}, minute={e.minute}, second={e.second}, microsecond={e.microsecond})"
+        for i, (start, end, end_operator) in enumerate(self._bound_sources()):
             if i > 0:
                 filters.append(" or ")
-            filters.append(f"{start} <= x <= {end}")
+            filters.append(f"{start} <= x {end_operator} {end}")
 
         source = f" ".join(filters)
         if return_source_code:
@@ -431,19 +806,10 @@ class DateSpanSet:
         """
         # prepare source
         filters: list[str] = [f"lambda x :", ]
-        for i, span in enumerate(self._spans):
-            s = span.start
-            e = span.end
-            if s.hour == 0 and s.minute == 0 and s.second == 0 and s.microsecond == 0 and s.microsecond == 0:
-                start = f"datetime(year={s.year}, month={s.month}, day={s.day})"
-            elif s.microsecond == 0:
-                start = f"datetime(year={s.year}, month={s.month}, day={s.day}, hour={s.hour}, minute={s.minute}, second={s.second})"
-            else:
-                start = f"datetime(year={s.year}, month={s.month}, day={s.day}, hour={s.hour}, minute={s.minute}, second={s.second}, microsecond={s.microsecond})"
-            end = f"datetime(year={e.year}, month={e.month}, day={e.day}, hour={e.hour}, minute={e.minute}, second={e.second}, microsecond={e.microsecond})"
+        for i, (start, end, end_operator) in enumerate(self._bound_sources()):
             if i > 0:
                 filters.append(" | ")
-            filters.append(f"((x >= {start}) & (x <= {end}))")
+            filters.append(f"((x >= {start}) & (x {end_operator} {end}))")
 
         source = f" ".join(filters)
         if return_source_code:
@@ -454,7 +820,11 @@ class DateSpanSet:
 
     def to_tuples(self) -> list[tuple[datetime, datetime]]:
         """ Returns a list of tuples with start and end dates of all DateSpan objects in the DateSpanSet."""
-        return [(ds.start, ds.end) for ds in self._spans]
+        if self._ticks is not None:
+            return self._ticks.to_tuples()
+        if self._span_objects is None:
+            return list(self._raw)
+        return [cm.calendar_span(ds.start, ds.end, ds._grain) for ds in self._span_objects]
 
     def filter(self, data: Any, column: str = None, return_mask: bool = False,
                return_index: bool = False) -> Any:
@@ -518,14 +888,20 @@ class DateSpanSet:
             other: The other DateSpanSet, DateSpan or string to merge with the current DateSpanSet.
 
         Returns:
-            A new DateSpanSet instance containing the merged date spans.
+            A new DateSpanSet instance containing the merged date spans, of the resolution of the current DateSpanSet.
         """
         if isinstance(other, DateSpan):
-            return DateSpanSet([self, other])
+            return DateSpanSet([self, other], resolution=self._resolution)
         if isinstance(other, DateSpanSet):
-            return DateSpanSet([self, other])
+            ticks = self._compatible_ticks(other)
+            if ticks is not None:
+                return self._with_ticks(self._ticks.union(ticks), f"{self._definition} + {other._definition}")
+            return DateSpanSet([self, other], resolution=self._resolution)
         if isinstance(other, str):
-            return DateSpanSet([self, DateSpanSet(other)])
+            other = DateSpanSet(other, parser_info=self._parser_info, date_format=self._date_format, as_of=self._as_of,
+                                tz=self._tz, fiscal_calendar=self._fiscal_calendar,
+                                business_calendar=self._business_calendar)
+            return DateSpanSet([self, other], resolution=self._resolution)
         raise ValueError(f"Objects of type '{type(other)}' are not supported for DateSpanSet merging.")
 
     def intersect(self, other) -> DateSpanSet:
@@ -538,9 +914,21 @@ class DateSpanSet:
             other: The other DateSpanSet, DateSpan or string to merge with the current DateSpanSet.
 
         Returns:
-            A new DateSpanSet instance containing the intersected data spans.
+            A new DateSpanSet instance containing the intersected data spans, of the resolution of the
+            current DateSpanSet.
+
+        Examples:
+            >>> year = DateSpanSet("from January 2024 to December 2024")
+            >>> year.intersect("from March 2024 to May 2025").to_tuples()
+            [(datetime(2024, 3, 1, 0, 0), datetime(2024, 12, 31, 23, 59, 59, 999999))]
         """
-        raise NotImplementedError()
+        if self._ticks is not None:
+            definition, ticks = self._tick_operand(other, "intersection")
+            return self._with_ticks(self._ticks.intersect(ticks), f"{self._definition} & {definition}")
+        definition, tuples = self._operand(other, "intersection")
+        dss = self._derived(f"{self._definition} & {definition}", self._tz)
+        dss._raw = _intersect_tuples(self.to_tuples(), _merge_tuples(tuples))
+        return dss
 
     def subtract(self, other) -> DateSpanSet:
         """
@@ -557,6 +945,10 @@ class DateSpanSet:
         Returns:
             A new DateSpanSet instance containing reduced DateSpanSet.
         """
+        if self._ticks is not None:
+            definition, ticks = self._tick_operand(other, "subtraction")
+            return self._with_ticks(self._ticks.subtract(ticks), f"{self._definition} - {definition}")
+
         definitions = [str(self._definition)]
         subtracts: list[DateSpan] = []
         if isinstance(other, DateSpan):
@@ -593,45 +985,223 @@ class DateSpanSet:
     # end region
 
     # region Internal Methods
-    def _merge_all(self):
+    def _wall_bounds(self) -> list[int] | None:
         """
-        Merges all overlapping DateSpan objects if applicable.
+        Returns the flat list of start and end microseconds of all naive spans, or None if the
+        DateSpanSet contains timezone-aware spans.
         """
-        if len(self._spans) < 2:
-            return  # special case, just one span = nothing to merge
+        tuples = self.to_tuples()
+        if any(start.tzinfo is not None for start, _ in tuples):
+            return None
+        return [cm.to_epoch_us(dt) for span in tuples for dt in span]
+
+    def _localized(self, bounds: list[int], tz: tzinfo) -> DateSpanSet:
+        """Returns a new DateSpanSet for the wall-clock bounds of `_wall_bounds()` in the given time zone."""
+        bounds = TransitionTable.get(tz).to_utc_many(bounds)
+        if not isinstance(bounds, list):
+            bounds = bounds.tolist()
+        return self._with_spans([DateSpan.from_epoch_us(bounds[i], bounds[i + 1], tz)
+                                 for i in range(0, len(bounds), 2)], tz)
+
+    def _with_spans(self, spans: list[DateSpan], tz: tzinfo) -> DateSpanSet:
+        """Returns a new DateSpanSet with the same definition and settings, holding the given sorted spans."""
+        dss = self._derived(self._definition, tz)
+        dss._spans = spans
+        return dss
 
-        self._spans.sort()
+    def _derived(self, definition: Any, tz: tzinfo) -> DateSpanSet:
+        """Returns a new and empty DateSpanSet with the given definition and the parser settings of this set."""
+        dss = DateSpanSet()
+        dss._definition = definition
+        dss._parser_info = self._parser_info
+        dss._date_format = self._date_format
+        dss._as_of = self._as_of
+        dss._fiscal_calendar = self._fiscal_calendar
+        dss._business_calendar = self._business_calendar
+        dss._tz = tz
+        return dss
 
-        current: DateSpan = self._spans[0]
-        stack = self._spans[1:]
-        stack.reverse()
-        merged: list[DateSpan] = []
+    def _assign(self, other: DateSpanSet):
+        """Replaces the spans and definition of this DateSpanSet by those of another DateSpanSet."""
+        self._definition = other._definition
+        self._resolution = other._resolution
+        self._raw, self._span_objects, self._ticks = other._raw, other._span_objects, other._ticks
 
-        while True:
-            next: DateSpan = stack.pop()
-            if current.can_merge(next):
-                current = current.merge(next)
-            else:
-                merged.append(current)
-                current = next
-            if not stack:
-                merged.append(current)
-                break
+    def _operand(self, other, operation: str) -> tuple[str, list[tuple[datetime, datetime]]]:
+        """Returns the definition and the (start, end) tuples of a DateSpan, DateSpanSet or text to operate with."""
+        if isinstance(other, DateSpan):
+            return f"({other._arg_start}, {other._arg_end})", [] if other.is_undefined else [other.to_tuple()]
+        if isinstance(other, DateSpanSet):
+            return str(other._definition), other.to_tuples()
+        if isinstance(other, str):
+            dss = DateSpanSet(other, parser_info=self._parser_info, date_format=self._date_format,
+                              as_of=self._as_of, tz=self._tz, fiscal_calendar=self._fiscal_calendar,
+                              business_calendar=self._business_calendar)
+            return str(dss._definition), dss.to_tuples()
+        raise ValueError(f"Objects of type '{type(other)}' are not supported for DateSpanSet {operation}.")
+
+    def _tick_zone(self, tuples: list[tuple[datetime, datetime]]) -> tzinfo | None:
+        """Returns the time zone whose wall-clock time the ticks of timezone-aware tuples count, None if naive."""
+        zone = tuples[0][0].tzinfo if tuples else None
+        return self._tz if zone is not None and self._tz is not None else zone
+
+    def _compatible_ticks(self, other: DateSpanSet) -> TickSpans | None:
+        """Returns the ticks of another DateSpanSet if both sets have ticks of the same resolution and zone."""
+        if self._ticks is None or other._ticks is None or other._resolution != self._resolution:
+            return None
+        return other._ticks if other._ticks.tz == self._ticks.tz else None
 
-        self._spans = merged
+    def _tick_operand(self, other, operation: str) -> tuple[str, TickSpans]:
+        """Returns the definition and the ticks of another operand in the resolution and zone of this set."""
+        if isinstance(other, DateSpanSet):
+            ticks = self._compatible_ticks(other)
+            if ticks is not None:
+                return str(other._definition), ticks
+        definition, tuples = self._operand(other, operation)
+        if not self._ticks:
+            return definition, TickSpans(array('q'), array('q'), self._resolution)
+        return definition, TickSpans.from_tuples(tuples, self._resolution, self._ticks.tz)
+
+    def _with_ticks(self, ticks: TickSpans, definition: str) -> DateSpanSet:
+        """Returns a new DateSpanSet of the resolution of this set, holding the given ticks."""
+        dss = self._derived(definition, self._tz)
+        dss._resolution = self._resolution
+        dss._ticks = ticks
+        dss._raw = None
+        return dss
+
+    def _bound_sources(self) -> list[tuple[str, str, str]]:
+        """
+        Returns the Python source of the start and end of all spans and the operator comparing the end, for
+        generated filter functions. DateSpanSets with a resolution compare against the exclusive end.
+        """
+        if self._ticks is None:
+            return [(*_datetime_sources(span), "<=") for span in self._spans]
+        return [(_datetime_source(start), _datetime_source(end), "<") for start, end in self._ticks.to_half_open()]
+
+    def _merge_all(self):
+        """
+        Merges all overlapping DateSpan objects if applicable.
+        """
+        if self._ticks is not None:
+            return  # ticks are always merged
+        self._raw = _merge_tuples(self.to_tuples())
+        self._span_objects = None
 
-    def _parse(self, text: str = None):
+    def _parse(self, text: str = None) -> list[tuple[datetime, datetime]]:
         """
-        Parses the given text into a set of DateSpan objects.
+        Parses the given text into a list of (start, end) tuples.
         """
         self._message = None
-        self._spans.clear()
         try:
-            date_span_parser: DateSpanParser = DateSpanParser(text)
-            expressions = date_span_parser.parse()  # todo: inject self.parser_info
+            date_span_parser: DateSpanParser = DateSpanParser(text, date_format=self._date_format,
+                                                              parser_info=self._parser_info,
+                                                              fiscal_calendar=self._fiscal_calendar,
+                                                              business_calendar=self._business_calendar)
+            expressions = date_span_parser.parse(as_of=self._as_of, tz=self._tz)
+            raw = []
             for expr in expressions:
-                self._spans.extend([DateSpan(span[0], span[1]) for span in expr])
+                for span in expr:
+                    start, end = span
+                    raw.append(span if start <= end else (end, start))
+            return raw
         except Exception as e:
             self._message = str(e)
             raise ValueError(str(e))
     # endregion
+
+
+_EPSILON_US = DateSpan.TIME_EPSILON_MICROSECONDS
+_DAY = timedelta(days=1)
+_DAY_ALIGNED = cm.ALIGNED['day']
+_SECOND_ALIGNED = cm.ALIGNED['second']
+
+
+def _starts_at_midnight(span: DateSpan) -> bool:
+    """Returns True if the DateSpan starts at 00:00:00.000000, known without checks for spans made of days."""
+    granularity = span._grain
+    if granularity is not None:
+        return granularity in _DAY_ALIGNED
+    s = span.start
+    return s.hour == 0 and s.minute == 0 and s.second == 0 and s.microsecond == 0
+
+
+def _datetime_sources(span: DateSpan) -> tuple[str, str]:
+    """
+    Returns the Python source of the start and end datetime of a DateSpan for generated filter functions.
+    Starts at midnight are written as dates, starts of whole seconds without microseconds.
+    """
+    s, e = span.start, span.end
+    if _starts_at_midnight(span):
+        start = f"datetime(year={s.year}, month={s.month}, day={s.day})"
+    elif span._grain in _SECOND_ALIGNED or s.microsecond == 0:
+        start = f"datetime(year={s.year}, month={s.month}, day={s.day}, hour={s.hour}, minute={s.minute}, second={s.second})"
+    else:
+        start = f"datetime(year={s.year}, month={s.month}, day={s.day}, hour={s.hour}, minute={s.minute}, second={s.second}, microsecond={s.microsecond})"
+    end = f"datetime(year={e.year}, month={e.month}, day={e.day}, hour={e.hour}, minute={e.minute}, second={e.second}, microsecond={e.microsecond})"
+    return start, end
+
+
+def _datetime_source(dt: datetime) -> str:
+    """Returns the Python source of a datetime for generated filter functions, without trailing zero time parts."""
+    if dt.microsecond:
+        return (f"datetime(year={dt.year}, month={dt.month}, day={dt.day}, hour={dt.hour}, minute={dt.minute}, "
+                f"second={dt.second}, microsecond={dt.microsecond})")
+    if dt.hour or dt.minute or dt.second:
+        return (f"datetime(year={dt.year}, month={dt.month}, day={dt.day}, hour={dt.hour}, minute={dt.minute}, "
+                f"second={dt.second})")
+    return f"datetime(year={dt.year}, month={dt.month}, day={dt.day})"
+
+
+def _sql_literal(dt: datetime) -> str:
+    """Returns the ISO literal of a datetime for SQL, a date for naive datetimes at midnight."""
+    if dt.tzinfo is None and not (dt.hour or dt.minute or dt.second or dt.microsecond):
+        return dt.date().isoformat()
+    return dt.isoformat()
+
+
+def _intersect_tuples(first: list[tuple[datetime, datetime]],
+                      second: list[tuple[datetime, datetime]]) -> list[tuple[datetime, datetime]]:
+    """Returns the intersections of two lists of sorted and merged (start, end) tuples."""
+    result = []
+    i = j = 0
+    while i < len(first) and j < len(second):
+        a, b = first[i], second[j]
+        start, end = max(a[0], b[0]), min(a[1], b[1])
+        if start <= end:
+            grain = cm.common_granularity(cm.granularity_of(a), cm.granularity_of(b))
+            result.append(cm.calendar_span(start, end, grain))
+        if a[1] < b[1]:
+            i += 1
+        else:
+            j += 1
+    return result
+
+
+def _merge_tuples(spans: list[tuple[datetime, datetime]]) -> list[tuple[datetime, datetime]]:
+    """
+    Sorts and merges overlapping or consecutive (start, end) tuples, same as `DateSpan.can_merge()` and
+    `DateSpan.merge()` do for DateSpan objects, but without creating intermediate objects. Overlaps are
+    checked on the datetimes, the gap between consecutive spans on integer microseconds.
+    """
+    if len(spans) < 2:
+        return spans
+    spans.sort()
+    merged = []
+    iterator = iter(spans)
+    span = next(iterator)
+    start, end = span
+    granularity = cm.granularity_of(span)  # merged calendar spans are made of the common granularity
+    for span in iterator:
+        next_start, next_end = span
+        if next_start <= end or cm.to_epoch_us(next_start) - cm.to_epoch_us(end) <= _EPSILON_US:
+            if next_end > end:
+                end = next_end
+            if granularity is not None:
+                granularity = cm.common_granularity(granularity, cm.granularity_of(span))
+        else:
+            merged.append(cm.calendar_span(start, end, granularity))
+            start, end = next_start, next_end
+            granularity = cm.granularity_of(span)
+    merged.append(cm.calendar_span(start, end, granularity))
+    return merged
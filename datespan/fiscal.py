@@ -0,0 +1,225 @@
+# datespan - Copyright (c)2024, Thomas Zeutschler, MIT license
+
+"""
+Fiscal calendars, either fiscal years of calendar months starting in any month, e.g. October, or retail
+calendars of 52/53 weeks per year with quarters of 4-4-5, 4-5-4 or 5-4-4 weeks.
+
+The first days of all fiscal periods (the 12 fiscal months) of the years covered by the month boundary tables of
+`calendar_math` are computed once per distinct calendar configuration and shared by all equal FiscalCalendars.
+Finding the fiscal year, quarter or period containing a date is then an O(1) table lookup.
+
+Examples:
+    >>> fiscal = FiscalCalendar(start_month=10)
+    >>> fiscal.span(datetime(2024, 11, 15), 'quarter')
+    (datetime.datetime(2024, 10, 1, 0, 0), datetime.datetime(2024, 12, 31, 23, 59, 59, 999999))
+    >>> fiscal.year_of(datetime(2024, 11, 15))
+    2025
+"""
+
+from __future__ import annotations
+
+from array import array
+from datetime import datetime
+
+from datespan import calendar_math as cm
+
+PATTERNS = {'445': (4, 4, 5), '454': (4, 5, 4), '544': (5, 4, 4)}
+"""The supported week patterns of retail calendars, the number of weeks of the three periods of each quarter."""
+
+UNITS = ('year', 'quarter', 'period')
+"""The fiscal units, a period is a fiscal month."""
+
+_PERIODS = {'year': 12, 'quarter': 3, 'period': 1}
+_METHODS = ('last', 'nearest')
+_LABELS = ('start', 'end')
+_TABLES: dict[tuple, array] = {}  # the period tables of all calendar configurations, shared by equal calendars
+
+
+class FiscalCalendar:
+    """
+    A fiscal calendar, used by the `Evaluator` to resolve fiscal expressions like 'fy', 'fq', 'fytd',
+    'this fiscal quarter' or 'last fiscal year'. Instances are immutable, hashable and compare equal
+    if their configuration is equal.
+    """
+    __slots__ = ('start_month', 'pattern', 'week_start', 'method', 'year_label', '_key', '_granularities')
+
+    def __init__(self, start_month: int = 1, pattern: str = None, week_start: int = 0, method: str = 'last',
+                 year_label: str = 'end'):
+        """
+        Arguments:
+            start_month: (optional) The month the fiscal year starts in, 1 (January, the default) to 12.
+            pattern: (optional) The week pattern of a retail calendar, '4-4-5', '4-5-4' or '5-4-4'. If not
+                defined, fiscal periods are calendar months. The 53rd week of long years is added to the
+                last period of the year.
+            week_start: (optional) The first day of the fiscal weeks of a retail calendar, Monday is 0
+                and Sunday is 6.
+            method: (optional) How a retail year ends, on the 'last' (default) last day of a week in the month
+                before `start_month`, or on the last day of a week 'nearest' to the end of that month.
+            year_label: (optional) Name fiscal years by the calendar year they 'end' (default) or 'start' in.
+
+        Errors:
+            ValueError: If an argument is not supported.
+
+        Examples:
+            >>> FiscalCalendar(start_month=2, pattern='4-4-5', week_start=6, method='nearest')  # NRF retail
+            FiscalCalendar(start_month=2, pattern='4-4-5', week_start=6, method='nearest', year_label='end')
+        """
+        if not isinstance(start_month, int) or not 1 <= start_month <= 12:
+            raise ValueError(f"Invalid fiscal start month '{start_month}', use 1 (January) to 12 (December).")
+        if pattern is not None:
+            pattern = str(pattern).replace('-', '')
+            if pattern not in PATTERNS:
+                raise ValueError(f"Unsupported fiscal week pattern '{pattern}', "
+                                 f"use one of '4-4-5', '4-5-4' or '5-4-4'.")
+        if not isinstance(week_start, int) or not 0 <= week_start <= 6:
+            raise ValueError(f"Invalid week start '{week_start}', use 0 (Monday) to 6 (Sunday).")
+        if method not in _METHODS:
+            raise ValueError(f"Unsupported fiscal year end method '{method}', use 'last' or 'nearest'.")
+        if year_label not in _LABELS:
+            raise ValueError(f"Unsupported fiscal year label '{year_label}', use 'start' or 'end'.")
+        self.start_month: int = start_month
+        self.pattern: str | None = pattern
+        self.week_start: int = week_start if pattern else 0
+        self.method: str = method if pattern else 'last'
+        self.year_label: str = year_label
+        self._key = (start_month, pattern, self.week_start, self.method)
+        if pattern:
+            grain = 'week' if week_start == 0 else 'day'
+            self._granularities = {'year': grain, 'quarter': grain, 'period': grain}
+        else:
+            quarters = (start_month - 1) % 3 == 0
+            self._granularities = {'year': 'year' if start_month == 1 else 'quarter' if quarters else 'month',
+                                   'quarter': 'quarter' if quarters else 'month', 'period': 'month'}
+
+    def __repr__(self):
+        pattern = None if self.pattern is None else '-'.join(self.pattern)
+        return (f"FiscalCalendar(start_month={self.start_month}, pattern={pattern!r}, "
+                f"week_start={self.week_start}, method={self.method!r}, year_label={self.year_label!r})")
+
+    def __eq__(self, other):
+        return (isinstance(other, FiscalCalendar) and self._key == other._key
+                and self.year_label == other.year_label)
+
+    def __hash__(self):
+        return hash((self._key, self.year_label))
+
+    # region lookups
+    def span(self, dt, unit: str = 'year', first: int = 0, last: int = 0) -> tuple[datetime, datetime]:
+        """
+        Returns the span of the fiscal years, quarters or periods from `first` to `last` relative to the one
+        containing the given date, e.g. `first=-2, last=-1` for the two fiscal quarters before the current one.
+
+        Arguments:
+            dt: A date or datetime.
+            unit: (optional) The fiscal unit, 'year' (default), 'quarter' or 'period'.
+            first: (optional) The offset of the first unit of the span.
+            last: (optional) The offset of the last unit of the span.
+
+        Returns:
+            A (start, end) tuple of naive datetimes.
+
+        Errors:
+            ValueError: If the unit is not supported or the span is outside the range of the tables.
+
+        Examples:
+            >>> FiscalCalendar(start_month=10).span(datetime(2024, 11, 15), 'year', -1, -1)  # last fiscal year
+            (datetime.datetime(2023, 10, 1, 0, 0), datetime.datetime(2024, 9, 30, 23, 59, 59, 999999))
+        """
+        size = self._size(unit)
+        index = self.period_index(dt) // size
+        starts = self._table()
+        begin, end = (index + first) * size, (index + last + 1) * size
+        if begin < 0 or end >= len(starts) or begin >= end:
+            raise ValueError(f"The fiscal {unit}s {first} to {last} relative to '{dt}' are out of range.")
+        return cm.calendar_span(datetime.fromordinal(starts[begin]),
+                                datetime.fromordinal(starts[end]) - cm.MICROSECOND, self._granularities[unit])
+
+    def start_of(self, dt, unit: str = 'year') -> datetime:
+        """
+        Returns the first day of the fiscal year, quarter or period containing the given date, e.g.
+        the start of 'fytd'.
+
+        Errors:
+            ValueError: If the unit is not supported or the date is outside the range of the tables.
+        """
+        size = self._size(unit)
+        return datetime.fromordinal(self._table()[self.period_index(dt) // size * size])
+
+    def year_of(self, dt) -> int:
+        """Returns the fiscal year containing the given date, named by the calendar year it starts or ends in."""
+        starts = self._table()
+        index = self.period_index(dt) // 12 * 12
+        return datetime.fromordinal(starts[index] if self.year_label == 'start' else starts[index + 12] - 1).year
+
+    def quarter_of(self, dt) -> int:
+        """Returns the fiscal quarter, 1 to 4, containing the given date."""
+        return self.period_index(dt) % 12 // 3 + 1
+
+    def period_of(self, dt) -> int:
+        """Returns the fiscal period (fiscal month), 1 to 12, containing the given date."""
+        return self.period_index(dt) % 12 + 1
+
+    def period_index(self, dt) -> int:
+        """
+        Returns the continuous index of the fiscal period containing the given date in the period table.
+        Consecutive periods have consecutive indexes, every 3rd period starts a quarter and every 12th a year.
+
+        Errors:
+            ValueError: If the date is outside the range of the tables.
+        """
+        starts = self._table()
+        ordinal = dt.toordinal()
+        if not starts[0] <= ordinal < starts[-1]:
+            raise ValueError(f"The date '{dt}' is outside the range of the fiscal calendar.")
+        # fiscal periods start within a few days of calendar months, the month is at most one period off
+        index = min(max((dt.year - cm.TABLE_FIRST_YEAR) * 12 + dt.month - self.start_month, 0), len(starts) - 2)
+        while starts[index] > ordinal:
+            index -= 1
+        while starts[index + 1] <= ordinal:
+            index += 1
+        return index
+    # endregion
+
+    # region period tables
+    def _size(self, unit: str) -> int:
+        """Returns the number of periods of a fiscal unit."""
+        try:
+            return _PERIODS[unit]
+        except KeyError:
+            raise ValueError(f"Unsupported fiscal unit '{unit}', use one of 'year', 'quarter' or 'period'.") from None
+
+    def _table(self) -> array:
+        """Returns the day ordinals of the first days of all fiscal periods, built once per configuration."""
+        table = _TABLES.get(self._key)
+        if table is None:
+            table = _TABLES.setdefault(self._key, self._build())
+        return table
+
+    def _build(self) -> array:
+        """
+        Returns the day ordinals of the first days of the fiscal periods of the fiscal years starting in
+        `start_month` of the years of the `calendar_math` tables, plus the day after the last period.
+        """
+        years = range(cm.TABLE_FIRST_YEAR, cm.TABLE_LAST_YEAR)
+        if self.pattern is None:
+            first = cm.TABLE_FIRST_YEAR * 12 + self.start_month - 1
+            return array('q', [cm.month_start(index).toordinal()
+                               for index in range(first, first + len(years) * 12 + 1)])
+        weeks = PATTERNS[self.pattern] * 4
+        year_starts = [self._year_start(year) for year in range(cm.TABLE_FIRST_YEAR, cm.TABLE_LAST_YEAR + 1)]
+        starts = []
+        for start in year_starts[:-1]:  # the last period of a year ends with the next year, incl. a 53rd week
+            for period_weeks in weeks:
+                starts.append(start)
+                start += period_weeks * 7
+        starts.append(year_starts[-1])
+        return array('q', starts)
+
+    def _year_start(self, year: int) -> int:
+        """Returns the day ordinal of the first day of the retail year starting around `start_month` of `year`."""
+        anchor = datetime(year, self.start_month, 1).toordinal()  # the day after the end of the previous month
+        offset = (anchor + 6 - self.week_start) % 7  # days since the start of the week containing the anchor
+        if self.method == 'last':
+            return anchor - offset
+        return anchor - offset if offset <= 3 else anchor + 7 - offset
+    # endregion
@@ -0,0 +1,120 @@
+# datespan - Copyright (c)2024, Thomas Zeutschler, MIT license
+
+"""
+Flyweight interning of calendar aligned DateSpans.
+
+Full days, months, quarters and years recur over and over when processing years of data. The intern pool
+returns a single shared `FrozenDateSpan` per (granularity, ordinal) key for such spans, e.g. ('day', 738886)
+or ('month', 24289). The pool holds weak references only, spans no longer used anywhere are released.
+Interning is disabled by default, use `configure(enabled=True)` to let DateSpanSets intern their spans.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from threading import Lock
+from weakref import WeakValueDictionary
+
+from datespan import calendar_math as cm
+from datespan.date_span import DateSpan, FrozenDateSpan
+
+
+def calendar_key(start: datetime, end: datetime) -> tuple[str, int] | None:
+    """
+    Returns the (granularity, ordinal) key for a naive span covering exactly one full day, month, quarter
+    or year, or None if the span is not calendar aligned. Granularities and ordinals are 'day' with the
+    day ordinal, 'month' with the continuous month index, 'quarter' with the continuous quarter index
+    and 'year' with the year.
+    """
+    if (end.microsecond != 999999 or end.second != 59 or end.minute != 59 or end.hour != 23 or
+            start.microsecond or start.second or start.minute or start.hour or start.tzinfo is not None):
+        return None
+    ordinal = start.toordinal()
+    last = end.toordinal()
+    if ordinal == last:
+        return 'day', ordinal
+    if start.day != 1 or end.day != cm.days_in_month(end.year, end.month):
+        return None
+    first = cm.month_index(start)
+    months = cm.month_index(end) - first + 1
+    if months == 1:
+        return 'month', first
+    if months == 3 and first % 3 == 0:
+        return 'quarter', first // 3
+    if months == 12 and first % 12 == 0:
+        return 'year', start.year
+    return None
+
+
+class InternPool:
+    """
+    A thread-safe pool of shared, immutable FrozenDateSpans for calendar aligned spans, keyed by
+    (granularity, ordinal). Only weak references are held.
+    """
+
+    def __init__(self):
+        self._spans: WeakValueDictionary = WeakValueDictionary()
+        self._lock = Lock()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def __len__(self):
+        return len(self._spans)
+
+    def __repr__(self):
+        return f"InternPool(size={len(self)}, hits={self.hits}, misses={self.misses})"
+
+    def intern(self, start: datetime, end: datetime) -> DateSpan:
+        """
+        Returns the shared FrozenDateSpan for a calendar aligned span, or a new DateSpan otherwise.
+
+        Arguments:
+            start: The start of the span, must not be larger than `end`.
+            end: The end of the span.
+        """
+        key = calendar_key(start, end)
+        if key is None:
+            return DateSpan.from_bounds(start, end)
+        span = self._spans.get(key)
+        if span is not None:
+            self.hits += 1
+            return span
+        with self._lock:
+            span = self._spans.get(key)
+            if span is None:
+                self.misses += 1
+                span = self._spans[key] = FrozenDateSpan.from_bounds(start, end)
+                span._grain = key[0]
+        return span
+
+    def intern_span(self, span: DateSpan) -> DateSpan:
+        """Returns the shared FrozenDateSpan for a calendar aligned DateSpan, or the DateSpan itself otherwise."""
+        if span.is_undefined or calendar_key(span.start, span.end) is None:
+            return span
+        return self.intern(span.start, span.end)
+
+    def clear(self):
+        """Removes all spans from the pool."""
+        with self._lock:
+            self._spans.clear()
+            self.hits = self.misses = 0
+
+
+POOL = InternPool()
+"""The shared intern pool, used by DateSpanSets if interning is enabled."""
+
+_enabled: bool = False
+
+
+def configure(enabled: bool = True):
+    """
+    Enables or disables the interning of calendar aligned spans by DateSpanSets. If enabled, full days,
+    months, quarters and years of a DateSpanSet are shared FrozenDateSpans that can not be modified.
+    """
+    global _enabled
+    _enabled = enabled
+
+
+def is_enabled() -> bool:
+    """Returns True if DateSpanSets intern calendar aligned spans."""
+    return _enabled
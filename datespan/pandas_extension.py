@@ -0,0 +1,168 @@
+# datespan - Copyright (c)2024, Thomas Zeutschler, MIT license
+
+"""
+A pandas extension type for date spans, backed by a `DateSpanArray`.
+
+Importing this module registers the 'datespan' dtype with pandas. The vectorized DateSpanArray of a Series
+is available through `series.array.spans`, e.g. `series.array.spans.full_month`.
+
+Examples:
+    >>> import datespan.pandas_extension
+    >>> series = pd.Series([DateSpan(datetime(2024, 1, 15)).full_month], dtype='datespan')
+    >>> series.array.spans.shift(months=1)
+    DateSpanArray([DateSpan(2024-02-01 00:00:00, 2024-02-29 23:59:59.999999)], length=1)
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+from pandas.api.extensions import ExtensionArray, ExtensionDtype, register_extension_dtype, take
+from pandas.api.indexers import check_array_indexer
+
+from datespan.date_span import DateSpan
+from datespan.date_span_array import NAT, DateSpanArray
+
+
+@register_extension_dtype
+class DateSpanDtype(ExtensionDtype):
+    """The pandas dtype of date spans, named 'datespan'. Missing values are undefined DateSpans."""
+    name = "datespan"
+    type = DateSpan
+    kind = "O"
+    na_value = None
+
+    @classmethod
+    def construct_array_type(cls):
+        return DateSpanExtensionArray
+
+
+class DateSpanExtensionArray(ExtensionArray):
+    """A pandas ExtensionArray of date spans, wrapping a DateSpanArray."""
+
+    def __init__(self, values):
+        """
+        Arguments:
+            values: A DateSpanArray, used without copying, or an iterable of DateSpans or None values.
+        """
+        if not isinstance(values, DateSpanArray):
+            values = DateSpanArray.from_spans(DateSpan.undefined() if _is_missing(value) else value
+                                              for value in values)
+        self._data: DateSpanArray = values
+
+    @property
+    def spans(self) -> DateSpanArray:
+        """Returns the underlying DateSpanArray for vectorized span operations."""
+        return self._data
+
+    @property
+    def dtype(self) -> DateSpanDtype:
+        return DateSpanDtype()
+
+    @property
+    def nbytes(self) -> int:
+        return self._data.nbytes
+
+    @classmethod
+    def _from_sequence(cls, scalars, *, dtype=None, copy=False) -> DateSpanExtensionArray:
+        if isinstance(scalars, DateSpanExtensionArray):
+            scalars = scalars._data
+        if isinstance(scalars, DateSpanArray):
+            return cls(scalars.copy() if copy else scalars)
+        return cls(scalars)
+
+    @classmethod
+    def _from_factorized(cls, values, original) -> DateSpanExtensionArray:
+        return cls(DateSpanArray.from_epoch_us([NAT if value is None else value[0] for value in values],
+                                               [NAT if value is None else value[1] for value in values],
+                                               tz=original._data.tz))
+
+    def _values_for_factorize(self) -> tuple[np.ndarray, None]:
+        values = np.empty(len(self), dtype=object)
+        values[:] = [None if start == NAT else (start, end)
+                     for start, end in zip(self._data.start_us.tolist(), self._data.end_us.tolist())]
+        return values, None
+
+    def _values_for_argsort(self) -> np.ndarray:
+        values = np.empty(len(self), dtype=[('start', np.int64), ('end', np.int64)])
+        values['start'], values['end'] = self._data.start_us, self._data.end_us
+        return values
+
+    def __len__(self):
+        return len(self._data)
+
+    def __getitem__(self, item):
+        if isinstance(item, (int, np.integer)):
+            span = self._data[item]
+            return None if span.is_undefined else span
+        item = check_array_indexer(self, item)
+        return DateSpanExtensionArray(self._data[item])
+
+    def __setitem__(self, key, value):
+        key = check_array_indexer(self, key)
+        if _is_missing(value):
+            self._data.start_us[key] = self._data.end_us[key] = NAT
+            return
+        if isinstance(value, DateSpan):
+            tz, start, end = value.tz, value.start_us, value.end_us
+        else:
+            value = self._from_sequence(value)._data
+            tz, start, end = value.tz, value.start_us, value.end_us
+        if (tz is None) != (self._data.tz is None):
+            raise ValueError("Naive and timezone-aware DateSpans can not be mixed in a DateSpanArray.")
+        self._data.start_us[key] = start
+        self._data.end_us[key] = end
+
+    def __iter__(self):
+        for span in self._data:
+            yield None if span.is_undefined else span
+
+    def __eq__(self, other):
+        if isinstance(other, (pd.Series, pd.Index, pd.DataFrame)):
+            return NotImplemented
+        if isinstance(other, DateSpanExtensionArray):
+            other = other._data
+        if isinstance(other, (DateSpan, DateSpanArray)):
+            return self._data == other
+        return np.zeros(len(self), dtype=bool)
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        values = np.empty(len(self), dtype=object)
+        values[:] = list(self)
+        return values
+
+    def isna(self) -> np.ndarray:
+        return self._data.is_undefined
+
+    def take(self, indices, *, allow_fill: bool = False, fill_value=None) -> DateSpanExtensionArray:
+        fill_start = fill_end = NAT
+        if allow_fill and not _is_missing(fill_value):
+            fill_start, fill_end = fill_value.start_us, fill_value.end_us
+        start = take(self._data.start_us, indices, allow_fill=allow_fill, fill_value=fill_start)
+        end = take(self._data.end_us, indices, allow_fill=allow_fill, fill_value=fill_end)
+        return DateSpanExtensionArray(DateSpanArray._join(start, end, self._data.tz))
+
+    def copy(self) -> DateSpanExtensionArray:
+        return DateSpanExtensionArray(self._data.copy())
+
+    def value_counts(self, dropna: bool = True) -> pd.Series:
+        start, end = self._data.start_us, self._data.end_us
+        if dropna:
+            defined = ~self._data.is_undefined
+            start, end = start[defined], end[defined]
+        values, counts = np.unique(np.stack([start, end], axis=1), axis=0, return_counts=True)
+        spans = DateSpanArray._join(values[:, 0].copy(), values[:, 1].copy(), self._data.tz)
+        return pd.Series(counts, index=pd.Index(DateSpanExtensionArray(spans)), name="count")
+
+    @classmethod
+    def _concat_same_type(cls, to_concat) -> DateSpanExtensionArray:
+        return cls(DateSpanArray.concat(array._data for array in to_concat))
+
+
+def _is_missing(value) -> bool:
+    """Returns True for None, NaN and undefined DateSpans."""
+    if value is None:
+        return True
+    if isinstance(value, DateSpan):
+        return value.is_undefined
+    return isinstance(value, float) and value != value
@@ -0,0 +1,66 @@
+# datespan - Copyright (c)2024, Thomas Zeutschler, MIT license
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Hashable
+
+
+class LRUCache:
+    """
+    A thread-safe, size bounded least recently used (LRU) cache with hit and miss counters.
+    """
+    _MISSING = object()
+
+    def __init__(self, maxsize: int = 4096):
+        """
+        Arguments:
+            maxsize: The maximum number of entries, the least recently used entries are evicted first.
+        """
+        if maxsize < 1:
+            raise ValueError(f"Cache size must be a positive integer, but is {maxsize}.")
+        self.maxsize: int = maxsize
+        self.hits: int = 0
+        self.misses: int = 0
+        self._data: OrderedDict = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def __repr__(self):
+        return f"LRUCache(maxsize={self.maxsize}, size={len(self)}, hits={self.hits}, misses={self.misses})"
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Returns the cached value for the given key or the default value if the key is not cached."""
+        with self._lock:
+            value = self._data.get(key, self._MISSING)
+            if value is self._MISSING:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        """Adds or replaces the value for the given key, evicts the least recently used entry if required."""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        """Removes all entries and resets the hit and miss counters."""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> dict:
+        """Returns the cache statistics as a dictionary with keys 'hits', 'misses', 'size' and 'maxsize'."""
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._data), 'maxsize': self.maxsize}
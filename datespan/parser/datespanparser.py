@@ -1,61 +1,116 @@
 # datespan - Copyright (c)2024, Thomas Zeutschler, MIT license
 
+from __future__ import annotations
+
+from datetime import date, datetime, tzinfo
+
+from dateutil.parser import parserinfo
+
+from datespan.business import BusinessCalendar
+from datespan.fiscal import FiscalCalendar
+from datespan.parser.cache import LRUCache
 from datespan.parser.errors import ParsingError
 from datespan.parser.evaluator import Evaluator
 from datespan.parser.lexer import Lexer
 from datespan.parser.parser import Parser
 
+AST_CACHE = LRUCache(maxsize=4096)
+"""The shared cache of tokenized and parsed texts, maps a key to a `(tokens, statements)` tuple."""
+
 
 class DateSpanParser:
     """
     The DateSpanParser class serves as the main interface. It takes an input string,
     tokenizes it, parses the tokens into an AST, and evaluates the AST to produce date spans.
+
+    Parsing is re-entrant, a single instance can be shared by multiple threads. Tokens and ASTs are immutable
+    and cached in the shared `AST_CACHE`, only the evaluation of relative dates is repeated on every call.
+    The instance keeps no state of `parse()` calls, results are only returned to the caller.
     """
 
-    def __init__(self, text):
-        self.text = str(text).strip()
-        self.lexer = None
-        self.parser = None
-        self.evaluator = None
+    def __init__(self, text=None, date_format: str = None, parser_info: parserinfo = None,
+                 fiscal_calendar: FiscalCalendar = None, business_calendar: BusinessCalendar = None):
+        """
+        Arguments:
+            text: (optional) The date span text to parse, if not passed to `parse()`.
+            date_format: (optional) Format hint for numeric dates, either 'ymd', 'dmy' or 'mdy'.
+                See `datespan.parser.numeric_dates.infer_date_format()` to infer the hint from sample data.
+            parser_info: (optional) A dateutil parserinfo instance used for parsing all other date literals.
+            fiscal_calendar: (optional) The FiscalCalendar for fiscal expressions like 'fy' or 'last fiscal year'.
+            business_calendar: (optional) The BusinessCalendar for expressions like 'last 10 business days'.
+        """
+        self.text = None if text is None else str(text).strip()
+        self.date_format = date_format
+        self.parser_info = parser_info
+        self.fiscal_calendar = fiscal_calendar
+        self.business_calendar = business_calendar
 
-    def parse(self) -> list:
+    def parse(self, text=None, as_of: datetime = None, tz: tzinfo = None) -> list:
         """
         Parses the input text and evaluates the date spans.
+
+        Arguments:
+            text: (optional) The text to parse. If not defined, the text passed to the constructor is parsed.
+            as_of: (optional) The date and time relative expressions like 'today' refer to. Defaults to now.
+            tz: (optional) A tzinfo or time zone name to evaluate the text in, see `Evaluator`.
+
+        Returns:
+            A list containing a list of `(start, end)` tuples for each statement of the text.
         """
-        if not self.text:
+        text = self.text if text is None else str(text).strip()
+        if not text:
             raise ParsingError('Input text cannot be empty.', line=1, column=0, token_value='')
 
-        try:
-            self.lexer = Lexer(self.text)
+        _, statements = self.compile(text)
+        evaluator = Evaluator(statements, date_format=self.date_format, parser_info=self.parser_info,
+                              as_of=as_of, tz=tz, fiscal_calendar=self.fiscal_calendar,
+                              business_calendar=self.business_calendar)
+        return evaluator.evaluate()
 
-            self.parser = Parser(self.lexer.tokens, self.text)
-            statements = self.parser.parse()
-
-            self.evaluator = Evaluator(statements)
-            self.evaluator.evaluate()
+    def compile(self, text: str) -> tuple:
+        """
+        Returns the immutable tokens and statements (AST) for the given text, either from the
+        shared AST cache or by tokenizing and parsing the text.
+        """
+        key = self._cache_key(text, self.parser_info)
+        result = AST_CACHE.get(key)
+        if result is None:
+            tokens = Lexer(text, self.parser_info).tokens
+            statements = Parser(tokens, text).parse()
+            result = (tokens, statements)
+            AST_CACHE.put(key, result)
+        return result
 
-            return self.evaluator.evaluated_spans
+    @classmethod
+    def is_compiled(cls, text, parser_info: parserinfo = None) -> bool:
+        """
+        Returns True if the tokens and AST for the given text are available in the shared AST cache,
+        so parsing the text requires evaluation only.
+        """
+        return cls._cache_key(str(text).strip(), parser_info) in AST_CACHE
 
-        except Exception as e:
-            raise e
+    @staticmethod
+    def _cache_key(text: str, parser_info: parserinfo) -> tuple:
+        # the current day is part of the key, as the lexer validates date literals against today
+        return text, parser_info, date.today()
 
     @property
     def tokens(self):
         """
-        Returns the list of tokens from the lexer.
+        Returns the tokens of the text passed to the constructor.
         """
-        return self.lexer.tokens if self.lexer else []
+        return self.compile(self.text)[0] if self.text else []
 
     @property
     def parse_tree(self):
         """
-        Returns the abstract syntax tree from the parser_old.
+        Returns the abstract syntax tree of the text passed to the constructor.
         """
-        return self.parser.ast if self.parser else None
+        return self.compile(self.text)[1] if self.text else None
 
     @property
     def date_spans(self):
         """
-        Returns the evaluated date spans from the evaluator.
+        Returns the date spans of the text passed to the constructor, evaluated as of now.
         """
-        return self.evaluator.evaluated_spans if self.evaluator else []
+        return self.parse() if self.text else []
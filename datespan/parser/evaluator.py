@@ -1,27 +1,70 @@
 # datespan - Copyright (c)2024, Thomas Zeutschler, MIT license
 
 import re
-from datetime import datetime, time, timedelta
+from datetime import datetime, time, timedelta, tzinfo
 
-import dateutil.parser
+from dateutil.parser import parserinfo
 from dateutil.relativedelta import relativedelta
 
+from datespan import calendar_math as cm
+from datespan.business import BusinessCalendar, WEEKDAYS
 from datespan.date_span import DateSpan
+from datespan.fiscal import FiscalCalendar
 from datespan.parser import MIN_YEAR, MAX_YEAR
 from datespan.parser.errors import EvaluationError, ParsingError
 from datespan.parser.lexer import Token, TokenType, Lexer
+from datespan.parser.literals import parse_literal
+from datespan.parser.numeric_dates import parse_numeric_date, validate_date_format
 from datespan.parser.parser import Parser
+from datespan.parser.triplet_table import TripletTable
+from datespan.timezones import resolve_zone, wall_clock
 
 
 class Evaluator:
     """
     The Evaluator class takes the AST produced by the parser_old and computes the actual date spans.
     It handles the logic of converting relative dates and special keywords into concrete date ranges.
-    """
 
-    def __init__(self, statements):
+    All date arithmetic is done on plain datetimes via `datespan.calendar_math`, the evaluator directly
+    returns the final `(start, end)` tuples without creating intermediate DateSpan objects.
+    """
+    _DAY = timedelta(days=1)
+    _EPSILON = timedelta(microseconds=DateSpan.TIME_EPSILON_MICROSECONDS)
+
+    FISCAL_UNITS = {'fiscal_year': 'year', 'fiscal_quarter': 'quarter', 'fiscal_period': 'period'}
+    """Maps the fiscal time units to the units of a `FiscalCalendar`."""
+
+    MONTH_NUMBERS = {'january': 1, 'february': 2, 'march': 3, 'april': 4, 'may': 5, 'june': 6, 'july': 7,
+                     'august': 8, 'september': 9, 'october': 10, 'november': 11, 'december': 12}
+
+    def __init__(self, statements, week_start: int = 0, date_format: str = None, parser_info: parserinfo = None,
+                 as_of: datetime = None, tz: tzinfo = None, fiscal_calendar: FiscalCalendar = None,
+                 business_calendar: BusinessCalendar = None):
+        """
+        Arguments:
+            statements: The statements (AST nodes) to evaluate.
+            week_start: (optional) The first day of the week, Monday is 0 and Sunday is 6.
+            date_format: (optional) Format hint for numeric dates, either 'ymd', 'dmy' or 'mdy'.
+            parser_info: (optional) A dateutil parserinfo instance used for parsing all other date literals.
+            as_of: (optional) The date and time relative expressions like 'today' refer to. Defaults to now.
+                Naive datetimes are wall-clock times of `tz`, if defined.
+            tz: (optional) A tzinfo or time zone name like 'Europe/Berlin'. If defined, expressions are evaluated
+                in wall-clock time of the time zone and return timezone-aware datetimes. Defaults to the
+                time zone of `as_of`.
+            fiscal_calendar: (optional) The FiscalCalendar for fiscal expressions like 'fy', 'fytd' or
+                'last fiscal quarter'. Defaults to fiscal years equal to calendar years.
+            business_calendar: (optional) The BusinessCalendar for expressions like 'last 10 business days' or
+                'every workday of last quarter'. Defaults to Monday to Friday without holidays.
+        """
+        validate_date_format(date_format)
         self.statements = statements  # List of statements (AST nodes)
-        self.today = datetime.today()  # Current date and time
+        self.tz = resolve_zone(tz) if tz is not None else (as_of.tzinfo if as_of is not None else None)
+        self.today = wall_clock(as_of, self.tz)  # Current date and time, in wall-clock time of tz
+        self.week_start = week_start  # First day of the week, Monday is 0 and Sunday is 6
+        self.date_format = date_format  # Format hint for numeric dates, 'ymd', 'dmy', 'mdy' or None
+        self.parser_info = parser_info  # dateutil parserinfo for all other date literals
+        self.fiscal_calendar = fiscal_calendar or _CALENDAR_YEARS  # fiscal years, quarters and periods
+        self.business_calendar = business_calendar or WEEKDAYS  # business days and holidays
         self.evaluated_spans = []  # Store evaluated date spans
 
     def evaluate(self):
@@ -36,12 +79,27 @@ class Evaluator:
                     spans = self.evaluate_node(node)
                     date_spans.extend(spans)
                 all_date_spans.append(date_spans)
+            if self.tz is not None:
+                all_date_spans = [[self._localize_span(span) for span in date_spans]
+                                  for date_spans in all_date_spans]
             self.evaluated_spans = all_date_spans
             return all_date_spans
         except Exception as e:
             # Raise an EvaluationError with details
             raise EvaluationError(str(e))
 
+    def _localize_span(self, span: tuple) -> tuple:
+        """Returns the (start, end) tuple localized to the evaluation time zone, keeping its granularity."""
+        start, end = span
+        granularity = cm.granularity_of(span) if start.tzinfo is None and end.tzinfo is None else None
+        return cm.calendar_span(self._localize(start), self._localize(end), granularity)
+
+    def _localize(self, dt: datetime) -> datetime:
+        """Returns the wall-clock datetime as a timezone-aware datetime of the evaluation time zone."""
+        if dt.tzinfo is None:
+            return dt.replace(tzinfo=self.tz)
+        return dt.astimezone(self.tz)
+
     def evaluate_node(self, node):
         """
         Evaluates a single AST node and returns the corresponding date spans.
@@ -72,49 +130,45 @@ class Evaluator:
     def evaluate_specific_date(self, date_str):
         """
         Evaluates a specific date string and returns the corresponding date span.
+        Numeric dates like '2024-03-15' or '15.03.2024' are parsed directly, all others by dateutil.
         """
+        if self.date_format is not None or self.parser_info is None or not self.parser_info.dayfirst:
+            try:
+                date = parse_numeric_date(date_str, self.date_format)
+            except ValueError as e:
+                raise EvaluationError(f"Invalid date '{date_str}'. {e}")
+            if date is not None:
+                return [cm.days_span(date, date)]
 
+        today = self.today.date()
         try:
             try:
-                date = dateutil.parser.parse(date_str)
+                date, granularity = parse_literal(date_str, self.parser_info, today)
             except ValueError:
                 # Parse the date string, allowing fuzzy parsing for complex formats
-                date = dateutil.parser.parse(date_str, fuzzy=True, fuzzy_with_tokens=False)
+                date, granularity = parse_literal(date_str, self.parser_info, today, fuzzy=True)
         except ValueError:
             raise EvaluationError(f"Invalid date '{date_str}'.")
-        start = date
-        end = date
-        if date.time() == time(0, 0):
+
+        if granularity == 'day':
             # If time is not specified, set the span to cover the entire day
-            start = datetime.combine(date.date(), time.min)
-            end = datetime.combine(date.date(), time.max)
-        elif ":" in date_str:
-            if "t" in date_str:
-                time_str = date_str.split("t")[1]
-            else:
-                time_str = date_str
-            contains_time_zone = time_str.count('+') == 1 or time_str.count('-') == 1
-            if contains_time_zone:
-                time_str = time_str.split('+')[0].split('-')[0]
-
-            defines_minutes_only = (time_str.count(':') == 1)  # e.g., '12:30'
-            if defines_minutes_only:
-                # If only hours and minutes are specified, set the span to cover the entire minute
-                start = datetime.combine(date.date(), date.time())
-                end = start + timedelta(minutes=1, microseconds=-1)
-            elif date.microsecond == 0:
-                # If seconds are specified, set the span to cover the entire second
-                start = datetime.combine(date.date(), date.time())
-                end = start + timedelta(seconds=1, microseconds=-1)
-
-        return [(start, end)]
+            return [cm.days_span(date, date)]
+        if granularity == 'minute':
+            # If only hours and minutes are specified, set the span to cover the entire minute
+            start = date.replace(tzinfo=None)
+            return [cm.calendar_span(start, start + cm.MINUTE - cm.MICROSECOND, 'minute')]
+        if granularity == 'second':
+            # If seconds are specified, set the span to cover the entire second
+            start = date.replace(tzinfo=None)
+            return [cm.calendar_span(start, start + cm.SECOND - cm.MICROSECOND, 'second')]
+        return [(date, date)]
 
     def evaluate_range(self, start_tokens, end_tokens):
         """
         Evaluates a date range specified by start and end tokens.
         """
         # Evaluate the start date expression
-        start_parser = Parser(start_tokens + [Token(TokenType.EOF)])
+        start_parser = Parser((*start_tokens, Token(TokenType.EOF)))
         try:
             start_ast_nodes = start_parser.parse_statement()
         except ParsingError as e:
@@ -130,7 +184,7 @@ class Evaluator:
         start_date = start_spans[0][0]
 
         # Evaluate the end date expression
-        end_parser = Parser(end_tokens + [Token(TokenType.EOF)])
+        end_parser = Parser((*end_tokens, Token(TokenType.EOF)))
         try:
             end_ast_nodes = end_parser.parse_statement()
         except ParsingError as e:
@@ -148,15 +202,18 @@ class Evaluator:
         # Handle case where only time is specified in end date
         if isinstance(end_date, time):
             end_date = datetime.combine(start_date.date(), end_date)
+            return [(start_date, end_date)]
 
-        return [(start_date, end_date)]
+        # e.g. 'January to March' is made of months, 'January to 2024-03-15' of days
+        granularity = cm.common_granularity(cm.granularity_of(start_spans[0]), cm.granularity_of(end_spans[0]))
+        return [cm.calendar_span(start_date, end_date, granularity)]
 
     def evaluate_since(self, tokens):
         """
         Evaluates a 'since' expression, calculating the date range from the specified date/time until now.
         """
         # Parse the date/time expression following 'since'
-        parser = Parser(tokens + [Token(TokenType.EOF)])
+        parser = Parser((*tokens, Token(TokenType.EOF)))
         try:
             ast_nodes = parser.parse_statement()
         except ParsingError as e:
@@ -186,7 +243,7 @@ class Evaluator:
             raise EvaluationError(f"Date of date span missing after "
                                   f"'since', 'after', 'before', or 'until'.")
 
-        parser = Parser(tokens + [Token(TokenType.EOF)])
+        parser = Parser((*tokens, Token(TokenType.EOF)))
         try:
             ast_nodes = parser.parse_statement()
         except ParsingError as e:
@@ -228,7 +285,7 @@ class Evaluator:
         Evaluates an iterative date expression and returns the corresponding date spans.
         """
         # Parse the period expression
-        period_parser = Parser(period_tokens + [Token(TokenType.EOF)])
+        period_parser = Parser((*period_tokens, Token(TokenType.EOF)))
         try:
             period_ast_nodes = period_parser.parse_statement()
         except ParsingError as e:
@@ -241,6 +298,9 @@ class Evaluator:
             raise EvaluationError(f'Failed to evaluate period in iterative expression: {e}')
         if not period_spans:
             raise EvaluationError('Failed to evaluate period in iterative expression')
+        if any(token.type == TokenType.TIME_UNIT and token.value == 'business_day' for token in tokens):
+            # e.g. 'every workday of last quarter', the runs of business days from the bitmap of the calendar
+            return [run for start, end in period_spans for run in self.business_calendar.spans(start, end)]
         period_start = period_spans[0][0]
         period_end = period_spans[0][1]
 
@@ -270,14 +330,10 @@ class Evaluator:
                     # Check if current date is the nth occurrence in the month
                     for ord_value in ordinals:
                         if self.is_nth_weekday_of_month(current_date, ord_value):
-                            start = datetime.combine(current_date.date(), time.min)
-                            end = datetime.combine(current_date.date(), time.max)
-                            date_spans.append((start, end))
+                            date_spans.append(cm.days_span(current_date, current_date))
                 else:
                     # No ordinal specified, include all matching weekdays
-                    start = datetime.combine(current_date.date(), time.min)
-                    end = datetime.combine(current_date.date(), time.max)
-                    date_spans.append((start, end))
+                    date_spans.append(cm.days_span(current_date, current_date))
             current_date += timedelta(days=1)
         return date_spans
 
@@ -408,69 +464,47 @@ class Evaluator:
         """
         Evaluates a special date expression and returns the corresponding date span.
         """
+        now = self.today
         if value == 'yesterday':
-            return DateSpan.yesterday().to_tuple_list()
+            day = now.toordinal() - 1
+            return [cm.ordinal_span(day, day)]
         elif value == 'today':
-            return DateSpan.today().to_tuple_list()
+            return [cm.days_span(now, now)]
         elif value == 'tomorrow':
-            return DateSpan.tomorrow().to_tuple_list()
+            day = now.toordinal() + 1
+            return [cm.ordinal_span(day, day)]
         elif value == 'now':
-            return DateSpan.now().to_tuple_list()
+            return [(now, now)]
 
         elif value == 'ltm':  # last 12 month
             if date_spans:
                 date_spans.sort()
                 base = date_spans[-1][1]  # latest end date
-                span = DateSpan(base).shift_start(years=-1)
-                return span.to_tuple_list()
-            return DateSpan().ltm.to_tuple_list()
-        elif value == 'ytd':
-            if date_spans:
-                date_spans.sort()
-                base = date_spans[-1][1]  # latest end date
-                span = DateSpan(DateSpan(base).full_year.start, base)
-                return span.to_tuple_list()
-            return DateSpan().ytd.to_tuple_list()
-        elif value == 'qtd':
-            if date_spans:
-                date_spans.sort()
-                base = date_spans[-1][1]  # latest end date
-                span = DateSpan(DateSpan(base).full_quarter.start, base)
-                return span.to_tuple_list()
-            return DateSpan().qtd.to_tuple_list()
-        elif value == 'mtd':
+                return [(cm.add_months(base, -12), base)]
+            start, end = cm.days_span(now, now)
+            return [(cm.add_months(start, -12) + self._DAY, end)]
+        elif value in ['ytd', 'qtd', 'mtd', 'wtd', 'fytd', 'fqtd']:
             if date_spans:
                 date_spans.sort()
                 base = date_spans[-1][1]  # latest end date
-                span = DateSpan(DateSpan(base).full_month.start, base)
-                return span.to_tuple_list()
-            return DateSpan().mtd.to_tuple_list()
-        elif value == 'wtd':
-            if date_spans:
-                date_spans.sort()
-                base = date_spans[-1][1]  # latest end date
-                span = DateSpan(DateSpan(base).full_week.start, base)
-                return span.to_tuple_list()
-            return DateSpan().wtd.to_tuple_list()
+                end = base
+            else:
+                base = now
+                end = cm.day_end(now)
+            return [(self._period_start(base, value), end)]
 
         # catch the following single words as specials
-        elif value == 'week':
-            return DateSpan.now().full_week.to_tuple_list()
-        elif value == 'month':
-            return DateSpan.now().full_month.to_tuple_list()
-        elif value == 'year':
-            return DateSpan.now().full_year.to_tuple_list()
-        elif value == 'quarter':
-            return DateSpan.now().full_quarter.to_tuple_list()
-        elif value == 'hour':
-            return DateSpan.now().full_hour.to_tuple_list()
-        elif value == 'minute':
-            return DateSpan.now().full_minute.to_tuple_list()
-        elif value == 'second':
-            return DateSpan.now().full_second.to_tuple_list()
-        elif value == 'millisecond':
-            return DateSpan.now().full_millisecond.to_tuple_list()
-
+        elif value in ['week', 'month', 'year', 'quarter', 'hour', 'minute', 'second', 'millisecond',
+                       'fiscal_year', 'fiscal_quarter', 'fiscal_period', 'business_day']:
+            return self._this(now, value)
+        elif value == 'fy':
+            return [self.fiscal_calendar.span(now, 'year')]
+        elif value == 'fq':
+            return [self.fiscal_calendar.span(now, 'quarter')]
+        elif value == 'pfy':
+            return [self.fiscal_calendar.span(now, 'year', -1, -1)]
+        elif value == 'nfy':
+            return [self.fiscal_calendar.span(now, 'year', 1, 1)]
 
         elif value in ['q1', 'q2', 'q3', 'q4']:
             year = 0
@@ -484,23 +518,47 @@ class Evaluator:
 
             # Specific quarter
             if year == 0:
-                year = DateSpan.now().start.year
-            quarter = int(value[1])
-            month = 3 * (quarter - 1) + 1
-            return DateSpan(datetime(year=year, month=month, day=1)).full_quarter.to_tuple_list()
-        elif value == 'py':
-            return DateSpan.now().shift(years=-1).full_year.to_tuple_list()
+                year = now.year
+            quarter = year * 4 + int(value[1]) - 1
+            return [cm.quarters_span(quarter, quarter)]
+        elif value in ['py', 'ly']:
+            return [cm.years_span(now.year - 1, now.year - 1)]
         elif value == 'cy':
-            return DateSpan.now().full_year.to_tuple_list()
+            return [cm.years_span(now.year, now.year)]
         elif value == 'ny':
-            return DateSpan.now().shift(years=1).full_year.to_tuple_list()
-        elif value == 'ly':
-            return DateSpan.now().shift(years=-1).full_year.to_tuple_list()
+            return [cm.years_span(now.year + 1, now.year + 1)]
         else:
             return []
 
+    def _period_start(self, base: datetime, value: str) -> datetime:
+        """
+        Returns the beginning of the year, quarter, month or week containing `base` for
+        the to-date specials 'ytd', 'qtd', 'mtd', 'wtd', 'fytd' and 'fqtd'.
+        """
+        if value == 'ytd':
+            return datetime(base.year, 1, 1)
+        if value == 'qtd':
+            return cm.month_start(cm.quarter_index(base) * 3)
+        if value == 'mtd':
+            return datetime(base.year, base.month, 1)
+        if value == 'fytd':
+            return self.fiscal_calendar.start_of(base, 'year')
+        if value == 'fqtd':
+            return self.fiscal_calendar.start_of(base, 'quarter')
+        return datetime.fromordinal(cm.week_start_ordinal(base, self.week_start))
+
     def evaluate_triplet(self, triplet: str):
+        """
+        Evaluates a triplet like 'r3m', 'l4q' or 'n2w' using the shared resolution table of the current day.
+        """
+        table = TripletTable.get(self.today.date(), self.week_start)
+        span = table.resolve(triplet, self.today, self.calculate_triplet)
+        return [] if span is None else [span]
 
+    def calculate_triplet(self, triplet: str):
+        """
+        Calculates the date span of a triplet like 'r3m', 'l4q' or 'n2w'.
+        """
         if not ((triplet[0] in ['r', 'p', 'l', 'n']) and
                 (triplet[-1] in ['d', 'w', 'm', 'q', 'y']) and
                 (triplet[1:-1].isdigit())):
@@ -579,17 +637,13 @@ class Evaluator:
         date_spans = []
         for month_name in months:
             # Get the month number from the month name
-            month_number = datetime.strptime(month_name[:3], '%b').month
+            month_number = self.MONTH_NUMBERS[month_name]
             if day == 0:
-                from_date = datetime(int(year), month_number, 1)
-                to_date = from_date + relativedelta(months=1, days=-1)
+                month = int(year) * 12 + month_number - 1
+                date_spans.append(cm.months_span(month, month))
             else:
-                from_date = datetime(int(year), month_number, day)
-                to_date = from_date
-
-            start = datetime.combine(from_date.date(), time.min)
-            end = datetime.combine(to_date.date(), time.max)
-            date_spans.append((start, end))
+                day_date = datetime(int(year), month_number, day)
+                date_spans.append(cm.days_span(day_date, day_date))
 
         if special_token is not None:
             date_spans = self.evaluate_special(special_token.value, date_spans)
@@ -615,22 +669,10 @@ class Evaluator:
             idx += 1
         date_spans = []
 
+        week_start = cm.week_start_ordinal(self.today, self.week_start)
         for day_name in days:
-            if day_name == 'monday':
-                span = DateSpan().monday
-            elif day_name == 'tuesday':
-                span = DateSpan().tuesday
-            elif day_name == 'wednesday':
-                span = DateSpan().wednesday
-            elif day_name == 'thursday':
-                span = DateSpan().thursday
-            elif day_name == 'friday':
-                span = DateSpan().friday
-            elif day_name == 'saturday':
-                span = DateSpan().saturday
-            elif day_name == 'sunday':
-                span = DateSpan().sunday
-            date_spans.append((span.start, span.end))
+            day = week_start + (self.weekday_name_to_num(day_name) - self.week_start) % 7
+            date_spans.append(cm.ordinal_span(day, day))
         return date_spans
 
     def calculate_rolling(self, number, unit):
@@ -639,24 +681,25 @@ class Evaluator:
         'rolling 3 months': Refers to a rolling 3-month window, starting from today’s date.
         Note: Rolling and past are synonyms.
         """
+        now = self.today
         if unit == 'month':  # most used units first
-            return DateSpan.now().shift_start(months=-number).to_tuple_list()
+            return [(cm.add_months(now, -number), now)]
         elif unit == 'year':
-            return DateSpan.now().shift_start(years=-number).to_tuple_list()
+            return [(cm.add_months(now, -number * 12), now)]
         elif unit == 'quarter':
-            return DateSpan.now().shift_start(months=-number * 3).to_tuple_list()
+            return [(cm.add_months(now, -number * 3), now)]
         elif unit == 'week':
-            return DateSpan.now().shift(weeks=-1).full_week.shift_start(weeks=number - 1).to_tuple_list()
+            return [(now - timedelta(weeks=number), now)]
         elif unit == 'day':
-            return DateSpan.now().shift_start(days=-number).to_tuple_list()
+            return [(now - timedelta(days=number), now)]
         elif unit == 'hour':
-            return DateSpan.now().shift_start(hours=-number).to_tuple_list()
+            return [(now - timedelta(hours=number), now)]
         elif unit == 'minute':
-            return DateSpan.now().shift_start(minutes=-number).to_tuple_list()
+            return [(now - timedelta(minutes=number), now)]
         elif unit == 'second':
-            return DateSpan.now().shift_start(seconds=-number).to_tuple_list()
+            return [(now - timedelta(seconds=number), now)]
         elif unit == 'millisecond':
-            return DateSpan.now().shift_start(microseconds=-number * 1000).to_tuple_list()
+            return [self._collapse(now - timedelta(milliseconds=number), now)]
         else:
             return []
 
@@ -664,53 +707,85 @@ class Evaluator:
         """
         Calculates the previous period(s) based on the specified number and unit, e.g.
         'previous 3 months': Refers to the full 3 calendar months immediately before the current month.
-        Note: Previous and last are synonyms.
+        Note: Previous and last are synonyms. Zero periods, e.g. 'last 0 days', return no spans.
         """
+        if number < 1:
+            return []
+        now = self.today
         if unit == 'month':  # most used units first
-            return DateSpan.today().shift(months=-1).full_month.shift_start(months=-(number - 1)).to_tuple_list()
+            month = cm.month_index(now)
+            return [cm.months_span(month - number, month - 1)]
         elif unit == 'year':
-            return DateSpan.today().shift(years=-1).full_year.shift_start(years=-(number - 1)).to_tuple_list()
+            return [cm.years_span(now.year - number, now.year - 1)]
         elif unit == 'quarter':
-            return DateSpan.today().shift(months=-3).full_quarter.shift_start(months=-(number - 1) * 3).to_tuple_list()
+            quarter = cm.quarter_index(now)
+            return [cm.quarters_span(quarter - number, quarter - 1)]
         elif unit == 'week':
-            return DateSpan.today().shift(weeks=-1).full_week.shift_start(weeks=-(number - 1)).to_tuple_list()
+            return [cm.weeks_span(now, -number, -1, self.week_start)]
         elif unit == 'day':
-            return DateSpan.yesterday().shift_start(days=-(number - 1)).to_tuple_list()
+            today = now.toordinal()
+            return [cm.ordinal_span(today - number, today - 1)]
         elif unit == 'hour':
-            return DateSpan.now().shift(hours=-1).full_hour.shift_start(hours=-(number - 1)).to_tuple_list()
+            base = cm.floor_hour(now)
+            return [cm.calendar_span(base - timedelta(hours=number), base - cm.MICROSECOND, 'hour')]
         elif unit == 'minute':
-            return DateSpan.now().shift(minutes=-1).full_minute.shift_start(minutes=-(number - 1)).to_tuple_list()
+            base = cm.floor_minute(now)
+            return [cm.calendar_span(base - timedelta(minutes=number), base - cm.MICROSECOND, 'minute')]
         elif unit == 'second':
-            return DateSpan.now().shift(seconds=-1).full_second.shift_start(seconds=-(number - 1)).to_tuple_list()
+            base = cm.floor_second(now)
+            return [cm.calendar_span(base - timedelta(seconds=number), base - cm.MICROSECOND, 'second')]
         elif unit == 'millisecond':
-            return DateSpan.now().shift(microseconds=-1000).full_millisecond.shift_start(
-                microseconds=-(number - 1) * 1000).to_tuple_list()
+            base = cm.floor_millisecond(now)
+            return [self._collapse(base - timedelta(milliseconds=number), base - cm.MICROSECOND)]
+        elif unit in self.FISCAL_UNITS:
+            return [self.fiscal_calendar.span(now, self.FISCAL_UNITS[unit], -number, -1)]
+        elif unit == 'business_day':
+            calendar = self.business_calendar
+            return calendar.spans(cm.day_start(calendar.shift(now, -number)), cm.day_start(now) - cm.MICROSECOND)
         else:
             return []
 
     def calculate_future(self, number, unit):
         """
         Calculates a future date range based on the specified number and unit.
+        Zero periods, e.g. 'next 0 days', return no spans.
         """
+        if number < 1:
+            return []
+        now = self.today
         if unit == 'day':
-            return DateSpan.today().shift(days=1).shift_end(days=(number - 1)).to_tuple_list()
+            today = now.toordinal()
+            return [cm.ordinal_span(today + 1, today + number)]
         elif unit == 'week':
-            return DateSpan.today().shift(weeks=1).full_week.shift_end(weeks=(number - 1)).to_tuple_list()
+            return [cm.weeks_span(now, 1, number, self.week_start)]
         elif unit == 'month':
-            return DateSpan.today().shift(months=1).full_month.shift_end(months=(number - 1)).to_tuple_list()
+            month = cm.month_index(now)
+            return [cm.months_span(month + 1, month + number)]
         elif unit == 'year':
-            return DateSpan.today().shift(years=1).full_year.shift_end(years=(number - 1)).to_tuple_list()
+            return [cm.years_span(now.year + 1, now.year + number)]
         elif unit == 'quarter':
-            return DateSpan.today().shift(months=3).full_quarter.shift_end(months=(number - 1) * 3).to_tuple_list()
+            quarter = cm.quarter_index(now)
+            return [cm.quarters_span(quarter + 1, quarter + number)]
         elif unit == 'hour':
-            return DateSpan.now().shift(hours=1).full_hour.shift_end(hours=number - 1).to_tuple_list()
+            base = cm.floor_hour(now)
+            return [cm.calendar_span(base + cm.HOUR, base + timedelta(hours=number + 1) - cm.MICROSECOND, 'hour')]
         elif unit == 'minute':
-            return DateSpan.now().shift(minutes=1).full_minute.shift_end(minutes=number - 1).to_tuple_list()
+            base = cm.floor_minute(now)
+            return [cm.calendar_span(base + cm.MINUTE, base + timedelta(minutes=number + 1) - cm.MICROSECOND,
+                                     'minute')]
         elif unit == 'second':
-            return DateSpan.now().shift(seconds=1).full_second.shift_end(seconds=number - 1).to_tuple_list()
+            base = cm.floor_second(now)
+            return [cm.calendar_span(base + cm.SECOND, base + timedelta(seconds=number + 1) - cm.MICROSECOND,
+                                     'second')]
         elif unit == 'millisecond':
-            return DateSpan.now().shift(microseconds=1000).full_millisecond.shift_end(
-                microseconds=(number - 1) * 1000).to_tuple_list()
+            base = cm.floor_millisecond(now)
+            return [self._collapse(base + cm.MILLISECOND,
+                                   base + timedelta(milliseconds=number + 1) - cm.MICROSECOND)]
+        elif unit in self.FISCAL_UNITS:
+            return [self.fiscal_calendar.span(now, self.FISCAL_UNITS[unit], 1, number)]
+        elif unit == 'business_day':
+            calendar = self.business_calendar
+            return calendar.spans(cm.day_end(now) + cm.MICROSECOND, cm.day_end(calendar.shift(now, number)))
         else:
             return []
 
@@ -718,47 +793,69 @@ class Evaluator:
         """
         Calculates the date range for the current period specified by the unit (day, week, month, year, quarter).
         """
-        base = DateSpan.now()
+        base = self.today
         if ordinal > 0:
-            base = DateSpan(base.ytd.start)
+            base = datetime(base.year, 1, 1)
             if unit == 'day':
-                base = base.shift(days=ordinal - 1)
+                base = base + timedelta(days=ordinal - 1)
             elif unit == 'week':
-                base = base.shift(weeks=ordinal - 1)
+                base = base + timedelta(weeks=ordinal - 1)
             elif unit == 'month':
-                base = base.shift(months=ordinal - 1)
+                base = cm.add_months(base, ordinal - 1)
             elif unit == 'year':
-                base = base.shift(years=ordinal - 1)
+                base = base.replace(year=base.year + ordinal - 1)
             elif unit == 'quarter':
-                base = base.shift(months=(ordinal - 1) * 3)
+                base = cm.add_months(base, (ordinal - 1) * 3)
             elif unit == 'hour':
-                base = base.shift(hours=ordinal - 1)
+                base = base + timedelta(hours=ordinal - 1)
             elif unit == 'minute':
-                base = base.shift(minutes=ordinal - 1)
+                base = base + timedelta(minutes=ordinal - 1)
             elif unit == 'second':
-                base = base.shift(seconds=ordinal - 1)
+                base = base + timedelta(seconds=ordinal - 1)
+        return self._this(base, unit)
 
+    def _this(self, base: datetime, unit: str) -> list:
+        """
+        Returns the full period of the given unit (day, week, month, ..., millisecond) containing `base`.
+        """
         if unit == 'day':
-            return base.full_day.to_tuple_list()
+            return [cm.days_span(base, base)]
         elif unit == 'week':
-            return base.full_week.to_tuple_list()
+            return [cm.weeks_span(base, 0, 0, self.week_start)]
         elif unit == 'month':
-            return base.full_month.to_tuple_list()
+            month = cm.month_index(base)
+            return [cm.months_span(month, month)]
         elif unit == 'year':
-            return base.full_year.to_tuple_list()
+            return [cm.years_span(base.year, base.year)]
         elif unit == 'quarter':
-            return base.full_quarter.to_tuple_list()
+            quarter = cm.quarter_index(base)
+            return [cm.quarters_span(quarter, quarter)]
         elif unit == 'hour':
-            return base.full_hour.to_tuple_list()
+            return [cm.calendar_span(cm.floor_hour(base), base.replace(minute=59, second=59, microsecond=999999),
+                                     'hour')]
         elif unit == 'minute':
-            return base.full_minute.to_tuple_list()
+            return [cm.calendar_span(cm.floor_minute(base), base.replace(second=59, microsecond=999999), 'minute')]
         elif unit == 'second':
-            return base.full_second.to_tuple_list()
+            return [cm.calendar_span(cm.floor_second(base), base.replace(microsecond=999999), 'second')]
         elif unit == 'millisecond':
-            return base.full_millisecond.to_tuple_list()
+            start = cm.floor_millisecond(base)
+            return [(start, start.replace(microsecond=start.microsecond + 999))]
+        elif unit in self.FISCAL_UNITS:
+            return [self.fiscal_calendar.span(base, self.FISCAL_UNITS[unit])]
+        elif unit == 'business_day':
+            return self.business_calendar.spans(cm.day_start(base), cm.day_end(base))
         else:
             return []
 
+    def _collapse(self, start: datetime, end: datetime) -> tuple[datetime, datetime]:
+        """
+        Collapses spans shorter than DateSpan.TIME_EPSILON_MICROSECONDS into a single point in time,
+        same as DateSpan.shift_start() and DateSpan.shift_end() do.
+        """
+        if end - start <= self._EPSILON:
+            return start, start
+        return start, end
+
     def calculate_nth_in_period(self, ordinal, unit):
         """
         Calculates the date for the nth weekday in the specified period (e.g., '1st Monday in March').
@@ -785,3 +882,6 @@ class Evaluator:
                 return []
         else:
             return [(period_start, period_end)]
+
+
+_CALENDAR_YEARS = FiscalCalendar()  # the default fiscal calendar, fiscal years are calendar years
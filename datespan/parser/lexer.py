@@ -1,10 +1,12 @@
 # datespan - Copyright (c)2024, Thomas Zeutschler, MIT license
 
 import re
+from typing import Any, NamedTuple
 
-from dateutil import parser as dateutil_parser
+from dateutil.parser import parserinfo
 
 from datespan.parser.errors import ParsingError
+from datespan.parser.literals import parse_literal
 
 
 class Lexer:
@@ -70,6 +72,15 @@ class Lexer:
 
     # Aliases for time units
     TIME_UNIT_ALIASES = {
+        'business day': 'business_day',
+        'business days': 'business_day',
+        'working day': 'business_day',
+        'working days': 'business_day',
+        'workday': 'business_day',
+        'workdays': 'business_day',
+        'bday': 'business_day',
+        'bdays': 'business_day',
+
         'd': 'day',
         'day': 'day',
         'days': 'day',
@@ -120,6 +131,15 @@ class Lexer:
         'millisecond': 'millisecond',
         'milliseconds': 'millisecond',
 
+        'fiscal year': 'fiscal_year',
+        'fiscal years': 'fiscal_year',
+        'fiscal quarter': 'fiscal_quarter',
+        'fiscal quarters': 'fiscal_quarter',
+        'fiscal period': 'fiscal_period',
+        'fiscal periods': 'fiscal_period',
+        'fiscal month': 'fiscal_period',
+        'fiscal months': 'fiscal_period',
+
         'μs': 'microsecond',
         'microsec': 'microsecond',
         'microsecs': 'microsecond',
@@ -146,6 +166,14 @@ class Lexer:
         'ny': 'ny',  # next year
         'ly': 'py',  # last year
 
+        'fy': 'fy',  # current fiscal year
+        'fq': 'fq',  # current fiscal quarter
+        'fytd': 'fytd',  # fiscal year to date
+        'fqtd': 'fqtd',  # fiscal quarter to date
+        'pfy': 'pfy',  # previous fiscal year
+        'lfy': 'pfy',  # last fiscal year
+        'nfy': 'nfy',  # next fiscal year
+
         'q1': 'q1',
         'q2': 'q2',
         'q3': 'q3',
@@ -258,11 +286,12 @@ class Lexer:
         ('MISMATCH', r'.'),  # Any other character
     ]
 
-    def __init__(self, text):
+    def __init__(self, text, parser_info: parserinfo = None):
         """
-        Initializes the Lexer with the input text.
+        Initializes the Lexer with the input text and an optional dateutil parserinfo for date literals.
         """
         self.text = text.lower()  # Convert input text to lowercase for case-insensitive matching
+        self.parser_info = parser_info
         self.tokens = []
         self.tokenize()
 
@@ -296,7 +325,7 @@ class Lexer:
                 if kind == 'MISMATCH':
                     # let's try if the entire text is a datetime
                     try:
-                        result = dateutil_parser.parse(self.text)
+                        parse_literal(self.text, self.parser_info)
                         kind = 'DATETIME'
                         value = self.text
                         token = self.create_token(kind, value, line, column)
@@ -330,6 +359,7 @@ class Lexer:
                 value = self.text[pos]
                 raise ParsingError(f"Unexpected character '{value}'", line, column, value)
         self.tokens.append(Token(TokenType.EOF, line=line, column=column))
+        self.tokens = tuple(self.tokens)
 
     def create_token(self, kind, value, line, column):
         """
@@ -397,16 +427,15 @@ class TokenType:
     UNKNOWN = 'UNKNOWN'  # For any unrecognized tokens
 
 
-class Token:
+class Token(NamedTuple):
     """
-    A simple Token structure with type, value, and position information.
+    An immutable Token structure with type, value, and position information.
+    Tokens are shared between parsers and threads through the AST cache and must never be modified.
     """
-
-    def __init__(self, type_, value=None, line=1, column=1):
-        self.type = type_
-        self.value = value  # The actual value of the token (e.g., 'Monday', '1st')
-        self.line = line
-        self.column = column
+    type: str
+    value: Any = None  # The actual value of the token (e.g., 'Monday', '1st')
+    line: int = 1
+    column: int = 1
 
     def __repr__(self):
         return f'Token({self.type}, "{self.value}", Line: {self.line}, Column: {self.column})'
@@ -0,0 +1,71 @@
+# datespan - Copyright (c)2024, Thomas Zeutschler, MIT license
+
+"""
+Memoized parsing of date and time literals like 'Dec 31 2023 23:59' through dateutil.
+
+Results are stored in a shared, size bounded LRU cache keyed by the literal, the dateutil parserinfo
+instance, the current day and the fuzzy flag. The current day is part of the key, as dateutil fills
+missing date parts of a literal like '10:30' or 'Dec 31' from today's date. Parsing errors are cached too.
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime
+
+import dateutil.parser
+from dateutil.parser import parserinfo
+
+from datespan.parser.cache import LRUCache
+
+LITERAL_CACHE = LRUCache(maxsize=4096)
+"""The shared cache of parsed literals, maps a key to a `(datetime, granularity)` tuple or a ValueError."""
+
+
+def parse_literal(text: str, parser_info: parserinfo = None, today: date = None,
+                  fuzzy: bool = False) -> tuple[datetime, str]:
+    """
+    Parses a date or time literal using dateutil and infers the granularity defined by the literal.
+
+    Arguments:
+        text: The lower case literal to parse, e.g. '2024-01-01' or 'dec 31 2023 23:59'.
+        parser_info: (optional) The dateutil parserinfo to use.
+        today: (optional) The current day, used for date parts missing in the literal. Defaults to today.
+        fuzzy: (optional) If True, unknown tokens in the literal are ignored.
+
+    Returns:
+        A tuple of the parsed datetime and its granularity, either 'day', 'minute', 'second' or 'instant'.
+
+    Errors:
+        ValueError: If the literal is not a valid date or time.
+    """
+    if today is None:
+        today = date.today()
+    key = (text, parser_info, today, fuzzy)
+    result = LITERAL_CACHE.get(key)
+    if result is None:
+        try:
+            dt = dateutil.parser.parse(text, parser_info, default=datetime(today.year, today.month, today.day),
+                                       fuzzy=fuzzy)
+            result = (dt, _granularity(text, dt))
+        except ValueError as e:
+            result = e
+        LITERAL_CACHE.put(key, result)
+    if isinstance(result, ValueError):
+        raise ValueError(*result.args)
+    return result
+
+
+def _granularity(text: str, dt: datetime) -> str:
+    """Returns the granularity defined by a literal, e.g. '12:30' defines an entire minute."""
+    if dt.hour == 0 and dt.minute == 0 and dt.second == 0 and dt.microsecond == 0:
+        return 'day'
+    if ":" in text:
+        time_str = text.split("t")[1] if "t" in text else text
+        contains_time_zone = time_str.count('+') == 1 or time_str.count('-') == 1
+        if contains_time_zone:
+            time_str = time_str.split('+')[0].split('-')[0]
+        if time_str.count(':') == 1:  # e.g., '12:30'
+            return 'minute'
+        if dt.microsecond == 0:
+            return 'second'
+    return 'instant'
@@ -0,0 +1,114 @@
+# datespan - Copyright (c)2024, Thomas Zeutschler, MIT license
+
+"""
+Strict parser for purely numeric dates like '2024-03-15', '2024/3/5', '15.03.2024' or '03/15/2024',
+as matched by the `DATE` token of the Lexer. Parsing is done by a single regular expression match and
+integer conversion, without calling dateutil.
+
+Ambiguous day/month orders can be resolved by a date format hint, which can be inferred once from a
+sample of values of the same source (e.g. a column of a CSV file) and then reused for all values.
+"""
+
+from __future__ import annotations
+
+import re
+from datetime import datetime
+from typing import Iterable
+
+DATE_FORMATS = ('ymd', 'dmy', 'mdy')
+"""The supported date format hints: year-month-day, day-month-year and month-day-year."""
+
+# The two alternatives of `Lexer.DATE_PATTERN`, anchored to the entire text.
+_YEAR_FIRST = re.compile(r'(\d{4})[-/](\d{1,2})[-/](\d{1,2})')
+_YEAR_LAST = re.compile(r'(\d{1,2})[./-](\d{1,2})[./-](\d{4})')
+
+
+def validate_date_format(date_format: str | None):
+    """Raises a ValueError if the given date format hint is not supported."""
+    if date_format is not None and date_format not in DATE_FORMATS:
+        raise ValueError(f"Invalid date format '{date_format}'. Supported formats are {', '.join(DATE_FORMATS)}.")
+
+
+def parse_numeric_date(text: str, date_format: str | None = None) -> datetime | None:
+    """
+    Parses a purely numeric date string into a datetime at midnight.
+
+    Arguments:
+        text: The date string to parse, e.g. '2024-03-15' or '15.03.2024'.
+        date_format: (optional) The date format hint, one of 'ymd', 'dmy' or 'mdy'. If not defined, the
+            year-first format is read as year-month-day, and for the year-last format the day comes first
+            if it is greater than 12, otherwise the month comes first. Same as the dateutil defaults.
+
+    Returns:
+        The parsed datetime or None if the text is not a numeric date.
+
+    Errors:
+        ValueError: If the text is a numeric date, but not a valid date or not in the given date format.
+    """
+    match = _YEAR_FIRST.fullmatch(text)
+    if match is not None:
+        if date_format is not None and date_format != 'ymd':
+            raise ValueError(f"Date '{text}' does not match date format '{date_format}'.")
+        year, month, day = match.groups()
+    else:
+        match = _YEAR_LAST.fullmatch(text)
+        if match is None:
+            return None
+        first, second, year = match.groups()
+        if date_format is None:
+            date_format = 'dmy' if int(first) > 12 else 'mdy'
+        if date_format == 'dmy':
+            day, month = first, second
+        elif date_format == 'mdy':
+            month, day = first, second
+        else:
+            raise ValueError(f"Date '{text}' does not match date format '{date_format}'.")
+    return datetime(int(year), int(month), int(day))
+
+
+def infer_date_format(samples: Iterable[str], max_samples: int = 1000) -> str | None:
+    """
+    Infers the date format hint from a sample of numeric date strings of the same source.
+
+    Arguments:
+        samples: The date strings to inspect, e.g. the first rows of a column. Non-numeric values are ignored.
+        max_samples: (optional) The maximum number of samples to inspect.
+
+    Returns:
+        'ymd' if all numeric dates start with the year, 'dmy' or 'mdy' if at least one date unambiguously
+        defines the day/month order, or None if the samples do not define the format.
+
+    Errors:
+        ValueError: If the samples contain contradicting date formats.
+
+    Examples:
+        >>> infer_date_format(['01.02.2024', '28.02.2024'])
+        'dmy'
+    """
+    year_first = ambiguous = False
+    orders = set()
+    for i, text in enumerate(samples):
+        if i >= max_samples:
+            break
+        text = str(text).strip()
+        if _YEAR_FIRST.fullmatch(text):
+            year_first = True
+            continue
+        match = _YEAR_LAST.fullmatch(text)
+        if match is None:
+            continue
+        first, second = int(match.group(1)), int(match.group(2))
+        if first > 12 >= second:
+            orders.add('dmy')
+        elif second > 12 >= first:
+            orders.add('mdy')
+        else:
+            ambiguous = True  # e.g. '01.02.2024'
+
+    if len(orders) > 1:
+        raise ValueError("Samples contain contradicting date formats: dmy, mdy.")
+    if year_first and (orders or ambiguous):
+        raise ValueError("Samples contain both year-first and year-last date formats.")
+    if year_first:
+        return 'ymd'
+    return orders.pop() if orders else None
@@ -1,5 +1,7 @@
 # datespan - Copyright (c)2024, Thomas Zeutschler, MIT license
 
+from types import MappingProxyType
+
 from datespan.parser.errors import ParsingError
 from datespan.parser.lexer import Token, TokenType, Lexer
 
@@ -14,10 +16,13 @@ class ASTNode:
 class DateSpanNode(ASTNode):
     """
     Represents a date span node in the AST, which can be a specific date, relative period, or range.
+    Nodes are immutable, token lists are stored as tuples and the value dictionary is read-only.
     """
+    __slots__ = ('value',)
 
     def __init__(self, value):
-        self.value = value  # Dictionary containing details about the date span
+        # Read-only dictionary containing details about the date span
+        self.value = MappingProxyType({k: tuple(v) if isinstance(v, list) else v for k, v in value.items()})
 
     def __str__(self):
         return f"DateSpanNode({self.value})"
@@ -96,10 +101,10 @@ class Parser:
             # add remaining tokens
             if self.pos < len(self.tokens) - 1:
                 node = statements[-1][-1].value
-                if 'tokens' not in node:
-                    node['tokens'] = []
-                node["tokens"].extend(self.tokens[self.pos:-1])
+                tokens = (*node.get('tokens', ()), *self.tokens[self.pos:-1])
+                statements[-1][-1] = DateSpanNode({**node, 'tokens': tokens})
 
+            statements = tuple(tuple(date_spans) for date_spans in statements)
             self.ast = statements
             return statements
         except Exception as e:
@@ -164,8 +169,9 @@ class Parser:
         elif self.current_token.type == TokenType.TIME_UNIT:
             if len(self.tokens) <= 2 and self.tokens[-1].type == TokenType.EOF:
                 # single word month, quarter, year, week, hour, minute, second or millisecond, handle as specials
-                self.current_token.type = TokenType.SPECIAL
-                return self.special_date_span()
+                token = self.current_token
+                self.eat(TokenType.TIME_UNIT)
+                return DateSpanNode({'type': 'special', 'value': token.value})
             return self.relative_date_span()
         else:
             raise ParsingError(
@@ -0,0 +1,89 @@
+# datespan - Copyright (c)2024, Thomas Zeutschler, MIT license
+
+from __future__ import annotations
+
+from datetime import date, datetime
+from threading import Lock
+
+from datespan.parser.cache import LRUCache
+
+
+class TripletTable:
+    """
+    Resolution table for triplets like 'r3m', 'l4q' or 'n2w' valid for a single day and week start.
+
+    Triplets are resolved lazily on first use and then served by a dict lookup. Previous and next triplets
+    ('l', 'p' and 'n') are stored as final `(start, end)` tuples. Rolling triplets ('r') end at the current
+    point in time, so only the date of their start is stored and combined with the time of day on lookup.
+
+    Tables are shared across all Evaluator instances through `TripletTable.get()` and kept in a small LRU
+    cache, so evaluating alternating days, e.g. for several time zones, does not rebuild them. Lookups in a
+    table are lock-free, updates of a table are serialized by a lock.
+    """
+    MAX_TABLES = 16
+    """The maximum number of (day, week start) tables kept, the least recently used are evicted first."""
+    _tables: LRUCache = LRUCache(MAX_TABLES)
+    _lock = Lock()
+
+    def __init__(self, as_of: date, week_start: int = 0):
+        self.as_of: date = as_of
+        self.week_start: int = week_start
+        self._spans: dict[str, tuple[datetime, datetime]] = {}
+        self._rolling: dict[str, date] = {}
+
+    def __len__(self):
+        return len(self._spans) + len(self._rolling)
+
+    def __repr__(self):
+        return f"TripletTable({self.as_of}, week_start={self.week_start}) := {len(self)} triplets"
+
+    @classmethod
+    def get(cls, as_of: date, week_start: int = 0) -> TripletTable:
+        """
+        Returns the shared resolution table for the given day and week start.
+        The least recently used tables are evicted if more than `MAX_TABLES` tables exist.
+        """
+        key = (as_of, week_start)
+        table = cls._tables.get(key)
+        if table is None:
+            with cls._lock:
+                table = cls._tables.get(key)
+                if table is None:
+                    table = TripletTable(as_of, week_start)
+                    cls._tables.put(key, table)
+        return table
+
+    @classmethod
+    def clear(cls):
+        """Removes all shared resolution tables."""
+        cls._tables.clear()
+
+    def resolve(self, triplet: str, now: datetime, compute) -> tuple[datetime, datetime] | None:
+        """
+        Returns the `(start, end)` tuple for the given triplet, e.g. 'r3m', at the point in time `now`,
+        or None if the triplet has no span, e.g. 'l0d'.
+
+        Arguments:
+            triplet: The lower case triplet to resolve.
+            now: The current point in time, must be on the day of the table.
+            compute: A callable `compute(triplet)` returning the date spans for the triplet at `now`,
+                called on the first lookup of a triplet only.
+        """
+        span = self._spans.get(triplet)
+        if span is not None:
+            return span
+        start = self._rolling.get(triplet)
+        if start is not None:
+            return now.replace(year=start.year, month=start.month, day=start.day), now
+
+        spans = compute(triplet)
+        if not spans:
+            return None
+        span = spans[0]
+        with self._lock:
+            if triplet[0] == 'r':
+                # rolling windows end now, only the start date is independent of the time of day
+                self._rolling[triplet] = span[0].date()
+            else:
+                self._spans[triplet] = span
+        return span
@@ -0,0 +1,221 @@
+# datespan - Copyright (c)2024, Thomas Zeutschler, MIT license
+
+"""
+Spans as inclusive ranges of integer ticks of a time resolution, e.g. days or seconds since 1970-01-01.
+
+DateSpanSets with a resolution coarser than microseconds keep their spans as `TickSpans`, two packed int64
+arrays of the first and last tick of each span, instead of (start, end) datetime tuples. Spans are widened
+to full ticks, so merge, subtract and intersect are exact integer operations without the +/- 1 microsecond
+boundary logic of DateSpans. Timezone-aware spans are counted in wall-clock time of their time zone.
+
+Examples:
+    >>> spans = TickSpans.from_tuples([(datetime(2024, 1, 1, 10), datetime(2024, 1, 3, 8))], 'day')
+    >>> list(spans.starts), list(spans.ends)
+    ([19723], [19725])
+"""
+
+from __future__ import annotations
+
+import heapq
+from array import array
+from datetime import datetime, tzinfo
+
+from datespan import calendar_math as cm
+from datespan.date_span import DateSpan, FrozenDateSpan
+from datespan.timezones import TransitionTable
+
+RESOLUTIONS = {'us': 1, 'ms': 1_000, 's': 1_000_000, 'day': cm.DAY_US}
+"""The supported resolutions and the length of their ticks in microseconds."""
+
+_GRANULARITIES = {'s': 'second', 'day': 'day'}
+
+
+def resolution_unit(resolution: str) -> int:
+    """
+    Returns the length of a tick of the given resolution in microseconds.
+
+    Errors:
+        ValueError: If the resolution is not one of 'us', 'ms', 's' or 'day'.
+    """
+    try:
+        return RESOLUTIONS[resolution]
+    except (KeyError, TypeError):
+        raise ValueError(f"Unsupported resolution '{resolution}', use one of "
+                         f"{', '.join(map(repr, RESOLUTIONS))}.") from None
+
+
+def max_gap(unit: int) -> int:
+    """
+    Returns the largest number of missing ticks between two spans that are still merged, the
+    DateSpan.TIME_EPSILON_MICROSECONDS in whole ticks, e.g. 99 milliseconds and 0 seconds or days.
+    """
+    return (DateSpan.TIME_EPSILON_MICROSECONDS - 1) // unit
+
+
+class TickSpans:
+    """
+    Sorted and merged spans as inclusive ranges of ticks, `starts[i]` to `ends[i]`. Instances are treated as
+    immutable, all operations return new TickSpans of the same resolution and time zone.
+    """
+    __slots__ = ('starts', 'ends', 'resolution', 'unit', 'tz')
+
+    def __init__(self, starts: array, ends: array, resolution: str, tz: tzinfo = None):
+        """
+        Arguments:
+            starts: The first tick of each span, sorted and not overlapping.
+            ends: The last tick of each span.
+            resolution: The resolution of the ticks, 'us', 'ms', 's' or 'day'.
+            tz: (optional) The time zone of timezone-aware spans, ticks count its wall-clock time.
+        """
+        self.starts: array = starts
+        self.ends: array = ends
+        self.resolution: str = resolution
+        self.unit: int = resolution_unit(resolution)
+        self.tz: tzinfo | None = tz
+
+    @classmethod
+    def from_tuples(cls, tuples, resolution: str, tz: tzinfo = None, wall_us=()) -> TickSpans:
+        """
+        Returns the sorted and merged ticks of (start, end) tuples, each widened to full ticks.
+
+        Arguments:
+            tuples: An iterable of (start, end) datetime tuples.
+            resolution: The resolution of the ticks, 'us', 'ms', 's' or 'day'.
+            tz: (optional) The time zone of timezone-aware datetimes, datetimes of other time zones
+                are converted to it.
+            wall_us: (optional) The (start, end) wall-clock microseconds of further naive spans, e.g. the
+                `start_us` and `end_us` of DateSpans.
+
+        Errors:
+            ValueError: If naive and timezone-aware datetimes are mixed.
+        """
+        unit = resolution_unit(resolution)
+        bounds = [(_wall_us(start, tz) // unit, _wall_us(end, tz) // unit) for start, end in tuples]
+        if wall_us:
+            if tz is not None:
+                raise ValueError(_MIXED)
+            bounds.extend((start // unit, end // unit) for start, end in wall_us)
+        bounds.sort()
+        return cls._merged(bounds, resolution, tz)
+
+    @classmethod
+    def _merged(cls, bounds, resolution: str, tz: tzinfo) -> TickSpans:
+        """Returns TickSpans of sorted (first, last) tick ranges, merging overlapping and consecutive ranges."""
+        gap = max_gap(resolution_unit(resolution)) + 1
+        starts, ends = [], []
+        end = None
+        for first, last in bounds:
+            if end is not None and first - end <= gap:
+                if last > end:
+                    end = ends[-1] = last
+            else:
+                starts.append(first)
+                ends.append(last)
+                end = last
+        return cls(array('q', starts), array('q', ends), resolution, tz)
+
+    def __len__(self):
+        return len(self.starts)
+
+    @property
+    def nbytes(self) -> int:
+        """Returns the number of bytes of the tick arrays."""
+        return (len(self.starts) + len(self.ends)) * self.starts.itemsize
+
+    # region set algebra
+    def union(self, other: TickSpans) -> TickSpans:
+        """Returns the spans of both TickSpans, merged."""
+        bounds = heapq.merge(zip(self.starts, self.ends), zip(other.starts, other.ends))
+        return self._merged(bounds, self.resolution, self.tz)
+
+    def intersect(self, other: TickSpans) -> TickSpans:
+        """Returns the ticks contained in both TickSpans."""
+        starts, ends = [], []
+        a_starts, a_ends = self.starts.tolist(), self.ends.tolist()
+        b_starts, b_ends = other.starts.tolist(), other.ends.tolist()
+        i = j = 0
+        a_count, b_count = len(a_starts), len(b_starts)
+        while i < a_count and j < b_count:
+            a_end, b_end = a_ends[i], b_ends[j]
+            first = max(a_starts[i], b_starts[j])
+            last = a_end if a_end < b_end else b_end
+            if first <= last:
+                starts.append(first)
+                ends.append(last)
+            if a_end < b_end:
+                i += 1
+            else:
+                j += 1
+        return TickSpans(array('q', starts), array('q', ends), self.resolution, self.tz)
+
+    def subtract(self, other: TickSpans) -> TickSpans:
+        """Returns the ticks of this TickSpans not contained in `other`."""
+        starts, ends = [], []
+        b_starts, b_ends = other.starts.tolist(), other.ends.tolist()
+        b_count = len(b_starts)
+        j = 0
+        for first, last in zip(self.starts.tolist(), self.ends.tolist()):
+            while j < b_count and b_ends[j] < first:
+                j += 1
+            k = j
+            while k < b_count and b_starts[k] <= last:
+                if b_starts[k] > first:
+                    starts.append(first)
+                    ends.append(b_starts[k] - 1)
+                first = max(first, b_ends[k] + 1)
+                k += 1
+            if first <= last:
+                starts.append(first)
+                ends.append(last)
+        return TickSpans(array('q', starts), array('q', ends), self.resolution, self.tz)
+    # endregion
+
+    # region conversions
+    def bounds(self, index: int) -> tuple[datetime, datetime]:
+        """Returns the (start, end) datetimes of the span at the given index."""
+        unit = self.unit
+        start = cm.from_epoch_us(self.starts[index] * unit)
+        end = cm.from_epoch_us((self.ends[index] + 1) * unit - 1)
+        if self.tz is not None:
+            start, end = start.replace(tzinfo=self.tz), end.replace(tzinfo=self.tz)
+        return cm.calendar_span(start, end, _GRANULARITIES.get(self.resolution))
+
+    def to_tuples(self) -> list[tuple[datetime, datetime]]:
+        """Returns the (start, end) datetimes of all spans."""
+        return [self.bounds(index) for index in range(len(self.starts))]
+
+    def to_half_open(self) -> list[tuple[datetime, datetime]]:
+        """Returns the start and the exclusive end, the start of the next tick, of all spans."""
+        unit, tz = self.unit, self.tz
+        return [(cm.from_epoch_us(first * unit).replace(tzinfo=tz),
+                 cm.from_epoch_us((last + 1) * unit).replace(tzinfo=tz))
+                for first, last in zip(self.starts, self.ends)]
+
+    def to_spans(self) -> list[FrozenDateSpan]:
+        """Returns immutable FrozenDateSpans of all spans, their datetimes are created on first access."""
+        unit, tz = self.unit, self.tz
+        bounds = [(first * unit, (last + 1) * unit - 1) for first, last in zip(self.starts, self.ends)]
+        if tz is not None:
+            table = TransitionTable.get(tz)
+            bounds = [(table.to_utc(start), table.to_utc(end)) for start, end in bounds]
+        granularity = _GRANULARITIES.get(self.resolution)
+        spans = [FrozenDateSpan.from_epoch_us(start, end, tz) for start, end in bounds]
+        if granularity is not None:
+            for span in spans:
+                span._grain = granularity
+        return spans
+    # endregion
+
+
+_MIXED = "Naive and timezone-aware spans can not be mixed in a DateSpanSet with a resolution."
+
+
+def _wall_us(dt: datetime, tz: tzinfo | None) -> int:
+    """Returns the wall-clock microseconds of a naive datetime, or of an aware datetime in the time zone `tz`."""
+    if (dt.tzinfo is None) != (tz is None):
+        raise ValueError(_MIXED)
+    if tz is None:
+        return cm.to_epoch_us(dt)
+    if dt.tzinfo is not tz:
+        dt = dt.astimezone(tz)
+    return cm.to_epoch_us(dt.replace(tzinfo=None))
@@ -0,0 +1,306 @@
+# datespan - Copyright (c)2024, Thomas Zeutschler, MIT license
+
+"""
+Cached UTC offset transition tables of time zones.
+
+A `TransitionTable` holds the UTC offsets of a time zone as sorted integer arrays of microseconds since
+1970-01-01, built on first use for the years looked up and shared by all callers. Converting between UTC and
+wall-clock time is then a binary search, or a single vectorized `numpy.searchsorted()` call for many values,
+instead of a `zoneinfo` lookup per datetime.
+"""
+
+from __future__ import annotations
+
+import time
+from array import array
+from bisect import bisect_right
+from datetime import datetime, timedelta, timezone, tzinfo
+from threading import Lock
+
+from datespan import calendar_math as cm
+
+_SECOND_US = 1_000_000
+_VECTORIZE_MIN = 64  # below that many values, bisecting is faster than converting to numpy arrays
+_MIN_US = cm.to_epoch_us(datetime.min)  # the microseconds of the supported datetime range
+_MAX_US = cm.to_epoch_us(datetime.max)
+_LAST_PROBE_US = cm.to_epoch_us(datetime(9999, 12, 30))  # the last UTC instant probed, any offset keeps it in range
+
+
+def resolve_zone(tz) -> tzinfo | None:
+    """
+    Returns a tzinfo for the given time zone, either a tzinfo instance or an IANA time zone name
+    like 'Europe/Berlin', which is resolved through `zoneinfo`. Returns None for None.
+
+    Errors:
+        ValueError: If the time zone name is unknown.
+    """
+    if tz is None or isinstance(tz, tzinfo):
+        return tz
+    if isinstance(tz, str):
+        from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+        try:
+            return ZoneInfo(tz)
+        except (ZoneInfoNotFoundError, ValueError) as e:
+            raise ValueError(f"Unknown time zone '{tz}'. {e}")
+    raise ValueError(f"Objects of type '{type(tz)}' are not supported as time zone.")
+
+
+def wall_clock(as_of: datetime | None, tz: tzinfo | None) -> datetime:
+    """
+    Returns the naive wall-clock time of `as_of`, or of now, in the given time zone. Naive `as_of`
+    datetimes are already wall-clock times and returned as they are.
+    """
+    if tz is None:
+        return datetime.today() if as_of is None else as_of.replace(tzinfo=None)
+    if as_of is not None and as_of.tzinfo is None:
+        return as_of
+    utc_us = time.time_ns() // 1000 if as_of is None else cm.to_epoch_us(as_of)
+    wall_us, _ = TransitionTable.get(tz).to_wall(utc_us)
+    return cm.from_epoch_us(wall_us)
+
+
+class TransitionTable:
+    """
+    The UTC offsets of a single time zone, stored as segments with a constant offset. Segments start at the
+    UTC instant of each offset transition. Tables are shared per time zone, use `TransitionTable.get(tz)`.
+    Only the years actually looked up are built, so tables may cover several blocks of consecutive years.
+    """
+    _tables: dict = {}
+    _lock = Lock()
+
+    def __init__(self, tz: tzinfo):
+        self.tz: tzinfo = tz
+        # the (starts, offsets) of the segments of each covered year, replaced as a whole when years are added
+        self._years: dict[int, tuple[array, array]] = {}
+        # UTC microseconds covered by the table, as (starts, ends) of the blocks of consecutive years, end exclusive
+        self._blocks: tuple[list[int], list[int]] = ([], [])
+        # (starts, offsets, wall_starts, previous) arrays of all covered years, replaced as a whole when years
+        # are added: UTC microseconds of the start of each segment, the UTC offset of each segment in
+        # microseconds, the wall-clock microseconds of the start of each segment (resolving like fold=0) and
+        # the UTC offset before each segment, which is the offset of the segment itself where a block starts.
+        self._segments: tuple[array, array, array, array] = (array('q'), array('q'), array('q'), array('q'))
+
+    def __repr__(self):
+        years = ", ".join(f"{cm.from_epoch_us(max(start, _MIN_US)).year}..{cm.from_epoch_us(end - 1).year}"
+                          for start, end in zip(*self._blocks))
+        return f"TransitionTable({self.tz}, years={years or None}, segments={len(self)})"
+
+    def __len__(self):
+        return len(self._segments[0])
+
+    @classmethod
+    def get(cls, tz) -> TransitionTable:
+        """Returns the shared transition table for the given tzinfo or time zone name."""
+        table = cls._tables.get(tz)
+        if table is None:
+            tz = resolve_zone(tz)
+            table = cls._tables.get(tz)
+            if table is None:
+                with cls._lock:
+                    table = cls._tables.get(tz)
+                    if table is None:
+                        table = cls._tables[tz] = TransitionTable(tz)
+        return table
+
+    @classmethod
+    def clear(cls):
+        """Removes all cached transition tables."""
+        with cls._lock:
+            cls._tables.clear()
+
+    # region building
+    def _offset_at(self, utc_us: int) -> int:
+        """Returns the UTC offset in microseconds at the given UTC instant, computed by the tzinfo itself."""
+        dt = self.tz.fromutc((cm.EPOCH + timedelta(microseconds=utc_us)).replace(tzinfo=self.tz))
+        return dt.utcoffset() // cm.MICROSECOND
+
+    def _ensure(self, years):
+        """Builds the table for all of the given years that are not yet covered."""
+        missing = {min(max(year, 2), 9999) for year in years}.difference(self._years)
+        if not missing:
+            return
+        with self._lock:
+            built = dict(self._years)
+            for year in missing:
+                if year not in built:
+                    built[year] = self._build(year)
+            self._join(built)
+
+    def _build(self, year: int) -> tuple[array, array]:
+        """Returns the (starts, offsets) of the segments of a single year, the first one starts on January 1st."""
+        starts, offsets = array('q'), array('q')
+        us = cm.to_epoch_us(datetime(year, 1, 1))
+        stop = cm.to_epoch_us(datetime(year + 1, 1, 1)) if year < 9999 else _LAST_PROBE_US
+        offset = self._offset_at(us)
+        starts.append(us)
+        offsets.append(offset)
+        if not isinstance(self.tz, timezone):  # fixed offset zones have no transitions
+            while us < stop:
+                following = us + cm.DAY_US
+                new_offset = self._offset_at(following)
+                if new_offset != offset:
+                    # bisect the transition to the second, transitions never happen within a second
+                    low, high = us // _SECOND_US, following // _SECOND_US
+                    while high - low > 1:
+                        middle = (low + high) // 2
+                        if self._offset_at(middle * _SECOND_US) == offset:
+                            low = middle
+                        else:
+                            high = middle
+                    starts.append(high * _SECOND_US)
+                    offsets.append(new_offset)
+                    offset = new_offset
+                us = following
+        return starts, offsets
+
+    def _join(self, years: dict[int, tuple[array, array]]):
+        """Joins the segments of the given years into blocks of consecutive years and publishes them."""
+        starts, offsets, wall_starts, previous = array('q'), array('q'), array('q'), array('q')
+        block_starts, block_ends = [], []
+        for year in sorted(years):
+            year_starts, year_offsets = years[year]
+            first = _MIN_US if year == 2 else cm.to_epoch_us(datetime(year, 1, 1))
+            end = _MAX_US + 1 if year == 9999 else cm.to_epoch_us(datetime(year + 1, 1, 1))
+            if block_ends and block_ends[-1] == first:
+                # continues the block of the previous year, which ends with the offset of January 1st
+                block_ends[-1] = end
+                before, skip = offsets[-1], 1
+            else:
+                block_starts.append(first)
+                block_ends.append(end)
+                before, skip = year_offsets[0], 0
+            for i in range(skip, len(year_starts)):
+                starts.append(year_starts[i])
+                offsets.append(year_offsets[i])
+                wall_starts.append(year_starts[i] + max(before, year_offsets[i]))
+                previous.append(before)
+                before = year_offsets[i]
+        self._segments = (starts, offsets, wall_starts, previous)
+        self._years = years
+        self._blocks = (block_starts, block_ends)
+
+    def _covers(self, low_us: int, high_us: int) -> bool:
+        """Returns True if the range of UTC microseconds is covered by a single block of the table."""
+        block_starts, block_ends = self._blocks
+        i = bisect_right(block_starts, low_us) - 1
+        return i >= 0 and high_us < block_ends[i]
+
+    def _ensure_us(self, low_us: int, high_us: int):
+        """Builds the table for the years of the given range of (UTC or wall-clock) microseconds, +/- a day."""
+        low_us = max(low_us - cm.DAY_US, _MIN_US)
+        high_us = min(high_us + cm.DAY_US, _MAX_US)
+        if not self._covers(low_us, high_us):
+            self._ensure(range(cm.from_epoch_us(low_us).year, cm.from_epoch_us(high_us).year + 1))
+
+    def _ensure_values(self, values, np=None):
+        """
+        Builds the table for the years of all given (UTC or wall-clock) microseconds, +/- a day, but not for
+        the years in between them. `values` is a numpy int64 array if `np` is given, otherwise a sequence.
+        """
+        low_us = max(int(values.min() if np else min(values)) - cm.DAY_US, _MIN_US)
+        high_us = min(int(values.max() if np else max(values)) + cm.DAY_US, _MAX_US)
+        if self._covers(low_us, high_us):
+            return
+        if np is None:
+            years = {cm.from_epoch_us(min(max(int(us) + shift, _MIN_US), _MAX_US)).year
+                     for us in values for shift in (-cm.DAY_US, cm.DAY_US)}
+        else:
+            shifted = np.clip(np.concatenate((values - cm.DAY_US, values + cm.DAY_US)), _MIN_US, _MAX_US)
+            years = (np.unique(shifted.astype('datetime64[us]').astype('datetime64[Y]').astype(np.int64)) + 1970)
+            years = years.tolist()
+        self._ensure(years)
+    # endregion
+
+    # region single values
+    def utc_offset(self, utc_us: int) -> int:
+        """Returns the UTC offset in microseconds at the given UTC instant in microseconds since 1970-01-01."""
+        self._ensure_us(utc_us, utc_us)
+        starts, offsets, _, _ = self._segments
+        return offsets[max(bisect_right(starts, utc_us) - 1, 0)]
+
+    def to_utc(self, wall_us: int) -> int:
+        """
+        Returns the UTC microseconds for wall-clock microseconds of the time zone. Ambiguous and
+        non-existent wall-clock times resolve like `fold=0` does for datetimes. Results beyond the supported
+        datetime range are clamped to it.
+        """
+        self._ensure_us(wall_us, wall_us)
+        _, offsets, wall_starts, _ = self._segments
+        offset = offsets[max(bisect_right(wall_starts, wall_us) - 1, 0)]
+        return _clamp(wall_us - offset, offset)
+
+    def to_wall(self, utc_us: int) -> tuple[int, int]:
+        """
+        Returns the wall-clock microseconds of the time zone and the fold for the given UTC microseconds.
+        The fold is 1 for the second occurrence of a repeated wall-clock time, otherwise 0. Results beyond the
+        supported datetime range are clamped to it.
+        """
+        self._ensure_us(utc_us, utc_us)
+        starts, offsets, _, previous = self._segments
+        i = max(bisect_right(starts, utc_us) - 1, 0)
+        offset = offsets[i]
+        fold = 1 if i > 0 and utc_us - starts[i] < previous[i] - offset else 0
+        return _clamp(utc_us + offset), fold
+
+    def to_datetime(self, utc_us: int) -> datetime:
+        """Returns the timezone-aware datetime for the given UTC microseconds."""
+        wall_us, fold = self.to_wall(utc_us)
+        return (cm.EPOCH + timedelta(microseconds=wall_us)).replace(tzinfo=self.tz, fold=fold)
+    # endregion
+
+    # region vectorized
+    def utc_offsets(self, utc_us):
+        """
+        Returns the UTC offsets in microseconds for a sequence of UTC microseconds. Returns a numpy int64 array
+        for larger sequences if numpy is installed, otherwise a list.
+        """
+        return self._offsets_of(utc_us, wall=False)
+
+    def to_utc_many(self, wall_us):
+        """
+        Returns the UTC microseconds for a sequence of wall-clock microseconds of the time zone, resolving
+        like `to_utc()`. Returns a numpy int64 array for larger sequences if numpy is installed, otherwise a list.
+        """
+        offsets = self._offsets_of(wall_us, wall=True)
+        if isinstance(offsets, list):
+            return [_clamp(us - offset, offset) for us, offset in zip(wall_us, offsets)]
+        import numpy as np
+        lower, upper = np.maximum(_MIN_US - offsets, _MIN_US), np.minimum(_MAX_US - offsets, _MAX_US)
+        return np.minimum(np.maximum(_as_int64(wall_us) - offsets, lower), upper)
+
+    def _offsets_of(self, values, wall: bool):
+        """Returns the offsets of the segments containing the given UTC (or wall-clock) microseconds."""
+        if len(values) < _VECTORIZE_MIN:
+            np = None
+        else:
+            try:
+                import numpy as np
+            except ImportError:
+                np = None
+        if np is None:
+            if len(values) == 0:
+                return []
+            self._ensure_values(values)
+            starts, offsets, wall_starts, _ = self._segments
+            boundaries = wall_starts if wall else starts
+            return [offsets[max(bisect_right(boundaries, us) - 1, 0)] for us in values]
+        values = _as_int64(values)
+        self._ensure_values(values, np)
+        starts, offsets, wall_starts, _ = self._segments
+        boundaries = np.frombuffer(wall_starts if wall else starts, dtype=np.int64)
+        indices = np.maximum(np.searchsorted(boundaries, values, side='right') - 1, 0)
+        return np.frombuffer(offsets, dtype=np.int64)[indices]
+    # endregion
+
+
+def _clamp(us: int, offset: int = 0) -> int:
+    """
+    Returns the microseconds clamped to the supported datetime range. For UTC microseconds, the UTC offset
+    keeps the wall-clock time within the range, too.
+    """
+    return min(max(us, _MIN_US, _MIN_US - offset), _MAX_US, _MAX_US - offset)
+
+
+def _as_int64(values):
+    import numpy as np
+    return np.asarray(values, dtype=np.int64)
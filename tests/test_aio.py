@@ -0,0 +1,117 @@
+# datespan - Copyright (c)2024, Thomas Zeutschler, MIT license
+
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import datespan
+from datespan import DateSpanSet, aparse, aparse_many
+from datespan import aio
+from datespan.parser.datespanparser import AST_CACHE
+
+
+class TestAsyncParsing(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        AST_CACHE.clear()
+
+    def tearDown(self):
+        aio.configure()
+
+    async def test_aparse(self):
+        dss = await aparse('last month')
+        self.assertEqual(dss, DateSpanSet('last month'))
+        with self.assertRaises(ValueError):
+            await aparse('no date at all')
+
+    async def test_cached_texts_are_parsed_inline(self):
+        DateSpanSet('next 3 days')
+        loop = asyncio.get_running_loop()
+        with mock.patch.object(loop, 'run_in_executor', side_effect=AssertionError('executor used')):
+            await aparse('next 3 days')
+
+    async def test_identical_requests_are_coalesced(self):
+        calls = []
+        parse = aio._parse
+
+        def counting_parse(*args):
+            calls.append(args[0])
+            time.sleep(0.05)  # keep the request in flight
+            return parse(*args)
+
+        with mock.patch.object(aio, '_parse', side_effect=counting_parse):
+            results = await aparse_many(['2024-01-15'] * 10 + ['ytd'])
+        self.assertEqual(sorted(calls), ['2024-01-15', 'ytd'])
+        self.assertEqual(len(results), 11)
+        self.assertTrue(all(r == results[0] for r in results[:10]))
+        self.assertIsNot(results[0], results[1])  # coalesced callers get their own copy
+
+    async def test_cancelled_caller_does_not_cancel_others(self):
+        parse = aio._parse
+
+        def slow_parse(*args):
+            time.sleep(0.05)  # keep the request in flight
+            return parse(*args)
+
+        with mock.patch.object(aio, '_parse', side_effect=slow_parse):
+            first = asyncio.create_task(aparse('2024-02-15'))
+            await asyncio.sleep(0)
+            others = [asyncio.create_task(aparse('2024-02-15')) for _ in range(3)]
+            await asyncio.sleep(0)
+            first.cancel()
+            results = await asyncio.gather(*others)
+        with self.assertRaises(asyncio.CancelledError):
+            await first
+        self.assertTrue(all(r == DateSpanSet('2024-02-15') for r in results))
+
+    async def test_cancelled_callers_cancel_the_parse(self):
+        with mock.patch.object(aio, '_parse', side_effect=lambda *args: time.sleep(0.05)):
+            callers = [asyncio.create_task(aparse('2024-02-16')) for _ in range(2)]
+            await asyncio.sleep(0)
+            state = aio._loop_states[asyncio.get_running_loop()]
+            task = next(iter(state.in_flight.values())).task
+            for caller in callers:
+                caller.cancel()
+            await asyncio.gather(*callers, return_exceptions=True)
+            await asyncio.sleep(0)
+        self.assertTrue(task.cancelled())
+        self.assertEqual(state.in_flight, {})
+
+    async def test_backpressure(self):
+        lock = threading.Lock()
+        running, peak = 0, 0
+        parse = aio._parse
+
+        def counting_parse(*args):
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            time.sleep(0.01)
+            with lock:
+                running -= 1
+            return parse(*args)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            aio.configure(executor=executor, max_in_flight=2)
+            with mock.patch.object(aio, '_parse', side_effect=counting_parse):
+                results = await aparse_many([f'2024-01-{day:02d}' for day in range(1, 21)])
+        self.assertEqual([r.start.day for r in results], list(range(1, 21)))
+        self.assertEqual(peak, 2)
+        with self.assertRaises(ValueError):
+            aio.configure(max_in_flight=0)
+
+    async def test_return_exceptions(self):
+        results = await aparse_many(['today', 'no date at all'], return_exceptions=True)
+        self.assertIsInstance(results[0], DateSpanSet)
+        self.assertIsInstance(results[1], ValueError)
+
+    def test_exports(self):
+        self.assertIs(datespan.aparse, aparse)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+# datespan - Copyright (c)2024, Thomas Zeutschler, MIT license
+
+import random
+import unittest
+from datetime import date, datetime, timedelta
+
+from datespan import BusinessCalendar, DateSpan, DateSpanSet, parse
+from datespan import calendar_math as cm
+
+END = (23, 59, 59, 999999)
+AS_OF = datetime(2024, 11, 15, 10, 30)  # a Friday
+HOLIDAYS = ['2024-11-11', date(2024, 11, 28), DateSpan(datetime(2024, 12, 24), datetime(2024, 12, 26, *END))]
+
+
+class TestBusinessCalendar(unittest.TestCase):
+
+    def test_arguments(self):
+        self.assertEqual(BusinessCalendar(HOLIDAYS), BusinessCalendar(list(reversed(HOLIDAYS))))
+        self.assertEqual(hash(BusinessCalendar(weekend=[6, 5])), hash(BusinessCalendar()))
+        self.assertNotEqual(BusinessCalendar(), BusinessCalendar(weekend=(4, 5)))
+        self.assertEqual(BusinessCalendar(DateSpanSet('2024-12-25')).holidays, BusinessCalendar('2024-12-25').holidays)
+        with self.assertRaises(ValueError):
+            BusinessCalendar(weekend=(7,))
+        with self.assertRaises(ValueError):
+            BusinessCalendar([42])
+        with self.assertRaises(ValueError):
+            BusinessCalendar().count(date(1600, 1, 1), date(2024, 1, 1))
+        with self.assertRaises(ValueError):
+            BusinessCalendar().shift(date(2261, 12, 30), 5)
+
+    def test_lookups(self):
+        calendar = BusinessCalendar(HOLIDAYS)
+        self.assertTrue(calendar.is_business_day(date(2024, 11, 12)))
+        self.assertFalse(calendar.is_business_day(date(2024, 11, 11)))
+        self.assertFalse(calendar.is_business_day(datetime(2024, 11, 16, 12)))
+        self.assertEqual(calendar.count(date(2024, 11, 1), date(2024, 11, 30)), 19)
+        self.assertEqual(calendar.count(date(2024, 11, 30), date(2024, 11, 1)), 0)
+        self.assertEqual(calendar.shift(AS_OF, 1), datetime(2024, 11, 18, 10, 30))
+        self.assertEqual(calendar.shift(date(2024, 11, 12), -1), date(2024, 11, 8))
+        self.assertEqual(calendar.shift(date(2024, 12, 21), 0), date(2024, 12, 23))
+        self.assertEqual(calendar.shift(date(2024, 12, 23), 1), date(2024, 12, 27))
+        self.assertEqual(calendar.spans(datetime(2024, 11, 8, 12), date(2024, 11, 12)),
+                         [(datetime(2024, 11, 8, 12), datetime(2024, 11, 8, *END)),
+                          (datetime(2024, 11, 12), datetime(2024, 11, 12, *END))])
+        self.assertEqual(cm.granularity_of(calendar.spans(date(2024, 11, 1), date(2024, 11, 30))[0]), 'day')
+
+    def test_against_loops(self):
+        rnd = random.Random(42)
+        holidays = [date(1990, 1, 1) + timedelta(days=rnd.randrange(15000)) for _ in range(300)]
+        for weekend in [(5, 6), (4, 5), (6,)]:
+            calendar = BusinessCalendar(holidays, weekend)
+            excluded = set(holidays)
+
+            def is_business_day(day):
+                return day.weekday() not in weekend and day not in excluded
+
+            for _ in range(300):
+                first = date(1990, 1, 1) + timedelta(days=rnd.randrange(15000))
+                days = [first + timedelta(days=i) for i in range(rnd.randrange(120))]
+                business_days = [day for day in days if is_business_day(day)]
+                if days:
+                    self.assertEqual(calendar.count(days[0], days[-1]), len(business_days))
+                    runs = calendar.spans(days[0], days[-1])
+                    self.assertEqual(sum((end.date() - start.date()).days + 1 for start, end in runs),
+                                     len(business_days))
+                shifted, steps = first, rnd.randrange(1, 30)
+                for _ in range(steps):
+                    shifted += timedelta(days=1)
+                    while not is_business_day(shifted):
+                        shifted += timedelta(days=1)
+                self.assertEqual(calendar.shift(first, steps), shifted)
+
+
+class TestBusinessDayExpressions(unittest.TestCase):
+
+    def test_expressions(self):
+        calendar = BusinessCalendar(HOLIDAYS)
+        dss = parse('last 10 business days', as_of=AS_OF, business_calendar=calendar)
+        self.assertEqual(dss.to_tuples(), [(datetime(2024, 10, 31), datetime(2024, 11, 1, *END)),
+                                           (datetime(2024, 11, 4), datetime(2024, 11, 8, *END)),
+                                           (datetime(2024, 11, 12), datetime(2024, 11, 14, *END))])
+        dss = parse('next 3 workdays', as_of=AS_OF, business_calendar=calendar)
+        self.assertEqual(dss.to_tuples(), [(datetime(2024, 11, 18), datetime(2024, 11, 20, *END))])
+        self.assertEqual(len(parse('workday', as_of=AS_OF + timedelta(days=1))), 0)  # a Saturday
+        dss = parse('every workday of last quarter', as_of=AS_OF)
+        self.assertEqual(dss.count_business_days(), 66)
+        self.assertEqual(dss.start, datetime(2024, 7, 1))
+        dss = parse('every working day in november 2024', as_of=AS_OF, business_calendar=calendar)
+        self.assertEqual(dss.count_business_days(), 19)
+
+    def test_date_span_set(self):
+        november = DateSpanSet('from 2024-11-01 to 2024-11-30')
+        self.assertEqual(november.count_business_days(), 21)
+        self.assertEqual(november.count_business_days(BusinessCalendar(HOLIDAYS)), 19)
+        self.assertEqual(DateSpanSet([datetime(2024, 11, 15, 8), datetime(2024, 11, 15, 16)]).count_business_days(), 1)
+        self.assertEqual(len(november.business_days()), 5)
+        self.assertEqual(november.business_days().count_business_days(), 21)
+        self.assertEqual(november.shift_business_days(1).to_tuples(),
+                         [(datetime(2024, 11, 4), datetime(2024, 12, 2, *END))])
+        days = DateSpanSet('from 2024-11-01 to 2024-11-30', resolution='day').business_days()
+        self.assertEqual(days.resolution, 'day')
+        self.assertEqual(days.to_tuples(), november.business_days().to_tuples())
+        dss = DateSpanSet('this week', as_of=AS_OF, business_calendar=BusinessCalendar(weekend=(4, 5, 6)))
+        self.assertEqual(dss.count_business_days(), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,12 @@
 # datespan - Copyright (c)2024, Thomas Zeutschler, MIT license
 
+import copy
+import pickle
 import unittest
-from datetime import datetime, timedelta, time
+from datetime import date, datetime, timedelta, time, timezone
+from unittest import mock
 
-from datespan import DateSpan
+from datespan import DateSpan, DateSpanSet, FrozenDateSpan
 
 
 class TestDateSpan(unittest.TestCase):
@@ -155,6 +158,33 @@ class TestDateSpan(unittest.TestCase):
         result = self.jan.shift(months=1)
         self.assertEqual(result, self.feb)
 
+    def test_shift_units(self):
+        end = (23, 59, 59, 999999)
+        self.assertEqual(self.jan.shift(days=1, hours=2),
+                         (datetime(2023, 1, 2, 2), datetime(2023, 2, 2, 1, 59, 59, 999999)))
+        self.assertEqual(self.jan.shift(weeks=1), (datetime(2023, 1, 8), datetime(2023, 2, 7, *end)))
+        self.assertEqual(self.jan.shift(years=1, months=1), (datetime(2024, 2, 1), datetime(2024, 2, 29, *end)))
+        # month ends are kept for month and year shifts only
+        leap = DateSpan(datetime(2024, 2, 29), datetime(2024, 2, 29, *end))
+        self.assertEqual(leap.shift(years=1), (datetime(2025, 2, 28), datetime(2025, 2, 28, *end)))
+        self.assertEqual(leap.shift(months=1), (datetime(2024, 3, 29), datetime(2024, 3, 31, *end)))
+        self.assertEqual(leap.shift(months=1, days=1), (datetime(2024, 3, 30), datetime(2024, 3, 30, *end)))
+        self.assertEqual(leap.shift_end(months=1).end, datetime(2024, 3, 31, *end))
+        self.assertEqual(leap.shift_start(months=-1, weeks=1).start, datetime(2024, 2, 5))
+        aware = DateSpan(datetime(2024, 1, 1, tzinfo=timezone.utc), datetime(2024, 1, 31, *end, tzinfo=timezone.utc))
+        self.assertEqual(aware.shift(months=1).end, datetime(2024, 2, 29, *end, tzinfo=timezone.utc))
+        # spans shorter than a day with a start clipped to the month end keep start <= end
+        short = DateSpan(datetime(2023, 1, 29, 12), datetime(2023, 1, 30, 6))
+        for kwargs in ({'months': 1}, {'months': 13}, {'years': 1, 'months': -11}):
+            shifted = short.shift(**kwargs)
+            self.assertLessEqual(shifted.start, shifted.end, kwargs)
+            self.assertTrue(shifted.overlaps_with(shifted))
+        self.assertEqual(short.shift(months=1), (datetime(2023, 2, 28, 6), datetime(2023, 2, 28, 12)))
+        self.assertEqual(DateSpan(datetime(2023, 3, 29, 12), datetime(2023, 3, 30, 6)).shift(months=-1),
+                         (datetime(2023, 2, 28, 6), datetime(2023, 2, 28, 12)))
+        with self.assertRaises(ValueError):
+            DateSpan.undefined().shift(days=1)
+
     def test_shift_start(self):
         result = self.jan.shift_start(months=1)
         self.assertEqual(result.start, self.feb.start)
@@ -216,6 +246,281 @@ class TestDateSpan(unittest.TestCase):
         result = DateSpan('January 2023', 'March 2023')
         self.assertEqual(result, self.jan_feb_mar)
 
+    def test_direct_conversion(self):
+        day_end = time(23, 59, 59, 999999)
+        with mock.patch.object(DateSpan, '_parse', side_effect=AssertionError('text parser used')):
+            self.assertEqual(DateSpan(datetime(2024, 3, 5)),
+                             (datetime(2024, 3, 5), datetime.combine(date(2024, 3, 5), day_end)))
+            self.assertEqual(DateSpan(datetime(2024, 3, 5, 10, 30)),
+                             (datetime(2024, 3, 5, 10, 30), datetime(2024, 3, 5, 10, 30, 0, 999999)))
+            self.assertEqual(DateSpan(datetime(2024, 3, 5, 10, 30, 0, 5)), datetime(2024, 3, 5, 10, 30, 0, 5))
+            self.assertEqual(DateSpan(date(2024, 3, 5)), DateSpan(datetime(2024, 3, 5)))
+            self.assertEqual(DateSpan(time(10, 30)).start, datetime.combine(date.today(), time(10, 30)))
+            self.assertEqual(DateSpan(date(2024, 1, 1), date(2024, 1, 3)),
+                             (datetime(2024, 1, 1), datetime.combine(date(2024, 1, 3), day_end)))
+            tz = timezone(timedelta(hours=2))
+            self.assertEqual(DateSpan(datetime(2024, 3, 5, tzinfo=tz)).end.tzinfo, tz)
+            self.assertEqual(DateSpan(2024), (datetime(2024, 1, 1), datetime(2024, 12, 31, 23, 59, 59, 999999)))
+            epoch = datetime(2024, 3, 5, 10, 30).timestamp()
+            self.assertEqual(DateSpan(int(epoch)),
+                             (datetime(2024, 3, 5, 10, 30), datetime(2024, 3, 5, 10, 30, 0, 999999)))
+            self.assertEqual(DateSpan(epoch + 0.5), datetime(2024, 3, 5, 10, 30, 0, 500000))
+
+    def test_direct_conversion_numpy_pandas(self):
+        import numpy as np
+        import pandas as pd
+        with mock.patch.object(DateSpan, '_parse', side_effect=AssertionError('text parser used')):
+            self.assertEqual(DateSpan(pd.Timestamp('2024-03-05')), DateSpan(date(2024, 3, 5)))
+            self.assertEqual(DateSpan(pd.Timestamp('2024-03-05 10:30:00.000000001')), datetime(2024, 3, 5, 10, 30))
+            self.assertEqual(DateSpan(np.datetime64('2024-03-05')), DateSpan(date(2024, 3, 5)))
+            self.assertEqual(DateSpan(np.datetime64('2024-03-05T10:30')),
+                             (datetime(2024, 3, 5, 10, 30), datetime(2024, 3, 5, 10, 30, 59, 999999)))
+            self.assertEqual(DateSpan(np.datetime64('2024-02')),
+                             (datetime(2024, 2, 1), datetime(2024, 2, 29, 23, 59, 59, 999999)))
+        with self.assertRaises(ValueError):
+            DateSpan(np.datetime64('NaT'))
+
+        # subclasses of datetime, e.g. pandas Timestamps, are compared like datetimes
+        self.assertTrue(self.jan < pd.Timestamp(2023, 2, 1))
+
+    def test_slots_and_metadata(self):
+        self.assertFalse(hasattr(self.jan, '__dict__'))
+        self.assertIs(self.jan._meta, DateSpan(datetime(2024, 1, 1))._meta)  # shared, no per-span metadata
+        self.assertEqual(self.jan._arg_start, self.jan.start)
+        self.assertIsNone(self.jan.message)
+        span = DateSpan("last month")
+        self.assertEqual(span._arg_start, "last month")
+        self.assertEqual(str(span), "DateSpan('last month', 'last month')")
+        # spans not created from text show their resolved bounds
+        self.assertEqual(str(DateSpan(date(2024, 1, 5))), "DateSpan(2024-01-05 00:00:00, 2024-01-05 23:59:59.999999)")
+        self.assertEqual(DateSpan(datetime(2024, 1, 1), message="note").message, "note")
+
+    def test_epoch_microseconds(self):
+        self.assertEqual(self.jan.start_us, 1672531200000000)
+        self.assertEqual(self.jan.end_us, 1675209599999999)
+        cet_tz = timezone(timedelta(hours=1))
+        utc = DateSpan(datetime(2023, 1, 1, tzinfo=timezone.utc), datetime(2023, 1, 2, tzinfo=timezone.utc))
+        cet = DateSpan(datetime(2023, 1, 1, 1, tzinfo=cet_tz), datetime(2023, 1, 2, 1, tzinfo=cet_tz))
+        self.assertEqual(utc.start_us, 1672531200000000)
+        self.assertEqual(utc, cet)  # same instant, compared in UTC
+        self.assertIsNone(DateSpan.undefined().start_us)
+
+        # merged and intersected spans carry the bounds of their sources
+        merged = self.jan.merge(self.feb)
+        self.assertEqual(merged.start_us, self.jan_feb.start_us)
+        self.assertEqual(merged, self.jan_feb)
+        self.assertEqual(self.jan_feb.intersect(self.feb).start, datetime(2023, 2, 1))
+        self.assertTrue(self.jan.consecutive_with(DateSpan(self.jan.end + timedelta(seconds=0.1))))
+        self.assertFalse(self.jan.consecutive_with(DateSpan(self.jan.end + timedelta(seconds=0.2))))
+
+        span = self.jan.clone()
+        _ = span.start_us
+        span.start = datetime(2023, 1, 15)  # resets the cached microseconds
+        self.assertEqual(span.start_us, 1673740800000000)
+        self.assertEqual(span.start, datetime(2023, 1, 15))
+
+        aware = DateSpan(datetime(2023, 1, 1, tzinfo=timezone.utc), datetime(2023, 1, 2, tzinfo=timezone.utc))
+        aware = aware.merge(DateSpan(datetime(2023, 1, 2, tzinfo=timezone.utc)))
+        self.assertEqual(aware.end.tzinfo, timezone.utc)
+
+        # naive and timezone-aware DateSpans can not be compared, like naive and timezone-aware datetimes
+        for check in (aware.overlaps_with, aware.consecutive_with, aware.merge, aware.can_merge, aware.intersect,
+                      aware.almost_equals, aware.__contains__, self.jan.overlaps_with):
+            with self.assertRaises(TypeError):
+                check(self.jan if check.__self__ is aware else aware)
+        with self.assertRaises(TypeError):
+            DateSpanSet([self.jan, aware])
+
+    def test_factories(self):
+        self.assertEqual(DateSpan.from_bounds(self.jan.start, self.jan.end), self.jan)
+        self.assertEqual(DateSpan.from_bounds(self.jan.end, self.jan.start, validated=False), self.jan)
+        self.assertEqual(DateSpan.from_epoch_us(self.jan.start_us, self.jan.end_us), self.jan)
+        self.assertEqual(DateSpan.from_epoch_us(self.jan.start_us, self.jan.end_us).start, datetime(2023, 1, 1))
+        aware = DateSpan.from_epoch_us(0, 0, tz=timezone(timedelta(hours=2)))
+        self.assertEqual(aware.start, datetime(1970, 1, 1, 2, tzinfo=timezone(timedelta(hours=2))))
+        self.assertEqual(DateSpan.from_ordinal_days(date(2023, 1, 1).toordinal(), date(2023, 1, 31).toordinal()),
+                         self.jan)
+
+        clone = self.jan.clone()
+        self.assertIsNot(clone, self.jan)
+        self.assertEqual(clone, self.jan)
+        clone.start = datetime(2023, 1, 15)
+        self.assertEqual(self.jan.start, datetime(2023, 1, 1))
+        self.assertTrue(DateSpan.undefined().clone().is_undefined)
+
+    def test_calendar_boundary_tables(self):
+        end = (23, 59, 59, 999999)
+        span = DateSpan(datetime(2024, 2, 10, 12), datetime(2024, 5, 3, 8))
+        lazy = DateSpan.from_epoch_us(span.start_us, span.end_us)
+        for s in (span, lazy):
+            self.assertEqual(s.full_month, (datetime(2024, 2, 1), datetime(2024, 5, 31, *end)))
+            self.assertEqual(s.full_quarter, (datetime(2024, 1, 1), datetime(2024, 6, 30, *end)))
+            self.assertEqual(s.full_year, (datetime(2024, 1, 1), datetime(2024, 12, 31, *end)))
+            self.assertEqual(s.full_week, (datetime(2024, 2, 5), datetime(2024, 5, 5, *end)))
+        self.assertTrue(self.jan_feb.is_full_month)
+        self.assertFalse(self.jan_feb.is_full_quarter)
+        self.assertTrue(self.jan_feb_mar.is_full_quarter)
+        self.assertTrue(self.jan_feb_mar.full_year.is_full_year)
+        self.assertTrue(span.full_week.is_full_week)
+        self.assertFalse(span.is_full_week)
+        self.assertFalse(DateSpan.undefined().is_full_month)
+
+        # outside the range of the tables and timezone-aware spans are computed on datetimes
+        old = DateSpan(datetime(1600, 2, 10), datetime(1600, 2, 11))
+        self.assertEqual(old.full_month, (datetime(1600, 2, 1), datetime(1600, 2, 29, *end)))
+        self.assertTrue(old.full_quarter.is_full_quarter)
+        aware = DateSpan(datetime(2024, 2, 10, tzinfo=timezone.utc), datetime(2024, 2, 11, tzinfo=timezone.utc))
+        self.assertEqual(aware.full_month.end, datetime(2024, 2, 29, *end, tzinfo=timezone.utc))
+        self.assertTrue(aware.full_month.is_full_month)
+
+    def test_frozen_date_span(self):
+        frozen = self.jan.freeze()
+        self.assertIsInstance(frozen, FrozenDateSpan)
+        self.assertEqual(frozen, self.jan)
+        self.assertEqual(hash(frozen), hash(self.jan))
+        self.assertEqual(hash(frozen), hash(frozen.to_tuple()))
+        with self.assertRaises(AttributeError):
+            frozen.start = datetime(2023, 1, 15)
+        with self.assertRaises(AttributeError):
+            frozen.end = datetime(2023, 1, 15)
+        self.assertIs(frozen.freeze(), frozen)
+        self.assertIsInstance(frozen.clone(), FrozenDateSpan)
+        self.assertNotIsInstance(frozen.shift(days=1), FrozenDateSpan)
+        self.assertEqual(FrozenDateSpan("2024-01")._arg_start, "2024-01")
+
+        totals = {span.freeze(): i for i, span in enumerate((self.jan, self.feb, self.mar))}
+        self.assertEqual(totals[DateSpan(datetime(2023, 2, 1), datetime(2023, 2, 28, 23, 59, 59, 999999))], 1)
+        self.assertIn(FrozenDateSpan(datetime(2023, 3, 1), datetime(2023, 3, 31, 23, 59, 59, 999999)), totals)
+
+    def test_sort_key_and_comparisons(self):
+        spans = [self.mar, DateSpan.undefined(), self.jan_feb, self.jan]
+        spans.sort(key=DateSpan.sort_key)
+        self.assertTrue(spans[0].is_undefined)
+        self.assertEqual(spans[1:], [self.jan, self.jan_feb, self.mar])
+        self.assertEqual(self.jan.sort_key(), (self.jan.start_us, self.jan.end_us))
+
+        # naive and timezone-aware DateSpans are equal if their wall-clock times are equal
+        aware = DateSpan(self.feb.start.replace(tzinfo=timezone.utc), self.feb.end.replace(tzinfo=timezone.utc))
+        self.assertEqual(aware, self.feb)
+        self.assertNotEqual(aware, DateSpan.undefined())
+        self.assertEqual(DateSpan.undefined(), DateSpan.undefined())
+        self.assertNotEqual(self.jan, DateSpan.undefined())
+
+        self.assertTrue(self.jan >= (datetime(2023, 1, 1), datetime(2023, 1, 2)))
+        self.assertTrue(self.jan > datetime(2022, 12, 31).timestamp())
+        self.assertFalse(self.jan == "2023-01")
+        self.assertFalse(self.jan < "2023-01")
+        self.assertEqual(DateSpan.undefined(), None)
+
+    def test_pickle_and_copy(self):
+        for span in (self.jan, DateSpan("last month"), DateSpan("2024-01-15", message="note"), DateSpan.undefined(),
+                     self.jan.localize("Europe/Berlin"), self.jan.freeze()):
+            restored = pickle.loads(pickle.dumps(span))
+            self.assertIs(type(restored), type(span))
+            self.assertEqual(restored.to_tuple(), span.to_tuple())
+            self.assertEqual((restored.tz, restored.message, restored._arg_start),
+                             (span.tz, span.message, span._arg_start))
+        self.assertEqual(pickle.loads(pickle.dumps(DateSpan("last month")))._grain, "month")
+
+        copied = copy.copy(self.jan)
+        self.assertEqual(copied, self.jan)
+        self.assertIsNot(copied, self.jan)
+        frozen = self.jan.freeze()
+        self.assertIs(copy.copy(frozen), frozen)
+        self.assertIs(copy.deepcopy(frozen), frozen)
+
+    def test_granularity(self):
+        as_of = datetime(2024, 3, 15, 10, 30)
+        spans = {text: DateSpanSet(text, as_of=as_of)[0] for text in
+                 ("last month", "this week", "yesterday", "next 2 quarters", "this year", "this hour",
+                  "2024-01-05", "from January to March", "from 2024-01-01 to 2024-01-31")}
+        self.assertEqual({text: span._grain for text, span in spans.items()},
+                         {"last month": "month", "this week": "week", "yesterday": "day",
+                          "next 2 quarters": "quarter", "this year": "year", "this hour": "hour", "2024-01-05": "day",
+                          "from January to March": "month", "from 2024-01-01 to 2024-01-31": "day"})
+        self.assertTrue(spans["last month"].is_full_month)
+        self.assertTrue(spans["this year"].is_full_quarter)
+        self.assertTrue(spans["this week"].is_full_day)
+        self.assertTrue(spans["from 2024-01-01 to 2024-01-31"].is_full_month)  # not known, but computed
+        self.assertEqual(DateSpan("last month").granularity, "month")
+
+        # the granularity of other spans is determined on first access
+        self.assertEqual(self.jan_feb.granularity, "month")
+        quarter = DateSpan(datetime(2023, 1, 1), datetime(2023, 3, 31, 23, 59, 59, 999999))
+        self.assertEqual(quarter.granularity, "quarter")
+        self.assertEqual(DateSpan(datetime(2024, 1, 1, 10), datetime(2024, 1, 1, 10, 0, 59, 999999)).granularity,
+                         "minute")
+        self.assertEqual(DateSpan(datetime(2024, 1, 1, 10), datetime(2024, 1, 1, 10, 30)).granularity, "microsecond")
+        self.assertIsNone(DateSpan.undefined().granularity)
+
+        # full_* properties, shift and replace
+        point = DateSpan(datetime(2024, 2, 14, 10, 15, 30, 500))
+        for name, granularity in (("full_second", "second"), ("full_minute", "minute"), ("full_hour", "hour"),
+                                  ("full_day", "day"), ("full_week", "week"), ("full_month", "month"),
+                                  ("full_quarter", "quarter"), ("full_year", "year")):
+            self.assertEqual(getattr(point, name)._grain, granularity)
+        quarter = point.full_quarter
+        self.assertEqual(quarter.shift(months=3)._grain, "quarter")
+        self.assertEqual(quarter.shift(months=1)._grain, "month")
+        self.assertEqual(quarter.shift(days=1)._grain, "day")
+        self.assertEqual(quarter.shift(months=1, hours=2)._grain, "hour")
+        self.assertEqual(point.full_week.shift(weeks=2)._grain, "week")
+        self.assertEqual(point.full_week.shift(months=1)._grain, "day")
+        self.assertEqual(self.jan.full_month.replace(year=2020)._grain, "month")
+        self.assertEqual(self.jan.full_month.replace(day=10)._grain, "day")
+        self.assertIsNone(self.jan.full_month.replace(hour=10)._grain)
+        self.assertEqual(point.full_day.localize("Europe/Berlin")._grain, "day")
+
+        # changing the start or end of a span drops the granularity
+        span = point.full_month
+        span.start = datetime(2024, 2, 10, 12)
+        self.assertIsNone(span._grain)
+        self.assertFalse(span.is_full_day)
+
+        # to_sql writes the start of spans made of days as a date
+        sql = DateSpanSet([spans["last month"], spans["this hour"]]).to_sql("date", add_comment=False)
+        self.assertEqual(sql, "(date BETWEEN '2024-02-01' AND '2024-02-29T23:59:59.999999') OR "
+                              "(date BETWEEN '2024-03-15T10:00:00' AND '2024-03-15T10:59:59.999999')")
+
+    def test_buckets(self):
+        span = DateSpan(datetime(2024, 1, 30, 12), datetime(2024, 4, 2, 6))
+        days = list(span.iter_days())
+        self.assertEqual(len(days), 64)
+        self.assertEqual(days[0], DateSpan(datetime(2024, 1, 30, 12), datetime(2024, 1, 30, 23, 59, 59, 999999)))
+        self.assertEqual(days[1], DateSpan(datetime(2024, 1, 31)).full_day)
+        self.assertEqual(days[-1], DateSpan(datetime(2024, 4, 2), datetime(2024, 4, 2, 6)))
+        self.assertEqual(([day._grain for day in days[:2]]), [None, "day"])  # clipped buckets are not full days
+        self.assertEqual([week.start.weekday() for week in span.iter_weeks()][1:], [0] * 9)
+        months = list(span.iter_months())
+        self.assertEqual([month.start for month in months],
+                         [span.start, datetime(2024, 2, 1), datetime(2024, 3, 1), datetime(2024, 4, 1)])
+        self.assertTrue(months[1].is_full_month)
+        self.assertEqual(list(span.iter_quarters())[0].end, datetime(2024, 3, 31, 23, 59, 59, 999999))
+        self.assertEqual(list(span.iter_years()), [span])
+        self.assertEqual(list(DateSpan.undefined().iter_days()), [])
+
+    def test_bucket_arrays(self):
+        import numpy as np
+        # the bucket edges of the array variant match the iterators
+        span = DateSpan(datetime(2024, 1, 30, 12), datetime(2024, 4, 2, 6))
+        for name in ("day", "week", "month", "quarter", "year"):
+            self.assertEqual(span.buckets(name).to_spans(), list(getattr(span, f"iter_{name}s")()))
+        self.assertEqual(span.buckets("month").start.dtype, np.dtype("datetime64[us]"))
+        with self.assertRaises(ValueError):
+            span.buckets("fortnight")
+
+        # days of timezone-aware spans follow the wall-clock time, 23 hours on the day of the DST change
+        berlin = DateSpan(datetime(2024, 3, 30, 12), datetime(2024, 4, 1, 12)).localize("Europe/Berlin")
+        hour = 3_600_000_000
+        self.assertEqual([day.end_us - day.start_us + 1 for day in berlin.iter_days()],
+                         [12 * hour, 23 * hour, 12 * hour + 1])
+        self.assertEqual(berlin.buckets("day").to_tuples(), [day.to_tuple() for day in berlin.iter_days()])
+
+        dss = DateSpanSet([DateSpan(datetime(2024, 1, 1)), DateSpan(datetime(2024, 3, 1), datetime(2024, 3, 2))])
+        self.assertEqual([day.start.day for day in dss.iter_days()], [1, 1, 2])
+        self.assertEqual(len(list(dss.iter_months())), 2)
+        self.assertEqual(dss.buckets("day").to_spans(), list(dss.iter_days()))
+
 
 if __name__ == '__main__':
     unittest.main()
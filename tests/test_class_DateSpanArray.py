@@ -0,0 +1,218 @@
+# datespan - Copyright (c)2024, Thomas Zeutschler, MIT license
+
+import unittest
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pandas as pd
+
+from datespan import DateSpan, DateSpanArray, DateSpanSet
+from datespan.date_span_array import NAT
+from datespan.pandas_extension import DateSpanDtype, DateSpanExtensionArray
+
+END = (23, 59, 59, 999999)
+
+
+class TestDateSpanArray(unittest.TestCase):
+
+    def setUp(self):
+        base = datetime(2023, 1, 1)
+        # spans of different lengths, some ending on a month end, one undefined
+        self.spans = [DateSpan(base + timedelta(days=13 * i, hours=i), base + timedelta(days=17 * i, minutes=7 * i))
+                      for i in range(60)]
+        self.spans[5] = DateSpan(datetime(2024, 1, 31, 12), datetime(2024, 2, 29, 18))
+        self.spans[6] = DateSpan(datetime(2024, 3, 31), datetime(2024, 3, 31))
+        self.spans[7] = DateSpan.undefined()
+        self.array = DateSpanArray.from_spans(self.spans)
+
+    def assertSpans(self, array: DateSpanArray, expected: list):
+        self.assertIsInstance(array, DateSpanArray)
+        self.assertEqual(array.to_spans(), expected)
+
+    def test_construction(self):
+        array = DateSpanArray(np.array(['2024-01-15', '2024-02-20'], dtype='datetime64[s]'),
+                              [datetime(2024, 1, 16), datetime(2024, 2, 1)])
+        self.assertEqual(array.start.dtype, np.dtype('datetime64[us]'))
+        self.assertEqual(array[0], DateSpan(datetime(2024, 1, 15), datetime(2024, 1, 16)))
+        self.assertEqual(array[1], DateSpan(datetime(2024, 2, 1), datetime(2024, 2, 20)))  # swapped
+        self.assertEqual(len(DateSpanArray()), 0)
+        self.assertEqual(DateSpanArray(pd.Series(pd.to_datetime(['2024-03-01 12:00'])))[0],
+                         DateSpan(datetime(2024, 3, 1, 12), datetime(2024, 3, 1, 12)))
+        with self.assertRaises(ValueError):
+            DateSpanArray(np.array(['2024-01-15'], dtype='datetime64[us]'), [datetime(2024, 1, 1)] * 2)
+        with self.assertRaises(ValueError):
+            DateSpanArray(["no date"])
+
+        # one NaT bound makes the span undefined
+        array = DateSpanArray(np.array(['2024-01-15', 'NaT'], dtype='datetime64[us]'),
+                              np.array(['NaT', 'NaT'], dtype='datetime64[us]'))
+        self.assertEqual(array.is_undefined.tolist(), [True, True])
+
+        array = DateSpanArray.from_epoch_us(np.array([0, 10]), np.array([5, 20]))
+        self.assertEqual(array.end_us.tolist(), [5, 20])
+        self.assertEqual(array.nbytes, 32)
+
+    def test_interop(self):
+        self.assertEqual(len(self.array), 60)
+        self.assertEqual(self.array.to_spans(), self.spans)
+        self.assertEqual(list(self.array), self.spans)
+        self.assertEqual(self.array[7], DateSpan.undefined())
+        self.assertEqual(self.array[7:9].to_spans(), self.spans[7:9])
+        self.assertEqual(self.array[self.array.is_undefined].to_spans(), [DateSpan.undefined()])
+        self.assertEqual(self.array.to_tuples()[:2], [span.to_tuple() for span in self.spans[:2]])
+        self.assertIn("length=60", repr(self.array))
+
+        dss = DateSpanSet([span for span in self.spans if not span.is_undefined])
+        self.assertEqual(self.array.to_date_span_set().to_tuples(), dss.to_tuples())
+        self.assertEqual(DateSpanArray.from_spans(dss).to_tuples(), dss.to_tuples())
+        self.assertEqual(len(DateSpanArray.from_spans([])), 0)
+
+        copy = self.array.copy()
+        copy.start_us[0] = 0
+        self.assertEqual(self.array[0], self.spans[0])
+        both = DateSpanArray.concat([self.array, self.array[:2]])
+        self.assertEqual(both.to_spans(), self.spans + self.spans[:2])
+
+        with self.assertRaises(ValueError):
+            DateSpanArray.from_spans([self.spans[0], self.spans[0].localize("Europe/Berlin")])
+
+    def test_ticks(self):
+        start, end = self.array.to_ticks("day")
+        self.assertEqual((start[7], end[7]), (NAT, NAT))
+        self.assertEqual((start[5], end[5]), (19753, 19782))  # 2024-01-31 to 2024-02-29
+        defined = [span for span in self.spans if not span.is_undefined]
+        for resolution in ("ms", "s", "day"):
+            dss = self.array.to_date_span_set(resolution)
+            self.assertEqual(dss.resolution, resolution)
+            self.assertEqual(dss.to_tuples(), DateSpanSet(defined, resolution=resolution).to_tuples())
+        berlin = self.array.localize("Europe/Berlin")
+        expected = DateSpanSet([span for span in berlin if not span.is_undefined], resolution="day")
+        self.assertEqual(berlin.to_date_span_set("day").to_tuples(), expected.to_tuples())
+        with self.assertRaises(ValueError):
+            self.array.to_ticks("minute")
+
+    def test_buckets(self):
+        for name in ("day", "week", "month", "quarter", "year"):
+            expected = [bucket for span in self.spans for bucket in getattr(span, f"iter_{name}s")()]
+            self.assertSpans(self.array.buckets(name), expected)
+        berlin = self.array.localize("Europe/Berlin")
+        self.assertEqual(berlin.buckets("week").to_tuples(),
+                         [bucket.to_tuple() for span in berlin for bucket in span.iter_weeks()])
+        self.assertEqual(len(DateSpanArray().buckets("day")), 0)
+
+    def test_equality(self):
+        self.assertTrue((self.array == DateSpanArray.from_spans(self.spans)).all())
+        self.assertEqual((self.array == self.spans[3]).tolist(), [span == self.spans[3] for span in self.spans])
+        self.assertEqual((self.array != self.spans[3]).sum(), 59)
+        self.assertFalse((self.array == "2024").any())
+
+    def test_full_periods(self):
+        for name in ("full_day", "full_week", "full_month", "full_quarter", "full_year"):
+            expected = [span if span.is_undefined else getattr(span, name) for span in self.spans]
+            self.assertSpans(getattr(self.array, name), expected)
+
+    def test_shift(self):
+        for kwargs in (dict(months=1), dict(months=-13), dict(years=1), dict(days=3), dict(hours=-5),
+                       dict(weeks=1, seconds=30), dict(months=2, days=3), dict(years=-1, weeks=2, hours=1)):
+            expected = [span if span.is_undefined else span.shift(**kwargs) for span in self.spans]
+            self.assertSpans(self.array.shift(**kwargs), expected)
+
+        # DateSpans ending on a month end are shifted to the month end
+        self.assertEqual(self.array.shift(months=1)[5], DateSpan(datetime(2024, 2, 29, 12), datetime(2024, 3, 31, *END)))
+
+        # clipping the start to the end of a shorter month does not reverse spans shorter than a day
+        short = DateSpanArray.from_spans([DateSpan(datetime(2023, 1, 29, 12), datetime(2023, 1, 30, 6))])
+        for kwargs in (dict(months=1), dict(months=13), dict(months=1, hours=1)):
+            self.assertSpans(short.shift(**kwargs), [span.shift(**kwargs) for span in short])
+        self.assertEqual(short.shift(months=1)[0], DateSpan(datetime(2023, 2, 28, 6), datetime(2023, 2, 28, 12)))
+        self.assertEqual(short.shift(months=1).duration.tolist(), [0.25])
+
+    def test_span_operations(self):
+        others = self.spans[1:] + self.spans[:1]
+        other = DateSpanArray.from_spans(others)
+        self.assertEqual(self.array.overlaps(other).tolist(),
+                         [a.overlaps_with(b) for a, b in zip(self.spans, others)])
+        self.assertSpans(self.array.intersect(other), [a.intersect(b) for a, b in zip(self.spans, others)])
+        self.assertEqual(self.array.contains(other).tolist(),
+                         [not a.is_undefined and not b.is_undefined and b in a for a, b in zip(self.spans, others)])
+
+        span = DateSpan(datetime(2023, 6, 1), datetime(2023, 9, 1))
+        self.assertEqual(self.array.overlaps(span).tolist(), [s.overlaps_with(span) for s in self.spans])
+        self.assertSpans(self.array.intersect(span), [s.intersect(span) for s in self.spans])
+
+        point = datetime(2023, 7, 1)
+        self.assertEqual(self.array.contains(point).tolist(), [not s.is_undefined and point in s for s in self.spans])
+        points = self.array.start + np.timedelta64(1, 'h')
+        self.assertEqual(self.array.contains(points).tolist(),
+                         [not s.is_undefined and s.start + timedelta(hours=1) in s for s in self.spans])
+        with self.assertRaises(ValueError):
+            self.array.overlaps(other[:3])
+
+    def test_durations(self):
+        durations = self.array.duration
+        self.assertTrue(np.isnan(durations[7]))
+        self.assertEqual(durations[8:].tolist(), [span.duration for span in self.spans[8:]])
+        self.assertEqual(self.array.timedelta[1], np.timedelta64(self.spans[1].timedelta))
+
+    def test_timezones(self):
+        berlin = ZoneInfo("Europe/Berlin")
+        aware = [span if span.is_undefined else span.localize(berlin) for span in self.spans]
+        array = self.array.localize(berlin)
+        self.assertEqual(array.tz, berlin)
+        self.assertEqual(array.to_tuples(), [span.to_tuple() for span in aware])
+        self.assertEqual(DateSpanArray.from_spans(aware).start_us.tolist(), array.start_us.tolist())
+        for name in ("full_day", "full_week", "full_month", "full_year"):
+            self.assertEqual(getattr(array, name).to_tuples(),
+                             [span.to_tuple() if span.is_undefined else getattr(span, name).to_tuple()
+                              for span in aware])
+        self.assertEqual(array.shift(days=200).to_tuples(),
+                         [span.to_tuple() if span.is_undefined else span.shift(days=200).to_tuple()
+                          for span in aware])
+        tokyo = array.astimezone("Asia/Tokyo")
+        self.assertEqual(tokyo.start_us.tolist(), array.start_us.tolist())
+        self.assertEqual(tokyo[0].start, aware[0].start)
+        with self.assertRaises(ValueError):
+            self.array.astimezone(berlin)
+
+
+class TestDateSpanExtensionArray(unittest.TestCase):
+
+    def setUp(self):
+        self.jan = DateSpan(datetime(2024, 1, 10)).full_month
+        self.feb = DateSpan(datetime(2024, 2, 10)).full_month
+        self.series = pd.Series([self.jan, self.feb, None, self.jan], dtype="datespan")
+
+    def test_series(self):
+        series = self.series
+        self.assertIsInstance(series.dtype, DateSpanDtype)
+        self.assertIsInstance(series.array, DateSpanExtensionArray)
+        self.assertEqual(series.isna().tolist(), [False, False, True, False])
+        self.assertEqual(series[1], self.feb)
+        self.assertIsNone(series[2])
+        self.assertEqual((series == self.jan).tolist(), [True, False, False, True])
+        self.assertEqual(series.array.spans.shift(months=1)[0], self.feb)
+        self.assertEqual(series.array.spans.contains(datetime(2024, 2, 2)).tolist(), [False, True, False, False])
+
+    def test_pandas_operations(self):
+        series = self.series
+        self.assertEqual(series.take([3, 0]).tolist(), [self.jan, self.jan])
+        self.assertEqual(series.reindex([0, 5]).tolist(), [self.jan, None])
+        self.assertEqual(pd.concat([series, series]).shape, (8,))
+        self.assertEqual(series.fillna(self.feb).tolist(), [self.jan, self.feb, self.feb, self.jan])
+        self.assertEqual(series.unique().tolist(), [self.jan, self.feb, None])
+        self.assertEqual(series.value_counts().to_dict(), {self.jan: 2, self.feb: 1})
+        self.assertEqual(series.sort_values().tolist(), [self.jan, self.jan, self.feb, None])
+
+        frame = pd.DataFrame({"span": series, "value": [1, 2, 3, 4]})
+        self.assertEqual(frame.groupby("span")["value"].sum().tolist(), [5, 2])
+
+        copy = series.copy()
+        copy[2] = self.feb
+        copy[[0, 1]] = [None, self.jan]
+        self.assertEqual(copy.tolist(), [None, self.jan, self.feb, self.jan])
+        self.assertIsNone(series[2])
+
+
+if __name__ == '__main__':
+    unittest.main()
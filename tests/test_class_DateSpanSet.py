@@ -1,5 +1,7 @@
 # datespan - Copyright (c)2024, Thomas Zeutschler, MIT license
 
+import copy
+import pickle
 import unittest
 from datetime import datetime
 
@@ -149,13 +151,147 @@ class TestDateSpanSet(unittest.TestCase):
         self.assertEqual(test, self.jan_feb_mar)
 
     def test_intersect(self):
-        with self.assertRaises(NotImplementedError):
-            self.jan_feb.intersect(self.mar)
+        self.assertFalse(self.jan_feb.intersect(self.mar))
+        self.assertEqual(self.jan_feb_mar.intersect(self.feb).to_tuples(), [self.feb.to_tuple()])
+        year = DateSpanSet("from January 2024 to December 2024")
+        self.assertEqual(year.intersect("from March 2024 to May 2025").to_tuples(),
+                         [(datetime(2024, 3, 1), datetime(2024, 12, 31, 23, 59, 59, 999999))])
 
     def test_invalid_text(self):
         with self.assertRaises(Exception):
             a = DateSpanSet("invalid text")
 
+    def test_lazy_date_spans(self):
+        dss = DateSpanSet("2024-01-01; 2024-01-02; 2024-03-01")
+        self.assertIsNone(dss._span_objects)
+        self.assertEqual(len(dss), 2)
+        self.assertEqual(dss.start, datetime(2024, 1, 1))
+        self.assertEqual(dss.end, datetime(2024, 3, 1, 23, 59, 59, 999999))
+        self.assertEqual(dss.to_tuples()[0], (datetime(2024, 1, 1), datetime(2024, 1, 2, 23, 59, 59, 999999)))
+        raw_hash = hash(dss)
+        self.assertIsNone(dss._span_objects)
+        self.assertIsInstance(dss[1], DateSpan)  # indexing creates the DateSpan objects
+        self.assertIsNotNone(dss._span_objects)
+        self.assertEqual(hash(dss), raw_hash)
+
+    def test_hash_of_frozen_spans(self):
+        dss = DateSpanSet([self.jan, self.mar])
+        frozen = DateSpanSet([self.jan, self.mar])
+        frozen._spans = [span.freeze() for span in frozen._spans]
+        self.assertEqual(hash(dss), hash(frozen))
+        self.assertEqual(len({dss, frozen}), 1)
+
+    def test_merge_nested_and_consecutive_spans(self):
+        year = DateSpan(datetime(2023, 1, 1), datetime(2023, 12, 31, 23, 59, 59, 999999))
+        dss = DateSpanSet([self.feb, year, self.mar])
+        self.assertEqual(dss.to_tuples(), [(year.start, year.end)])
+        gap = DateSpan(datetime(2023, 2, 1, 0, 0, 0, 50_000), datetime(2023, 2, 2))  # within 0.1 sec epsilon
+        self.assertEqual(len(DateSpanSet([self.jan, gap])), 1)
+        self.assertEqual(len(DateSpanSet([self.jan, DateSpan(datetime(2023, 2, 1, 0, 0, 0, 99_999))])), 1)
+        self.assertEqual(len(DateSpanSet([self.jan, DateSpan(datetime(2023, 2, 1, 0, 0, 0, 100_000))])), 2)
+        self.assertEqual(len(DateSpanSet([self.jan, self.mar])), 2)
+
+    def test_pickle(self):
+        for dss in (DateSpanSet("last month; every monday in this month"), self.jan_feb_mar, self.empty_set,
+                    DateSpanSet("today", tz="Asia/Tokyo")):
+            dss.spans
+            for source in (dss, DateSpanSet(dss)):  # pickled from DateSpans and from (start, end) tuples
+                restored = pickle.loads(pickle.dumps(source))
+                self.assertEqual(restored.to_tuples(), source.to_tuples())
+                self.assertEqual(str(restored), str(source))
+                self.assertEqual(restored.tz, source.tz)
+
+        # the state holds the definition and two packed int64 buffers, no datetimes or DateSpans
+        definition, tz, span_tz, starts, ends = self.jan_feb_mar.__getstate__()
+        self.assertEqual((len(starts), len(ends)), (8, 8))
+        self.assertEqual(definition, str(self.jan_feb_mar._definition))
+
+        # spans of different time zones are pickled as DateSpans
+        mixed = DateSpanSet([self.jan.localize("Europe/Berlin"), self.mar.localize("Asia/Tokyo")])
+        self.assertEqual(pickle.loads(pickle.dumps(mixed)).to_tuples(), mixed.to_tuples())
+
+    def test_copy_shares_immutable_spans(self):
+        dss = DateSpanSet([self.jan, self.mar])
+        self.assertIs(copy.copy(dss)._raw[0], dss._raw[0])
+        frozen = DateSpanSet([self.jan, self.mar])
+        frozen._spans = [span.freeze() for span in frozen.spans]
+        clone = frozen.clone()
+        self.assertIs(clone.spans[0], frozen.spans[0])
+        self.assertEqual(copy.deepcopy(dss), dss)
+
+        # mutable DateSpans are cloned
+        dss.spans
+        self.assertIsNot(dss.clone().spans[0], dss.spans[0])
+
+    def test_resolution(self):
+        end = (23, 59, 59, 999999)
+        days = DateSpanSet([DateSpan(datetime(2024, 1, 1, 10), datetime(2024, 1, 3, 8)),
+                            DateSpan(datetime(2024, 1, 4, 12))], resolution="day")
+        self.assertEqual(days.resolution, "day")
+        self.assertEqual(list(days._ticks.starts), [19723])  # days since 1970-01-01
+        self.assertEqual(days.to_tuples(), [(datetime(2024, 1, 1), datetime(2024, 1, 4, *end))])  # full days, merged
+        self.assertEqual(days[0].granularity, "day")
+        self.assertEqual(days, DateSpanSet(DateSpan(datetime(2024, 1, 1), datetime(2024, 1, 4, *end))))
+        self.assertEqual(hash(days), hash(DateSpanSet(days.spans)))
+
+        gaps = days - DateSpan(datetime(2024, 1, 2, 12))
+        self.assertEqual(gaps.resolution, "day")
+        self.assertEqual(gaps.to_tuples(), [(datetime(2024, 1, 1), datetime(2024, 1, 1, *end)),
+                                            (datetime(2024, 1, 3), datetime(2024, 1, 4, *end))])
+        self.assertEqual(gaps.intersect(DateSpan(datetime(2024, 1, 1, 12), datetime(2024, 1, 3))).to_tuples(),
+                         [(datetime(2024, 1, 1), datetime(2024, 1, 1, *end)),
+                          (datetime(2024, 1, 3), datetime(2024, 1, 3, *end))])
+        self.assertEqual(len(gaps.merge(DateSpan(datetime(2024, 1, 2, 18)))), 1)
+        gaps.remove(DateSpan(datetime(2024, 1, 4)))
+        self.assertEqual(gaps.end, datetime(2024, 1, 3, *end))
+
+        seconds = DateSpanSet(DateSpan(datetime(2024, 1, 1, 10, 0, 0, 500), datetime(2024, 1, 1, 10, 0, 5, 250)),
+                              resolution="s")
+        self.assertEqual(seconds.to_tuples(), [(datetime(2024, 1, 1, 10), datetime(2024, 1, 1, 10, 0, 5, 999999))])
+        milliseconds = DateSpanSet([self.jan, DateSpan(datetime(2023, 2, 1, 0, 0, 0, 50_000))], resolution="ms")
+        self.assertEqual(len(milliseconds), 1)  # within 0.1 sec epsilon
+
+        berlin = DateSpanSet("2024-03-31", tz="Europe/Berlin", resolution="day")
+        self.assertEqual(berlin.to_sql("d", add_comment=False),
+                         "(d >= '2024-03-31T00:00:00+01:00' AND d < '2024-04-01T00:00:00+02:00')")
+        self.assertEqual(berlin[0].end.utcoffset().total_seconds(), 7200)
+
+        restored = pickle.loads(pickle.dumps(days))
+        self.assertEqual((restored.resolution, restored.to_tuples()), ("day", days.to_tuples()))
+        self.assertIs(days.clone()._ticks, days._ticks)
+        with self.assertRaises(ValueError):
+            DateSpanSet(self.jan, resolution="minute")
+
+    def test_resolution_predicates(self):
+        import numpy as np
+        dss = DateSpanSet([DateSpan(datetime(2024, 1, 1), datetime(2024, 1, 1, 12)),
+                           DateSpan(datetime(2024, 1, 3, 8))], resolution="day")
+        self.assertEqual(dss.to_sql("date", add_comment=False),
+                         "(date >= '2024-01-01' AND date < '2024-01-02') OR "
+                         "(date >= '2024-01-03' AND date < '2024-01-04')")
+        points = [datetime(2024, 1, 1, 23, 59, 59, 999999), datetime(2024, 1, 2), datetime(2024, 1, 3, 20)]
+        for function in (dss.to_function(), dss.to_lambda()):
+            self.assertEqual([function(point) for point in points], [True, False, True])
+        self.assertEqual(dss.to_df_lambda()(np.array(points, dtype="datetime64[us]")).tolist(), [True, False, True])
+        self.assertIn("x < datetime(year=2024, month=1, day=2)", dss.to_lambda(return_source_code=True))
+
+    def test_overlap_duration(self):
+        import numpy as np
+        starts = np.array(["2022-12-31T23:00", "2023-01-31T12:00", "2023-02-10", "2023-05-01", "NaT", "2023-01-02"],
+                          dtype="datetime64[us]")
+        ends = np.array(["2023-01-01T01:00", "2023-03-01T12:00", "2023-02-11", "2023-05-02", "2023-01-01",
+                         "2023-01-01"], dtype="datetime64[us]")
+        day = 86400.0
+        expected = [3600.0, 28.5 * day, day, 0.0, np.nan, 0.0]
+        np.testing.assert_array_equal(self.jan_feb.overlap_duration(starts, ends), expected)
+        np.testing.assert_array_equal(DateSpanSet([self.jan, self.mar]).overlap_duration(starts, ends),
+                                      [3600.0, 12.0 * 3600 + 12 * 3600, 0.0, 0.0, np.nan, 0.0])
+        np.testing.assert_array_equal(self.empty_set.overlap_duration(starts[:2], ends[:2]), [0.0, 0.0])
+        self.assertEqual(self.jan_feb.overlap_duration([datetime(2023, 1, 1)], [datetime(2023, 1, 2)]).tolist(),
+                         [day])
+        with self.assertRaises(ValueError):
+            self.jan_feb.overlap_duration(starts, ends[:2])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,136 @@
+# datespan - Copyright (c)2024, Thomas Zeutschler, MIT license
+
+import unittest
+from datetime import datetime
+
+from datespan.parser.errors import EvaluationError
+from datespan.parser.evaluator import Evaluator
+from datespan.parser.triplet_table import TripletTable
+
+
+class TestEvaluator(unittest.TestCase):
+
+    def setUp(self):
+        # Wednesday, 2024-05-15 14:35:12.345678
+        self.evaluator = Evaluator([])
+        self.evaluator.today = datetime(2024, 5, 15, 14, 35, 12, 345678)
+
+    def test_calculate_previous(self):
+        e = self.evaluator
+        self.assertEqual(e.calculate_previous(3, 'month'),
+                         [(datetime(2024, 2, 1), datetime(2024, 4, 30, 23, 59, 59, 999999))])
+        self.assertEqual(e.calculate_previous(1, 'quarter'),
+                         [(datetime(2024, 1, 1), datetime(2024, 3, 31, 23, 59, 59, 999999))])
+        self.assertEqual(e.calculate_previous(2, 'week'),
+                         [(datetime(2024, 4, 29), datetime(2024, 5, 12, 23, 59, 59, 999999))])
+        self.assertEqual(e.calculate_previous(2, 'year'),
+                         [(datetime(2022, 1, 1), datetime(2023, 12, 31, 23, 59, 59, 999999))])
+        self.assertEqual(e.calculate_previous(1, 'day'),
+                         [(datetime(2024, 5, 14), datetime(2024, 5, 14, 23, 59, 59, 999999))])
+        self.assertEqual(e.calculate_previous(2, 'hour'),
+                         [(datetime(2024, 5, 15, 12), datetime(2024, 5, 15, 13, 59, 59, 999999))])
+
+    def test_calculate_future(self):
+        e = self.evaluator
+        self.assertEqual(e.calculate_future(2, 'month'),
+                         [(datetime(2024, 6, 1), datetime(2024, 7, 31, 23, 59, 59, 999999))])
+        self.assertEqual(e.calculate_future(1, 'quarter'),
+                         [(datetime(2024, 7, 1), datetime(2024, 9, 30, 23, 59, 59, 999999))])
+        self.assertEqual(e.calculate_future(1, 'week'),
+                         [(datetime(2024, 5, 20), datetime(2024, 5, 26, 23, 59, 59, 999999))])
+        self.assertEqual(e.calculate_future(3, 'day'),
+                         [(datetime(2024, 5, 16), datetime(2024, 5, 18, 23, 59, 59, 999999))])
+        self.assertEqual(e.calculate_future(1, 'hour'),
+                         [(datetime(2024, 5, 15, 15), datetime(2024, 5, 15, 15, 59, 59, 999999))])
+
+    def test_calculate_rolling(self):
+        e = self.evaluator
+        now = e.today
+        self.assertEqual(e.calculate_rolling(3, 'month'), [(datetime(2024, 2, 15, 14, 35, 12, 345678), now)])
+        self.assertEqual(e.calculate_rolling(1, 'year'), [(datetime(2023, 5, 15, 14, 35, 12, 345678), now)])
+        self.assertEqual(e.calculate_rolling(3, 'week'), [(datetime(2024, 4, 24, 14, 35, 12, 345678), now)])
+        self.assertEqual(e.evaluate_triplet('r3w'), e.calculate_rolling(3, 'week'))
+        # 'rolling 1 week' spans the last 7 days up to now, not the previous calendar week
+        self.assertEqual(e.calculate_rolling(1, 'week'), [(datetime(2024, 5, 8, 14, 35, 12, 345678), now)])
+        self.assertEqual(e.evaluate_triplet('r1w'), e.calculate_rolling(1, 'week'))
+
+    def test_zero_periods(self):
+        e = self.evaluator
+        for unit in ['day', 'week', 'month', 'quarter', 'year', 'hour', 'business_day']:
+            self.assertEqual(e.calculate_previous(0, unit), [], unit)
+            self.assertEqual(e.calculate_future(0, unit), [], unit)
+        self.assertEqual(e.calculate_rolling(0, 'day'), [(e.today, e.today)])
+
+    def test_calculate_rolling_clips_month_end(self):
+        e = self.evaluator
+        e.today = datetime(2024, 5, 31, 12)
+        self.assertEqual(e.calculate_rolling(3, 'month')[0][0], datetime(2024, 2, 29, 12))
+
+    def test_calculate_this(self):
+        e = self.evaluator
+        self.assertEqual(e.calculate_this('month'),
+                         [(datetime(2024, 5, 1), datetime(2024, 5, 31, 23, 59, 59, 999999))])
+        self.assertEqual(e.calculate_this('week'),
+                         [(datetime(2024, 5, 13), datetime(2024, 5, 19, 23, 59, 59, 999999))])
+        self.assertEqual(e.calculate_this('quarter', ordinal=3),
+                         [(datetime(2024, 7, 1), datetime(2024, 9, 30, 23, 59, 59, 999999))])
+        self.assertEqual(e.calculate_this('millisecond'),
+                         [(datetime(2024, 5, 15, 14, 35, 12, 345000), datetime(2024, 5, 15, 14, 35, 12, 345999))])
+
+    def test_evaluate_special(self):
+        e = self.evaluator
+        self.assertEqual(e.evaluate_special('ytd'),
+                         [(datetime(2024, 1, 1), datetime(2024, 5, 15, 23, 59, 59, 999999))])
+        self.assertEqual(e.evaluate_special('wtd'),
+                         [(datetime(2024, 5, 13), datetime(2024, 5, 15, 23, 59, 59, 999999))])
+        self.assertEqual(e.evaluate_special('ltm'),
+                         [(datetime(2023, 5, 16), datetime(2024, 5, 15, 23, 59, 59, 999999))])
+        self.assertEqual(e.evaluate_special('py'),
+                         [(datetime(2023, 1, 1), datetime(2023, 12, 31, 23, 59, 59, 999999))])
+        self.assertEqual(e.evaluate_special('tomorrow'),
+                         [(datetime(2024, 5, 16), datetime(2024, 5, 16, 23, 59, 59, 999999))])
+        spans = [(datetime(2024, 8, 1), datetime(2024, 8, 15, 23, 59, 59, 999999))]
+        self.assertEqual(e.evaluate_special('qtd', spans),
+                         [(datetime(2024, 7, 1), datetime(2024, 8, 15, 23, 59, 59, 999999))])
+
+    def test_evaluate_triplet(self):
+        e = self.evaluator
+        TripletTable.clear()
+        self.assertEqual(e.evaluate_triplet('l3m'), e.calculate_previous(3, 'month'))
+        self.assertEqual(e.evaluate_triplet('l4q'), e.calculate_previous(4, 'quarter'))
+        self.assertEqual(e.evaluate_triplet('n2w'), e.calculate_future(2, 'week'))
+        self.assertEqual(e.evaluate_triplet('r12m'), e.calculate_rolling(12, 'month'))
+        table = TripletTable.get(e.today.date())
+        self.assertEqual(len(table), 4)
+
+        # rolling triplets follow the time of day, the table only stores their start date
+        e.today = e.today.replace(hour=18)
+        self.assertEqual(e.evaluate_triplet('r12m'), [(datetime(2023, 5, 15, 18, 35, 12, 345678), e.today)])
+        self.assertEqual(len(table), 4)
+
+        # tables of other days are kept, alternating days reuse them
+        e.today = datetime(2024, 5, 16, 9)
+        self.assertEqual(e.evaluate_triplet('l3m'), e.calculate_previous(3, 'month'))
+        self.assertIsNot(TripletTable.get(e.today.date()), table)
+        self.assertIs(TripletTable.get(datetime(2024, 5, 15).date()), table)
+        self.assertEqual(len(TripletTable._tables), 2)
+
+        # the least recently used tables are evicted
+        for day in range(1, TripletTable.MAX_TABLES + 1):
+            TripletTable.get(datetime(2024, 6, day).date())
+        self.assertEqual(len(TripletTable._tables), TripletTable.MAX_TABLES)
+        self.assertIsNot(TripletTable.get(datetime(2024, 5, 15).date()), table)
+
+    def test_evaluate_triplet_week_start(self):
+        e = self.evaluator
+        e.week_start = 6  # Sunday
+        self.assertEqual(e.evaluate_triplet('l1w'),
+                         [(datetime(2024, 5, 5), datetime(2024, 5, 11, 23, 59, 59, 999999))])
+
+    def test_invalid_triplet(self):
+        with self.assertRaises(EvaluationError):
+            self.evaluator.evaluate_triplet('x3m')
+
+
+if __name__ == '__main__':
+    unittest.main()
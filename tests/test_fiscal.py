@@ -0,0 +1,116 @@
+# datespan - Copyright (c)2024, Thomas Zeutschler, MIT license
+
+import unittest
+from datetime import date, datetime, timedelta
+
+from datespan import DateSpanSet, FiscalCalendar, parse
+from datespan import calendar_math as cm
+from datespan.parser.evaluator import Evaluator
+
+END = (23, 59, 59, 999999)
+AS_OF = datetime(2024, 11, 15, 10, 30)
+
+
+class TestFiscalCalendar(unittest.TestCase):
+
+    def test_arguments(self):
+        self.assertEqual(FiscalCalendar(10), FiscalCalendar(start_month=10))
+        self.assertEqual(hash(FiscalCalendar(2, '4-4-5')), hash(FiscalCalendar(2, '445')))
+        self.assertNotEqual(FiscalCalendar(10), FiscalCalendar(10, year_label='start'))
+        for kwargs in [{'start_month': 0}, {'start_month': 13}, {'pattern': '4-4-4'}, {'week_start': 7},
+                       {'method': 'first'}, {'year_label': 'middle'}]:
+            with self.assertRaises(ValueError):
+                FiscalCalendar(**kwargs)
+        with self.assertRaises(ValueError):
+            FiscalCalendar(10).span(AS_OF, 'month')
+        with self.assertRaises(ValueError):
+            FiscalCalendar(10).span(datetime(1500, 1, 1))
+
+    def test_month_calendar(self):
+        fiscal = FiscalCalendar(start_month=10)
+        self.assertEqual(fiscal.span(AS_OF), (datetime(2024, 10, 1), datetime(2025, 9, 30, *END)))
+        self.assertEqual(fiscal.span(AS_OF, 'quarter', -1, -1), (datetime(2024, 7, 1), datetime(2024, 9, 30, *END)))
+        self.assertEqual(fiscal.span(AS_OF, 'period', 1, 2), (datetime(2024, 12, 1), datetime(2025, 1, 31, *END)))
+        self.assertEqual(fiscal.start_of(AS_OF, 'quarter'), datetime(2024, 10, 1))
+        self.assertEqual((fiscal.year_of(AS_OF), fiscal.quarter_of(AS_OF), fiscal.period_of(AS_OF)), (2025, 1, 2))
+        self.assertEqual(FiscalCalendar(10, year_label='start').year_of(AS_OF), 2024)
+        self.assertEqual(cm.granularity_of(fiscal.span(AS_OF, 'quarter')), 'quarter')
+        self.assertEqual(cm.granularity_of(FiscalCalendar(11).span(AS_OF, 'quarter')), 'month')
+
+    def test_retail_calendar(self):
+        # NRF retail calendar, fiscal 2023 is a 53 week year from 2023-01-29 to 2024-02-03
+        fiscal = FiscalCalendar(start_month=2, pattern='4-4-5', week_start=6, method='nearest', year_label='start')
+        day = datetime(2023, 6, 1)
+        self.assertEqual(fiscal.span(day), (datetime(2023, 1, 29), datetime(2024, 2, 3, *END)))
+        self.assertEqual(fiscal.year_of(day), 2023)
+        self.assertEqual(fiscal.span(day, 'quarter'), (datetime(2023, 4, 30), datetime(2023, 7, 29, *END)))
+        self.assertEqual(fiscal.span(day, 'period'), (datetime(2023, 5, 28), datetime(2023, 6, 24, *END)))
+        last = fiscal.span(datetime(2024, 1, 15), 'period')
+        self.assertEqual(last, (datetime(2023, 12, 24), datetime(2024, 2, 3, *END)))  # 5 weeks plus the 53rd week
+
+        for pattern in ['4-4-5', '4-5-4', '5-4-4']:
+            for method in ['last', 'nearest']:
+                fiscal = FiscalCalendar(start_month=9, pattern=pattern, week_start=2, method=method)
+                for year in range(2000, 2030):
+                    start, end = fiscal.span(datetime(year, 3, 1))
+                    self.assertEqual(start.weekday(), 2)
+                    self.assertIn((end - start).days + 1, (364, 371))
+                    self.assertEqual(fiscal.span(end + timedelta(days=1))[0], end + timedelta(microseconds=1))
+                    if method == 'last':
+                        self.assertTrue(date(year - 1, 8, 25) <= start.date() <= date(year - 1, 9, 1))
+                    else:
+                        self.assertTrue(abs(start - datetime(year - 1, 9, 1)).days <= 3)
+
+    def test_lookup(self):
+        fiscal = FiscalCalendar(start_month=7, pattern='5-4-4', week_start=0)
+        day = date(1990, 1, 1)
+        while day.year < 2030:
+            start, end = fiscal.span(day, 'period')
+            self.assertTrue(start.date() <= day <= end.date())
+            self.assertIn((end - start).days + 1, (28, 35, 42))
+            day += timedelta(days=5)
+
+
+class TestFiscalExpressions(unittest.TestCase):
+
+    def test_fiscal_specials(self):
+        fiscal = FiscalCalendar(start_month=10)
+        expected = {
+            'fy': (datetime(2024, 10, 1), datetime(2025, 9, 30, *END)),
+            'fq': (datetime(2024, 10, 1), datetime(2024, 12, 31, *END)),
+            'fytd': (datetime(2024, 10, 1), datetime(2024, 11, 15, *END)),
+            'fqtd': (datetime(2024, 10, 1), datetime(2024, 11, 15, *END)),
+            'pfy': (datetime(2023, 10, 1), datetime(2024, 9, 30, *END)),
+            'lfy': (datetime(2023, 10, 1), datetime(2024, 9, 30, *END)),
+            'nfy': (datetime(2025, 10, 1), datetime(2026, 9, 30, *END)),
+            'fiscal year': (datetime(2024, 10, 1), datetime(2025, 9, 30, *END)),
+            'this fiscal quarter': (datetime(2024, 10, 1), datetime(2024, 12, 31, *END)),
+            'last fiscal year': (datetime(2023, 10, 1), datetime(2024, 9, 30, *END)),
+            'previous 2 fiscal quarters': (datetime(2024, 4, 1), datetime(2024, 9, 30, *END)),
+            'next fiscal period': (datetime(2024, 12, 1), datetime(2024, 12, 31, *END)),
+            'jan fytd': (datetime(2023, 10, 1), datetime(2024, 1, 31, *END)),
+        }
+        for text, span in expected.items():
+            self.assertEqual(parse(text, as_of=AS_OF, fiscal_calendar=fiscal).to_tuples(), [span], text)
+
+    def test_default_calendar(self):
+        self.assertEqual(DateSpanSet('fy', as_of=AS_OF).to_tuples(), DateSpanSet('cy', as_of=AS_OF).to_tuples())
+        self.assertEqual(DateSpanSet('fytd', as_of=AS_OF).to_tuples(), DateSpanSet('ytd', as_of=AS_OF).to_tuples())
+
+    def test_settings_are_kept(self):
+        fiscal = FiscalCalendar(start_month=4)
+        dss = DateSpanSet('fq', as_of=AS_OF, fiscal_calendar=fiscal)
+        self.assertEqual(dss.to_tuples(), [(datetime(2024, 10, 1), datetime(2024, 12, 31, *END))])
+        dss.add('last fiscal quarter')
+        self.assertEqual(dss.to_tuples(), [(datetime(2024, 7, 1), datetime(2024, 12, 31, *END))])
+        self.assertIs(dss.clone()._fiscal_calendar, fiscal)
+
+    def test_evaluator(self):
+        evaluator = Evaluator([], as_of=AS_OF, fiscal_calendar=FiscalCalendar(start_month=7))
+        self.assertEqual(evaluator.evaluate_special('fy'), [(datetime(2024, 7, 1), datetime(2025, 6, 30, *END))])
+        self.assertEqual(evaluator.calculate_future(1, 'fiscal_year'),
+                         [(datetime(2025, 7, 1), datetime(2026, 6, 30, *END))])
+
+
+if __name__ == '__main__':
+    unittest.main()
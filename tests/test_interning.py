@@ -0,0 +1,55 @@
+# datespan - Copyright (c)2024, Thomas Zeutschler, MIT license
+
+import gc
+import unittest
+from datetime import datetime, timezone
+
+from datespan import DateSpan, FrozenDateSpan, interning, parse
+from datespan.interning import InternPool, calendar_key
+
+END = (23, 59, 59, 999999)
+
+
+class TestInterning(unittest.TestCase):
+
+    def tearDown(self):
+        interning.configure(enabled=False)
+        interning.POOL.clear()
+
+    def test_calendar_key(self):
+        self.assertEqual(calendar_key(datetime(2024, 3, 5), datetime(2024, 3, 5, *END)),
+                         ('day', datetime(2024, 3, 5).toordinal()))
+        self.assertEqual(calendar_key(datetime(2024, 2, 1), datetime(2024, 2, 29, *END)), ('month', 2024 * 12 + 1))
+        self.assertEqual(calendar_key(datetime(2024, 4, 1), datetime(2024, 6, 30, *END)), ('quarter', 2024 * 4 + 1))
+        self.assertEqual(calendar_key(datetime(2024, 1, 1), datetime(2024, 12, 31, *END)), ('year', 2024))
+        self.assertIsNone(calendar_key(datetime(2024, 2, 1), datetime(2024, 4, 30, *END)))  # not a quarter
+        self.assertIsNone(calendar_key(datetime(2024, 3, 5), datetime(2024, 3, 6, *END)))
+        self.assertIsNone(calendar_key(datetime(2024, 3, 5, 1), datetime(2024, 3, 5, *END)))
+        self.assertIsNone(calendar_key(datetime(2024, 3, 5, tzinfo=timezone.utc),
+                                       datetime(2024, 3, 5, *END, tzinfo=timezone.utc)))
+
+    def test_intern_pool(self):
+        pool = InternPool()
+        day = pool.intern(datetime(2024, 3, 5), datetime(2024, 3, 5, *END))
+        self.assertIsInstance(day, FrozenDateSpan)
+        self.assertIs(pool.intern(datetime(2024, 3, 5), datetime(2024, 3, 5, *END)), day)
+        self.assertIs(pool.intern_span(DateSpan("2024-03-05")), day)
+        self.assertEqual((pool.hits, pool.misses), (2, 1))
+        other = pool.intern(datetime(2024, 3, 5), datetime(2024, 3, 6, 12))
+        self.assertNotIsInstance(other, FrozenDateSpan)
+        self.assertEqual(len(pool), 1)
+        del day
+        gc.collect()
+        self.assertEqual(len(pool), 0)  # weak references only
+
+    def test_date_span_set_interning(self):
+        self.assertNotIsInstance(parse("2024-03-05")[0], FrozenDateSpan)
+        interning.configure(enabled=True)
+        mondays = parse("every monday in january 2024")
+        self.assertIs(parse("every monday in january 2024")[2], mondays[2])
+        self.assertIsInstance(mondays[2], FrozenDateSpan)
+        self.assertEqual(mondays[0], DateSpan(datetime(2024, 1, 1), datetime(2024, 1, 1, *END)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+# datespan - Copyright (c)2024, Thomas Zeutschler, MIT license
+
+import unittest
+from datetime import date, datetime
+
+from dateutil.parser import parserinfo
+
+from datespan import DateSpanSet
+from datespan.parser.cache import LRUCache
+from datespan.parser.literals import LITERAL_CACHE, parse_literal
+
+
+class TestLRUCache(unittest.TestCase):
+
+    def test_lru_eviction_and_counters(self):
+        cache = LRUCache(maxsize=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        self.assertEqual(cache.get('a'), 1)  # 'a' is now the most recently used entry
+        cache.put('c', 3)
+        self.assertNotIn('b', cache)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), 3)
+        self.assertEqual(cache.info(), {'hits': 2, 'misses': 1, 'size': 2, 'maxsize': 2})
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.hits, 0)
+
+    def test_invalid_size(self):
+        with self.assertRaises(ValueError):
+            LRUCache(maxsize=0)
+
+
+class TestLiterals(unittest.TestCase):
+
+    def setUp(self):
+        LITERAL_CACHE.clear()
+
+    def test_parse_literal(self):
+        today = date(2024, 5, 15)
+        self.assertEqual(parse_literal('dec 31 2023 23:59', today=today), (datetime(2023, 12, 31, 23, 59), 'minute'))
+        self.assertEqual(parse_literal('dec 31 2023', today=today), (datetime(2023, 12, 31), 'day'))
+        self.assertEqual(parse_literal('10:30:15', today=today), (datetime(2024, 5, 15, 10, 30, 15), 'second'))
+        self.assertEqual(parse_literal('10:30:15.5', today=today)[1], 'instant')
+
+    def test_cache_hits(self):
+        today = date(2024, 5, 15)
+        parse_literal('dec 31 2023 23:59', today=today)
+        parse_literal('dec 31 2023 23:59', today=today)
+        self.assertEqual((LITERAL_CACHE.hits, LITERAL_CACHE.misses), (1, 1))
+
+        # missing date parts are taken from today, so the day is part of the key
+        self.assertEqual(parse_literal('dec 31 23:59', today=date(2024, 5, 16))[0], datetime(2024, 12, 31, 23, 59))
+        self.assertEqual(parse_literal('dec 31 23:59', today=date(2025, 1, 1))[0], datetime(2025, 12, 31, 23, 59))
+
+    def test_errors_are_cached(self):
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                parse_literal('no date at all')
+        self.assertEqual(LITERAL_CACHE.hits, 1)
+
+    def test_parser_info(self):
+        info = parserinfo(dayfirst=True)
+        self.assertEqual(DateSpanSet('03.04.2024', parser_info=info).start, datetime(2024, 4, 3))
+        self.assertEqual(DateSpanSet('03.04.2024').start, datetime(2024, 3, 4))
+        self.assertEqual(DateSpanSet('03.04.2024', parser_info=info, date_format='mdy').start, datetime(2024, 3, 4))
+
+
+if __name__ == '__main__':
+    unittest.main()
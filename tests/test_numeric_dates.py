@@ -0,0 +1,63 @@
+# datespan - Copyright (c)2024, Thomas Zeutschler, MIT license
+
+import unittest
+from datetime import datetime
+from unittest import mock
+
+import dateutil.parser
+
+from datespan import DateSpanSet, infer_date_format
+from datespan.parser.numeric_dates import parse_numeric_date
+
+
+class TestNumericDates(unittest.TestCase):
+
+    def test_parse_numeric_date(self):
+        self.assertEqual(parse_numeric_date('2024-03-05'), datetime(2024, 3, 5))
+        self.assertEqual(parse_numeric_date('2024/3/5'), datetime(2024, 3, 5))
+        self.assertEqual(parse_numeric_date('15.03.2024'), datetime(2024, 3, 15))
+        self.assertEqual(parse_numeric_date('03-15-2024'), datetime(2024, 3, 15))
+        self.assertIsNone(parse_numeric_date('march 2024'))
+        self.assertIsNone(parse_numeric_date('2024-03-05 10:00'))
+        with self.assertRaises(ValueError):
+            parse_numeric_date('31.04.2024')
+
+    def test_same_as_dateutil(self):
+        for text in ['2024-03-05', '2024/3/5', '2024-3/5', '15.03.2024', '03-15-2024', '09.08.2024', '1/2/2024']:
+            self.assertEqual(parse_numeric_date(text), dateutil.parser.parse(text), text)
+
+    def test_date_format(self):
+        self.assertEqual(parse_numeric_date('09.08.2024', 'dmy'), datetime(2024, 8, 9))
+        self.assertEqual(parse_numeric_date('09.08.2024', 'mdy'), datetime(2024, 9, 8))
+        self.assertEqual(parse_numeric_date('2024-08-09', 'ymd'), datetime(2024, 8, 9))
+        with self.assertRaises(ValueError):
+            parse_numeric_date('03-15-2024', 'dmy')
+        with self.assertRaises(ValueError):
+            parse_numeric_date('2024-08-09', 'dmy')
+        with self.assertRaises(ValueError):
+            DateSpanSet('09.08.2024', date_format='dym')
+
+    def test_infer_date_format(self):
+        self.assertEqual(infer_date_format(['01.02.2024', '28.02.2024']), 'dmy')
+        self.assertEqual(infer_date_format(['01/02/2024', '02/28/2024']), 'mdy')
+        self.assertEqual(infer_date_format(['2024-02-01', 'n/a']), 'ymd')
+        self.assertIsNone(infer_date_format(['01.02.2024', '03.04.2024']))
+        self.assertIsNone(infer_date_format([]))
+        self.assertIsNone(infer_date_format(['01.02.2024', '28.02.2024'], max_samples=1))
+        with self.assertRaises(ValueError):
+            infer_date_format(['13.02.2024', '02.13.2024'])
+        with self.assertRaises(ValueError):
+            infer_date_format(['2024-02-01', '01.02.2024'])
+
+    def test_datespanset_with_date_format(self):
+        samples = ['01.02.2024', '03.04.2024', '28.02.2024']
+        date_format = infer_date_format(samples)
+        with mock.patch('dateutil.parser.parse', side_effect=AssertionError('dateutil called')):
+            dss = [DateSpanSet(text, date_format=date_format) for text in samples]
+        self.assertEqual(dss[1].start, datetime(2024, 4, 3))
+        self.assertEqual(dss[1].end, datetime(2024, 4, 3, 23, 59, 59, 999999))
+        self.assertEqual(DateSpanSet('03.04.2024').start, datetime(2024, 3, 4))
+
+
+if __name__ == '__main__':
+    unittest.main()
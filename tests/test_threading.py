@@ -0,0 +1,69 @@
+# datespan - Copyright (c)2024, Thomas Zeutschler, MIT license
+
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+
+from datespan.parser.datespanparser import AST_CACHE, DateSpanParser
+from datespan.parser.literals import LITERAL_CACHE
+from datespan.parser.triplet_table import TripletTable
+
+EXPRESSIONS = [
+    "2024-09-10", "15.09.2024", "2024-09-10 14:00", "dec 31 2023 23:59", "today", "yesterday",
+    "last month", "next 3 days", "previous 2 weeks", "this quarter", "ytd", "l3w", "l4q", "n2w",
+    "month", "jan, feb and mar of 2024", "q1 2024", "monday of this week", "before august 2024",
+    "between 2024-01-01 and 2024-03-31", "every monday in this month", "last 2 years; next 6 months",
+]
+
+
+class TestThreading(unittest.TestCase):
+
+    def setUp(self):
+        AST_CACHE.clear()
+        LITERAL_CACHE.clear()
+        TripletTable.clear()
+
+    @staticmethod
+    def parse_all(parser: DateSpanParser, rounds: int) -> list:
+        return [parser.parse(text) for _ in range(rounds) for text in EXPRESSIONS]
+
+    def test_shared_parser_across_threads(self):
+        expected = self.parse_all(DateSpanParser(), 1)
+        for threads in (1, 4, 16):
+            with self.subTest(threads=threads):
+                AST_CACHE.clear()
+                TripletTable.clear()
+                parser = DateSpanParser()  # a single instance shared by all threads
+                with ThreadPoolExecutor(max_workers=threads) as executor:
+                    futures = [executor.submit(self.parse_all, parser, 5) for _ in range(threads * 2)]
+                    for future in futures:
+                        self.assertEqual(future.result(), expected * 5)
+
+    def test_immutable_tokens_and_ast(self):
+        parser = DateSpanParser("month")
+        token = parser.tokens[0]
+        with self.assertRaises(AttributeError):
+            token.type = "SPECIAL"
+        node = parser.parse_tree[0][0]
+        self.assertIsInstance(node.value, MappingProxyType)
+        with self.assertRaises(TypeError):
+            node.value['type'] = 'relative'
+
+    def test_ast_cache(self):
+        parser = DateSpanParser("last 3 months")
+        tokens, tree = parser.tokens, parser.parse_tree
+        parser.parse()
+        self.assertIs(parser.tokens, tokens)
+        self.assertIs(parser.parse_tree, tree)
+        self.assertGreaterEqual(AST_CACHE.hits, 1)
+
+    def test_no_state_of_parse_calls(self):
+        parser = DateSpanParser()
+        state = dict(vars(parser))
+        self.assertEqual(parser.parse("last month; next 2 days"), DateSpanParser("last month; next 2 days").parse())
+        self.assertEqual(vars(parser), state)
+        self.assertEqual((parser.tokens, parser.parse_tree, parser.date_spans), ([], None, []))
+
+
+if __name__ == '__main__':
+    unittest.main()
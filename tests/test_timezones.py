@@ -0,0 +1,184 @@
+# datespan - Copyright (c)2024, Thomas Zeutschler, MIT license
+
+import unittest
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from datespan import DateSpan, DateSpanSet, parse, parse_zones
+from datespan import calendar_math as cm
+from datespan.timezones import TransitionTable, resolve_zone, wall_clock
+
+BERLIN = ZoneInfo("Europe/Berlin")
+NEW_YORK = ZoneInfo("America/New_York")
+TOKYO = ZoneInfo("Asia/Tokyo")
+END = (23, 59, 59, 999999)
+
+
+class TestTimezones(unittest.TestCase):
+
+    def test_resolve_zone(self):
+        self.assertIsNone(resolve_zone(None))
+        self.assertIs(resolve_zone(timezone.utc), timezone.utc)
+        self.assertEqual(resolve_zone("Europe/Berlin"), BERLIN)
+        with self.assertRaises(ValueError):
+            resolve_zone("Mars/Olympus_Mons")
+        with self.assertRaises(ValueError):
+            resolve_zone(3600)
+
+    def test_transition_table(self):
+        table = TransitionTable.get("Europe/Berlin")
+        self.assertIs(TransitionTable.get(BERLIN), table)
+
+        # every quarter hour of 2024 and around both DST transitions, compared to zoneinfo
+        instants = [datetime(2024, 1, 1, tzinfo=timezone.utc) + timedelta(minutes=15 * i) for i in range(4 * 24 * 366)]
+        for instant in instants:
+            expected = instant.astimezone(BERLIN)
+            utc_us = cm.to_epoch_us(instant)
+            self.assertEqual(table.utc_offset(utc_us), expected.utcoffset() // cm.MICROSECOND)
+            self.assertEqual(table.to_datetime(utc_us), expected)
+            self.assertEqual(table.to_datetime(utc_us).fold, expected.fold)
+            wall = expected.replace(tzinfo=None, fold=0)
+            self.assertEqual(table.to_utc(cm.to_epoch_us(wall)), cm.to_epoch_us(wall.replace(tzinfo=BERLIN)))
+
+        # non-existent and ambiguous wall-clock times resolve like fold=0
+        for wall in (datetime(2024, 3, 31, 2, 30), datetime(2024, 10, 27, 2, 30)):
+            self.assertEqual(table.to_utc(cm.to_epoch_us(wall)), cm.to_epoch_us(wall.replace(tzinfo=BERLIN)))
+
+        # vectorized lookups return the same offsets, with and without numpy
+        values = [cm.to_epoch_us(instant) for instant in instants[::97]]
+        self.assertEqual(list(table.utc_offsets(values)), [table.utc_offset(us) for us in values])
+        self.assertEqual(list(table.to_utc_many(values)), [table.to_utc(us) for us in values])
+        self.assertEqual(list(table.to_utc_many(values[:3])), [table.to_utc(us) for us in values[:3]])
+        self.assertEqual(list(table.to_utc_many([])), [])
+
+        # tables are extended on demand, fixed offsets have a single segment
+        self.assertEqual(table.to_datetime(cm.to_epoch_us(datetime(1950, 7, 1, tzinfo=timezone.utc))),
+                         datetime(1950, 7, 1, tzinfo=timezone.utc).astimezone(BERLIN))
+        fixed = TransitionTable.get(timezone(timedelta(hours=5)))
+        self.assertEqual(fixed.utc_offset(0), 5 * 3600 * 1_000_000)
+        self.assertEqual(len(fixed), 1)
+
+        # only the years looked up are built, not the years in between them
+        table = TransitionTable(BERLIN)
+        instants = [datetime(year, 7, 1, tzinfo=timezone.utc) for year in (2024, 1700, 1950)] * 30
+        self.assertEqual(table.to_datetime(cm.to_epoch_us(instants[0])), instants[0].astimezone(BERLIN))
+        self.assertEqual(table.to_datetime(cm.to_epoch_us(instants[1])), instants[1].astimezone(BERLIN))
+        self.assertEqual(sorted(table._years), [1700, 2024])
+        self.assertEqual(list(table.utc_offsets([cm.to_epoch_us(instant) for instant in instants])),
+                         [instant.astimezone(BERLIN).utcoffset() // cm.MICROSECOND for instant in instants])
+        self.assertEqual(sorted(table._years), [1700, 1950, 2024])
+
+    def test_wall_clock(self):
+        as_of = datetime(2024, 3, 5, 20, tzinfo=timezone.utc)
+        self.assertEqual(wall_clock(as_of, TOKYO), datetime(2024, 3, 6, 5))
+        self.assertEqual(wall_clock(as_of, NEW_YORK), datetime(2024, 3, 5, 15))
+        self.assertEqual(wall_clock(datetime(2024, 3, 5, 20), TOKYO), datetime(2024, 3, 5, 20))
+        self.assertEqual(wall_clock(as_of, None), datetime(2024, 3, 5, 20))
+
+    def test_parse_as_of_and_tz(self):
+        as_of = datetime(2024, 3, 5, 20, tzinfo=timezone.utc)
+        dss = parse("today", as_of=as_of, tz="Asia/Tokyo")
+        self.assertEqual(dss.tz, TOKYO)
+        self.assertEqual(dss.to_tuples(),
+                         [(datetime(2024, 3, 6, tzinfo=TOKYO), datetime(2024, 3, 6, *END, tzinfo=TOKYO))])
+        self.assertEqual(parse("today", as_of=as_of, tz=NEW_YORK)[0],
+                         DateSpan(datetime(2024, 3, 5, tzinfo=NEW_YORK), datetime(2024, 3, 5, *END, tzinfo=NEW_YORK)))
+
+        # 'this week' in New York spans the begin of daylight saving time
+        week = DateSpanSet.parse("this week", as_of=as_of, tz=NEW_YORK)[0]
+        self.assertEqual(week.start.utcoffset(), timedelta(hours=-5))
+        self.assertEqual(week.end.utcoffset(), timedelta(hours=-4))
+
+        # naive as_of datetimes are wall-clock times, without tz the result is naive
+        self.assertEqual(parse("yesterday", as_of=datetime(2024, 3, 5, 1), tz=TOKYO).start,
+                         datetime(2024, 3, 4, tzinfo=TOKYO))
+        self.assertEqual(parse("yesterday", as_of=datetime(2024, 3, 5, 1)).start, datetime(2024, 3, 4))
+        self.assertIsNone(parse("yesterday").tz)
+        with self.assertRaises(ValueError):
+            parse("today", tz="Nowhere/Nothing")
+
+    def test_date_span_conversions(self):
+        naive = DateSpan(datetime(2024, 7, 1), datetime(2024, 7, 1, *END))
+        berlin = naive.localize("Europe/Berlin")
+        self.assertEqual(berlin.tz, BERLIN)
+        self.assertEqual(berlin.start, datetime(2024, 7, 1, tzinfo=BERLIN))
+        self.assertEqual(berlin.start_us, naive.start_us - 2 * 3600 * 1_000_000)
+
+        tokyo = berlin.astimezone("Asia/Tokyo")
+        self.assertEqual((tokyo.start_us, tokyo.end_us), (berlin.start_us, berlin.end_us))
+        self.assertEqual(tokyo.start, datetime(2024, 7, 1, 7, tzinfo=TOKYO))
+        self.assertEqual(tokyo.localize(BERLIN).start, berlin.start)
+        self.assertIsNone(naive.tz)
+        with self.assertRaises(ValueError):
+            naive.astimezone(TOKYO)
+        with self.assertRaises(ValueError):
+            naive.localize(None)
+        self.assertTrue(DateSpan.undefined().astimezone(TOKYO).is_undefined)
+
+    def test_date_span_set_conversions(self):
+        as_of = datetime(2024, 3, 5, 20)
+        naive = parse("every monday in march 2024", as_of=as_of)
+        berlin = naive.localize("Europe/Berlin")
+        self.assertEqual(berlin.tz, BERLIN)
+        self.assertEqual(len(berlin), len(naive))
+        self.assertEqual([span.start for span in berlin],
+                         [span.start.replace(tzinfo=BERLIN) for span in naive])
+        self.assertEqual(berlin.to_tuples(), [(s.replace(tzinfo=BERLIN), e.replace(tzinfo=BERLIN))
+                                              for s, e in naive.to_tuples()])
+
+        tokyo = berlin.astimezone(TOKYO)
+        self.assertEqual(tokyo.tz, TOKYO)
+        self.assertEqual(tokyo.to_tuples(), [(s.astimezone(TOKYO), e.astimezone(TOKYO))
+                                             for s, e in berlin.to_tuples()])
+        self.assertEqual(tokyo.clone().tz, TOKYO)
+        with self.assertRaises(ValueError):
+            naive.astimezone(TOKYO)
+
+        # timezone-aware as_of datetimes make the result timezone-aware, localize() converts them
+        utc = parse("every monday in march 2024", as_of=as_of.replace(tzinfo=timezone.utc))
+        self.assertEqual(utc.tz, timezone.utc)
+        self.assertEqual(utc.localize(BERLIN).start, datetime(2024, 3, 4, 1, tzinfo=BERLIN))
+
+        # many spans are localized with a single vectorized offset lookup
+        days = DateSpanSet([datetime(2024, 1, 1) + timedelta(days=2 * i) for i in range(183)])
+        self.assertEqual(len(days), 183)
+        self.assertEqual(days.localize(NEW_YORK).to_tuples(),
+                         [(s.replace(tzinfo=NEW_YORK), e.replace(tzinfo=NEW_YORK)) for s, e in days.to_tuples()])
+
+    def test_range_limits(self):
+        last_day = DateSpan(datetime(9999, 12, 31))
+        berlin = last_day.localize("Europe/Berlin")
+        self.assertEqual((berlin.start, berlin.end),
+                         (datetime(9999, 12, 31, tzinfo=BERLIN), datetime(9999, 12, 31, *END, tzinfo=BERLIN)))
+        self.assertEqual(DateSpanSet(last_day).localize(BERLIN).to_tuples(), [(berlin.start, berlin.end)])
+        days = DateSpanSet([datetime(9999, 12, 31) - timedelta(days=2 * i) for i in range(100)])
+        self.assertEqual(days.localize(BERLIN).to_tuples(),
+                         [(s.replace(tzinfo=BERLIN), e.replace(tzinfo=BERLIN)) for s, e in days.to_tuples()])
+
+        # wall-clock times beyond the supported range in UTC are clamped to it
+        new_york = last_day.localize(NEW_YORK)
+        self.assertEqual(new_york.start, datetime(9999, 12, 31, tzinfo=NEW_YORK))
+        self.assertEqual(new_york.end, datetime.max.replace(tzinfo=timezone.utc))
+        self.assertEqual(DateSpanSet(last_day).localize(NEW_YORK).to_tuples(), [(new_york.start, new_york.end)])
+        honolulu = ZoneInfo("Pacific/Honolulu")
+        self.assertEqual(DateSpan(datetime(1, 1, 1)).localize(honolulu).start, datetime(1, 1, 1, tzinfo=honolulu))
+
+    def test_parse_zones(self):
+        zones = ["Europe/Berlin", "Europe/Paris", "America/New_York", "Asia/Tokyo", "Asia/Kolkata",
+                 "Australia/Sydney", "Pacific/Honolulu", timezone.utc]
+        for text in ("today", "this week", "last month", "next 3 days", "now"):
+            for as_of in (datetime(2024, 3, 5, 20, tzinfo=timezone.utc),
+                          datetime(2024, 10, 27, 1, tzinfo=timezone.utc)):
+                result = parse_zones(text, zones, as_of=as_of)
+                self.assertEqual(list(result), zones)
+                for zone in zones:
+                    expected = parse(text, as_of=as_of, tz=zone)
+                    self.assertEqual(result[zone].to_tuples(), expected.to_tuples(), f"{text} in {zone}")
+                    self.assertEqual([s.utcoffset() for s, _ in result[zone].to_tuples()],
+                                     [s.utcoffset() for s, _ in expected.to_tuples()])
+        with self.assertRaises(ValueError):
+            parse_zones("today", ["Europe/Berlin", "Nowhere/Nothing"])
+
+
+if __name__ == '__main__':
+    unittest.main()